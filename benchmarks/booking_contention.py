@@ -0,0 +1,187 @@
+"""Пропускная способность `POST /api/add_booking` при конкурентных клиентах.
+
+Брони блокируют advisory-блокировками только свои ночи своего типа номера, поэтому
+конфликтуют лишь запросы на одни и те же ночи одного типа. Сценарии:
+
+- same_nights  — все клиенты бронируют один тип номера одного отеля на одни и те же ночи;
+- other_nights — тот же тип номера, но у каждой брони свои ночи;
+- many_hotels  — клиенты распределены по `--hotels` отелям, ночи одинаковые.
+
+Номеров в типах хватает на все брони, так что 409 означает ошибку, а не распроданный тип.
+Нужна БД с применёнными миграциями (настройки из окружения, как у приложения); отели,
+типы номеров, номера и клиент создаются с id от FIXTURE_ID и удаляются после прогона.
+Клиенты делятся между `--workers` процессами, как воркеры uvicorn: в каждом своё приложение,
+вызываемое напрямую как ASGI, и свой пул соединений. На машине с одним-двумя ядрами процессы
+упираются в CPU раньше, чем в блокировки, и сценарии почти не различаются.
+
+Запуск из корня репозитория:
+    PYTHONPATH=src python benchmarks/booking_contention.py --clients 200 --requests 5 --hotels 50 --workers 4
+"""
+import argparse
+import asyncio
+import json
+import math
+import multiprocessing
+import statistics
+import time
+from collections import Counter
+from datetime import date, timedelta
+
+from fastapi import FastAPI
+from sqlalchemy import Integer, bindparam, text
+
+from main import app
+from project.infrastructure.postgres.database import database
+
+FIXTURE_ID = 980_000
+CHECK_IN = date(2030, 1, 1)
+NIGHTS = 3
+WORKER_START_DELAY_SEC = 3
+
+SETUP = [
+    """INSERT INTO my_app_schema.clients (client_id, full_name) VALUES (:base, 'Benchmark client')""",
+    """INSERT INTO my_app_schema.hotels (hotel_id, name)
+       SELECT :base + h, 'Benchmark hotel ' || h FROM generate_series(0, :hotels - 1) AS h""",
+    """INSERT INTO my_app_schema.room_types (room_type_id, hotel_id, room_number, room_type, price_per_night, capacity)
+       SELECT :base + h, :base + h, 'B', 'Benchmark', 100, 2 FROM generate_series(0, :hotels - 1) AS h""",
+    # Первому отелю — номер на каждую бронь, остальным — на их долю
+    """INSERT INTO my_app_schema.rooms (room_id, hotel_id, room_type_id, room_number, price_per_night, capacity)
+       SELECT :base * 100 + h * :total + r, :base + h, :base + h, 'B' || h || '-' || r, 100, 2
+         FROM generate_series(0, :hotels - 1) AS h,
+              generate_series(1, CASE WHEN h = 0 THEN :total ELSE :share END) AS r""",
+]
+
+CLEAN_BOOKINGS = """DELETE FROM my_app_schema.bookings WHERE hotel_id BETWEEN :base AND :base + :hotels - 1"""
+CLEAN_LEDGER = """DELETE FROM my_app_schema.room_type_inventory WHERE room_type_id BETWEEN :base AND :base + :hotels - 1"""
+
+TEARDOWN = [
+    CLEAN_BOOKINGS,
+    """DELETE FROM my_app_schema.rooms WHERE hotel_id BETWEEN :base AND :base + :hotels - 1""",
+    """DELETE FROM my_app_schema.room_types WHERE hotel_id BETWEEN :base AND :base + :hotels - 1""",
+    """DELETE FROM my_app_schema.hotels WHERE hotel_id BETWEEN :base AND :base + :hotels - 1""",
+    """DELETE FROM my_app_schema.clients WHERE client_id = :base""",
+]
+
+
+async def run_sql(statements: list[str], **params) -> None:
+    async with database.session() as session:
+        for statement in statements:
+            # Все параметры — целые; без типа Postgres не выведет его внутри generate_series
+            names = [name for name in params if f":{name}" in statement]
+            query = text(statement).bindparams(*(bindparam(name, type_=Integer) for name in names))
+            await session.execute(query, {name: params[name] for name in names})
+
+
+async def post(app: FastAPI, path: str, payload: dict) -> int:
+    body = json.dumps(payload).encode()
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "POST",
+        "scheme": "http", "path": path, "raw_path": path.encode(), "root_path": "",
+        "query_string": b"", "server": ("benchmark", 80), "client": ("benchmark", 1),
+        "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())],
+    }
+    status = 0
+
+    async def receive() -> dict:
+        return {"type": "http.request", "body": body, "more_body": False}
+
+    async def send(message: dict) -> None:
+        nonlocal status
+        if message["type"] == "http.response.start":
+            status = message["status"]
+
+    await app(scope, receive, send)
+    return status
+
+
+def booking(hotel: int, check_in_date: date) -> dict:
+    return {
+        "client_id": FIXTURE_ID,
+        "room_type_id": FIXTURE_ID + hotel,
+        "hotel_id": FIXTURE_ID + hotel,
+        "booking_date": CHECK_IN.isoformat(),
+        "check_in_date": check_in_date.isoformat(),
+        "check_out_date": (check_in_date + timedelta(days=NIGHTS)).isoformat(),
+    }
+
+
+def scenario_payload(scenario: str, client: int, request: int, requests: int, hotels: int) -> dict:
+    if scenario == "same_nights":
+        return booking(0, CHECK_IN)
+    if scenario == "other_nights":
+        return booking(0, CHECK_IN + timedelta(days=(client * requests + request) * NIGHTS))
+    return booking(client % hotels, CHECK_IN)
+
+
+async def run_clients(
+    scenario: str, numbers: range, requests: int, hotels: int, start_at: float
+) -> tuple[Counter, list[float], float, float]:
+    statuses = Counter()
+    latencies = []
+
+    async def client(number: int) -> None:
+        for request in range(requests):
+            started = time.perf_counter()
+            status = await post(app, "/api/add_booking", scenario_payload(scenario, number, request, requests, hotels))
+            latencies.append(time.perf_counter() - started)
+            statuses[status] += 1
+
+    async with app.router.lifespan_context(app):
+        # Процессы стартуют одновременно, уже подключившись к БД
+        await asyncio.sleep(max(start_at - time.time(), 0))
+        started = time.time()
+        await asyncio.gather(*(client(number) for number in numbers))
+        finished = time.time()
+    return statuses, latencies, started, finished
+
+
+def run_worker(args: tuple) -> tuple[Counter, list[float], float, float]:
+    return asyncio.run(run_clients(*args))
+
+
+def run_scenario(scenario: str, clients: int, requests: int, hotels: int, workers: int) -> None:
+    start_at = time.time() + WORKER_START_DELAY_SEC
+    jobs = [(scenario, range(worker, clients, workers), requests, hotels, start_at) for worker in range(workers)]
+    with multiprocessing.get_context("spawn").Pool(workers) as pool:
+        results = pool.map(run_worker, jobs)
+
+    statuses = sum((result[0] for result in results), Counter())
+    latencies = sorted(latency for result in results for latency in result[1])
+    elapsed = max(result[3] for result in results) - min(result[2] for result in results)
+    p95 = latencies[min(len(latencies) - 1, math.ceil(len(latencies) * 0.95) - 1)]
+    print(
+        f"{scenario:13} {len(latencies) / elapsed:8.1f} req/s  "
+        f"p50 {statistics.median(latencies) * 1000:7.1f} ms  p95 {p95 * 1000:7.1f} ms  "
+        f"statuses {dict(sorted(statuses.items()))}"
+    )
+
+
+async def prepare(statements: list[str], params: dict) -> None:
+    database.connect()
+    try:
+        await run_sql(statements, **params)
+    finally:
+        await database.disconnect()
+
+
+def main(clients: int, requests: int, hotels: int, workers: int) -> None:
+    total = clients * requests
+    params = dict(base=FIXTURE_ID, hotels=hotels, total=total, share=math.ceil(total / hotels))
+    asyncio.run(prepare(TEARDOWN + SETUP, params))
+    print(f"clients: {clients}, requests per client: {requests}, hotels: {hotels}, workers: {workers}")
+    try:
+        for scenario in ("same_nights", "other_nights", "many_hotels"):
+            run_scenario(scenario, clients, requests, hotels, workers)
+            asyncio.run(prepare([CLEAN_BOOKINGS, CLEAN_LEDGER], params))
+    finally:
+        asyncio.run(prepare(TEARDOWN, params))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--clients", type=int, default=200)
+    parser.add_argument("--requests", type=int, default=5)
+    parser.add_argument("--hotels", type=int, default=50)
+    parser.add_argument("--workers", type=int, default=4)
+    args = parser.parse_args()
+    main(args.clients, args.requests, args.hotels, args.workers)
@@ -0,0 +1,106 @@
+"""Сравнение двух способов отдать список номеров: `response_model` и `ModelResponse`.
+
+Оба маршрута возвращают одну и ту же готовую страницу `Page[RoomSchema]`, как её отдаёт
+репозиторий. Через `response_model` FastAPI (0.115 из pyproject) проверяет ответ по модели,
+превращает его в dict и кодирует stdlib json; `ModelResponse` сериализует модель сразу в bytes.
+Новые версии FastAPI сами пишут JSON через pydantic-core, и разница там меньше.
+Приложение вызывается напрямую как ASGI, без сети и HTTP-клиента, поэтому измеряется только
+работа сервера.
+
+Запуск из корня репозитория:
+    PYTHONPATH=src python benchmarks/serialization.py --rows 10000 --repeat 20
+"""
+import argparse
+import asyncio
+import json
+import statistics
+import time
+
+from fastapi import FastAPI
+
+from project.api.responses import ModelResponse
+from project.schemas.pagination import Page
+from project.schemas.rooms import RoomSchema
+
+
+def build_page(rows: int) -> Page[RoomSchema]:
+    return Page[RoomSchema](
+        items=[
+            RoomSchema(
+                room_id=room_id,
+                hotel_id=room_id % 50 + 1,
+                room_type_id=room_id % 200 + 1,
+                room_number=f"R{room_id}",
+                price_per_night=100 + room_id % 300 / 4,
+                capacity=room_id % 4 + 1,
+            )
+            for room_id in range(1, rows + 1)
+        ],
+        next_cursor="eyJpZCI6IDEwMDAwfQ",
+    )
+
+
+def build_app(page: Page[RoomSchema]) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/response_model", response_model=Page[RoomSchema])
+    async def with_response_model() -> Page[RoomSchema]:
+        return page
+
+    @app.get("/model_response", response_model=Page[RoomSchema])
+    async def with_model_response() -> ModelResponse:
+        return ModelResponse(page)
+
+    return app
+
+
+async def get(app: FastAPI, path: str) -> bytes:
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET",
+        "scheme": "http", "path": path, "raw_path": path.encode(), "root_path": "",
+        "query_string": b"", "headers": [], "server": ("benchmark", 80), "client": ("benchmark", 1),
+    }
+    chunks = []
+
+    async def receive() -> dict:
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message: dict) -> None:
+        if message["type"] == "http.response.body":
+            chunks.append(message.get("body", b""))
+
+    await app(scope, receive, send)
+    return b"".join(chunks)
+
+
+async def measure(app: FastAPI, path: str, repeat: int) -> tuple[list[float], bytes]:
+    body = await get(app, path)
+    timings = []
+    for _ in range(repeat):
+        started = time.process_time()
+        assert await get(app, path) == body
+        timings.append(time.process_time() - started)
+    return timings, body
+
+
+async def main(rows: int, repeat: int) -> None:
+    app = build_app(build_page(rows))
+    baseline, baseline_body = await measure(app, "/response_model", repeat)
+    fast, fast_body = await measure(app, "/model_response", repeat)
+    assert json.loads(baseline_body) == json.loads(fast_body)
+
+    baseline_ms = statistics.median(baseline) * 1000
+    fast_ms = statistics.median(fast) * 1000
+    print(f"rows: {rows}, repeat: {repeat}, body: {len(fast_body) / 1024:.0f} KiB")
+    print(f"response_model: {baseline_ms:8.2f} ms CPU/request, {baseline_ms * 1000 / rows:6.2f} us/row")
+    print(f"ModelResponse:  {fast_ms:8.2f} ms CPU/request, {fast_ms * 1000 / rows:6.2f} us/row")
+    print(f"saved:          {baseline_ms - fast_ms:8.2f} ms CPU/request, "
+          f"{(baseline_ms - fast_ms) * 1000 / rows:6.2f} us/row (x{baseline_ms / fast_ms:.1f})")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+    asyncio.run(main(args.rows, args.repeat))
@@ -0,0 +1,55 @@
+""" add_stays_room_overlap_constraint
+
+Revision ID: a9c4e7b2d5f8
+Revises: f3b8d2a6c1e4
+Create Date: 2026-10-18 20:41:05.731842
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a9c4e7b2d5f8'
+down_revision = 'f3b8d2a6c1e4'
+branch_labels = None
+depends_on = None
+
+
+CONSTRAINT = 'ex_stays_room_id_date_range'
+
+OVERLAPS = sa.text("""
+    SELECT count(*)
+      FROM my_app_schema.stays a
+      JOIN my_app_schema.stays b
+        ON a.room_id = b.room_id
+       AND a.stay_id < b.stay_id
+       AND daterange(a.check_in_date, a.check_out_date) && daterange(b.check_in_date, b.check_out_date)
+""")
+
+
+def upgrade():
+    # Оператор = для integer в GiST-индексе даёт расширение btree_gist (из contrib)
+    op.execute('CREATE EXTENSION IF NOT EXISTS btree_gist')
+
+    # Ограничение-исключение нельзя создать NOT VALID: пересечения нужно разобрать до миграции
+    overlaps = op.get_bind().scalar(OVERLAPS)
+    if overlaps:
+        raise RuntimeError(
+            f'{overlaps} pairs of stays occupy the same room on overlapping dates; '
+            f'fix them before adding {CONSTRAINT}'
+        )
+
+    op.create_exclude_constraint(
+        CONSTRAINT,
+        'stays',
+        ('room_id', '='),
+        (sa.text('daterange(check_in_date, check_out_date)'), '&&'),
+        using='gist',
+        schema='my_app_schema',
+    )
+
+
+def downgrade():
+    # Расширение оставляем: им могут пользоваться и другие объекты базы
+    op.drop_constraint(CONSTRAINT, 'stays', schema='my_app_schema')
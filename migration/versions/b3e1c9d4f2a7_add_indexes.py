@@ -0,0 +1,66 @@
+""" add_indexes
+
+Revision ID: b3e1c9d4f2a7
+Revises: 63a30ef089e9
+Create Date: 2026-10-18 10:12:41.318204
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from project.core.config import settings
+
+
+# revision identifiers, used by Alembic.
+revision = 'b3e1c9d4f2a7'
+down_revision = '63a30ef089e9'
+branch_labels = None
+depends_on = None
+
+
+# (имя индекса, таблица, столбцы)
+INDEXES = [
+    # bookings.hotel_id покрывается ведущим столбцом составного индекса по датам
+    ('ix_bookings_hotel_id_check_in_date_check_out_date', 'bookings', ['hotel_id', 'check_in_date', 'check_out_date']),
+    ('ix_bookings_client_id', 'bookings', ['client_id']),
+    ('ix_bookings_room_type_id', 'bookings', ['room_type_id']),
+    ('ix_room_types_hotel_id', 'room_types', ['hotel_id']),
+    ('ix_rooms_hotel_id', 'rooms', ['hotel_id']),
+    ('ix_rooms_room_type_id', 'rooms', ['room_type_id']),
+    ('ix_rooms_room_number', 'rooms', ['room_number']),
+    ('ix_clients_email', 'clients', ['email']),
+    ('ix_stays_booking_id', 'stays', ['booking_id']),
+    ('ix_stays_room_id', 'stays', ['room_id']),
+    ('ix_stays_type_payment_id', 'stays', ['type_payment_id']),
+    ('ix_service_usage_stay_id', 'service_usage', ['stay_id']),
+    ('ix_service_usage_service_id', 'service_usage', ['service_id']),
+    ('ix_feedback_hotel_id_stay_id', 'feedback', ['hotel_id', 'stay_id']),
+    ('ix_feedback_stay_id', 'feedback', ['stay_id']),
+]
+
+
+def upgrade():
+    # CREATE INDEX CONCURRENTLY нельзя выполнять внутри транзакции, зато он не блокирует запись в таблицы
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.create_index(
+                name,
+                table,
+                columns,
+                unique=False,
+                schema='my_app_schema',
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        for name, table, columns in reversed(INDEXES):
+            op.drop_index(
+                name,
+                table_name=table,
+                schema='my_app_schema',
+                postgresql_concurrently=True,
+                if_exists=True,
+            )
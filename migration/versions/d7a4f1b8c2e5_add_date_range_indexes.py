@@ -0,0 +1,64 @@
+""" add_date_range_indexes
+
+Revision ID: d7a4f1b8c2e5
+Revises: b3e1c9d4f2a7
+Create Date: 2026-10-18 11:04:27.552310
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from project.core.config import settings
+
+
+# revision identifiers, used by Alembic.
+revision = 'd7a4f1b8c2e5'
+down_revision = 'b3e1c9d4f2a7'
+branch_labels = None
+depends_on = None
+
+
+# (имя индекса, таблица)
+INDEXES = [
+    ('ix_bookings_date_range', 'bookings'),
+    ('ix_stays_date_range', 'stays'),
+]
+
+INVERTED = 'SELECT count(*) FROM my_app_schema.{table} WHERE check_out_date < check_in_date'
+
+
+def upgrade():
+    # daterange() падает на выезде раньше заезда, а CONCURRENTLY после ошибки оставляет INVALID-индекс
+    for name, table in INDEXES:
+        inverted = op.get_bind().scalar(sa.text(INVERTED.format(table=table)))
+        if inverted:
+            raise RuntimeError(
+                f'{inverted} rows in {table} have check_out_date before check_in_date; '
+                f'fix them before adding {name}'
+            )
+
+    # Выражение должно совпадать с тем, что используется в запросах, иначе планировщик не возьмёт индекс
+    with op.get_context().autocommit_block():
+        for name, table in INDEXES:
+            op.create_index(
+                name,
+                table,
+                [sa.text('daterange(check_in_date, check_out_date)')],
+                unique=False,
+                schema='my_app_schema',
+                postgresql_using='gist',
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        for name, table in reversed(INDEXES):
+            op.drop_index(
+                name,
+                table_name=table,
+                schema='my_app_schema',
+                postgresql_concurrently=True,
+                if_exists=True,
+            )
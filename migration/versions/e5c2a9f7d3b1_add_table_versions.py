@@ -0,0 +1,95 @@
+""" add_table_versions
+
+Revision ID: e5c2a9f7d3b1
+Revises: d7a4f1b8c2e5
+Create Date: 2026-10-18 14:37:09.118406
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from project.core.config import settings
+
+
+# revision identifiers, used by Alembic.
+revision = 'e5c2a9f7d3b1'
+down_revision = 'd7a4f1b8c2e5'
+branch_labels = None
+depends_on = None
+
+
+# (таблица, первичный ключ) — справочники, которые опрашивают дашборды
+TABLES = [
+    ('hotels', 'hotel_id'),
+    ('room_types', 'room_type_id'),
+    ('rooms', 'room_id'),
+    ('services', 'service_id'),
+    ('payment_types', 'type_payment_id'),
+]
+
+# Сколько id изменённых строк передавать в уведомлении, дальше — «изменилось всё»
+MAX_NOTIFY_IDS = 500
+
+
+def upgrade():
+    op.create_table('table_versions',
+    sa.Column('table_name', sa.String(length=63), nullable=False),
+    sa.Column('version', sa.BigInteger(), nullable=False, server_default='0'),
+    sa.PrimaryKeyConstraint('table_name'),
+    schema='my_app_schema'
+    )
+    op.bulk_insert(
+        sa.table('table_versions', sa.column('table_name'), sa.column('version'), schema='my_app_schema'),
+        [{'table_name': table, 'version': 1} for table, _ in TABLES],
+    )
+
+    # Счётчик изменений таблицы + NOTIFY в канал инвалидации кешей (доставляется при коммите).
+    # Аргументы триггера: имя первичного ключа и канал.
+    op.execute(f"""
+        CREATE FUNCTION my_app_schema.bump_table_version() RETURNS trigger
+        LANGUAGE plpgsql AS $$
+        DECLARE
+            changed bigint;
+            ids bigint[];
+            new_version bigint;
+        BEGIN
+            EXECUTE format('SELECT count(*), (array_agg(%I))[1:{MAX_NOTIFY_IDS}] FROM changed_rows', TG_ARGV[0])
+                INTO changed, ids;
+            IF changed = 0 THEN
+                RETURN NULL;
+            END IF;
+
+            UPDATE my_app_schema.table_versions SET version = version + 1
+             WHERE table_name = TG_TABLE_NAME
+            RETURNING version INTO new_version;
+
+            PERFORM pg_notify(TG_ARGV[1], json_build_object(
+                'source', 'postgres',
+                'messages', json_build_array(json_build_object(
+                    'topic', 'version',
+                    'table', TG_TABLE_NAME,
+                    'version', new_version,
+                    'ids', CASE WHEN changed <= {MAX_NOTIFY_IDS} THEN to_json(ids) END
+                ))
+            )::text);
+            RETURN NULL;
+        END;
+        $$
+    """)
+    for table, pk in TABLES:
+        for operation, transition in (('INSERT', 'NEW'), ('UPDATE', 'NEW'), ('DELETE', 'OLD')):
+            op.execute(f"""
+                CREATE TRIGGER {table}_version_{operation.lower()}
+                AFTER {operation} ON my_app_schema.{table}
+                REFERENCING {transition} TABLE AS changed_rows
+                FOR EACH STATEMENT
+                EXECUTE FUNCTION my_app_schema.bump_table_version('{pk}', '{settings.CACHE_INVALIDATION_CHANNEL}')
+            """)
+
+
+def downgrade():
+    for table, _ in reversed(TABLES):
+        for operation in ('delete', 'update', 'insert'):
+            op.execute(f"DROP TRIGGER IF EXISTS {table}_version_{operation} ON my_app_schema.{table}")
+    op.execute("DROP FUNCTION IF EXISTS my_app_schema.bump_table_version()")
+    op.drop_table('table_versions', schema='my_app_schema')
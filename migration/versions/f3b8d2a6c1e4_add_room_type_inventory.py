@@ -0,0 +1,42 @@
+""" add_room_type_inventory
+
+Revision ID: f3b8d2a6c1e4
+Revises: e5c2a9f7d3b1
+Create Date: 2026-10-18 18:12:40.265913
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f3b8d2a6c1e4'
+down_revision = 'e5c2a9f7d3b1'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('room_type_inventory',
+    sa.Column('room_type_id', sa.Integer(), nullable=False),
+    sa.Column('night', sa.Date(), nullable=False),
+    sa.Column('sold', sa.Integer(), nullable=False, server_default='0'),
+    sa.Column('capacity', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['room_type_id'], ['my_app_schema.room_types.room_type_id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('room_type_id', 'night'),
+    schema='my_app_schema'
+    )
+    # Ночи без броней не хранятся: строку создаёт первая бронь, capacity — число номеров типа.
+    # Уже перепроданные ночи переносятся как есть (sold > capacity), новые брони на них не пройдут
+    op.execute("""
+        INSERT INTO my_app_schema.room_type_inventory (room_type_id, night, sold, capacity)
+        SELECT b.room_type_id, night::date, count(*),
+               (SELECT count(*) FROM my_app_schema.rooms r WHERE r.room_type_id = b.room_type_id)
+          FROM my_app_schema.bookings b,
+               generate_series(b.check_in_date, b.check_out_date - 1, interval '1 day') AS night
+         GROUP BY b.room_type_id, night
+    """)
+
+
+def downgrade():
+    op.drop_table('room_type_inventory', schema='my_app_schema')
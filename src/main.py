@@ -1,11 +1,22 @@
 import asyncio
 import logging
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
 import uvicorn
 
 from fastapi import FastAPI
 from starlette.middleware.cors import CORSMiddleware
 
 from project.core.config import settings
+from project.infrastructure.postgres.database import database
+from project.infrastructure.postgres.health import health_monitor
+from project.infrastructure.postgres.notifications import invalidation_bus
+from project.infrastructure.postgres.replicas import replica_pool
+from project.infrastructure.postgres.shards import shard_router
+from project.infrastructure.cache.snapshot import reference_snapshot
+from project.api.consistency import ReadYourWritesMiddleware
+from project.api.health_routes import router as health_router
 from project.api.clients_routes import router as clients_router
 from project.api.hotels_routes import router as hotels_router
 from project.api.roomtype_routes import router as roomtypes_router
@@ -16,9 +27,33 @@ from project.api.service_routes import router as services_router
 from project.api.service_usage_routes import router as service_usage_router
 from project.api.feedback_routes import router as feedback_router
 from project.api.payment_types_routes import router as payment_types_router
+from project.api.export_routes import router as export_router
+from project.api.bulk_routes import router as bulk_router
+from project.api.availability_routes import router as availability_router
+from project.api.overbooking_routes import router as overbooking_router
+from project.api.assignment_routes import router as assignment_router
 logger = logging.getLogger(__name__)
 
 
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    database.connect()
+    replica_pool.connect()
+    shard_router.connect()
+    health_monitor.start()
+    invalidation_bus.start()
+    reference_snapshot.start()
+    try:
+        yield
+    finally:
+        await reference_snapshot.stop()
+        await invalidation_bus.stop()
+        await health_monitor.stop()
+        await shard_router.disconnect()
+        await replica_pool.disconnect()
+        await database.disconnect()
+
+
 def create_app() -> FastAPI:
     app_options = {}
     if settings.ENV.lower() == "prod":
@@ -29,7 +64,7 @@ def create_app() -> FastAPI:
     if settings.LOG_LEVEL in ["DEBUG", "INFO"]:
         app_options["debug"] = True
 
-    app = FastAPI(root_path=settings.ROOT_PATH, **app_options)
+    app = FastAPI(root_path=settings.ROOT_PATH, lifespan=lifespan, **app_options)
     app.add_middleware(
         CORSMiddleware,
         allow_origins=settings.ORIGINS,
@@ -37,8 +72,10 @@ def create_app() -> FastAPI:
         allow_methods=["*"],
         allow_headers=["*"],
     )
+    app.add_middleware(ReadYourWritesMiddleware)
 
     # Подключение всех маршрутов
+    app.include_router(health_router, prefix="/health", tags=["Health APIs"])
     app.include_router(clients_router, prefix="/api", tags=["Clients APIs"])
     app.include_router(hotels_router, prefix="/api", tags=["Hotels APIs"])
     app.include_router(roomtypes_router, prefix="/api", tags=["RoomTypes APIs"])
@@ -49,6 +86,11 @@ def create_app() -> FastAPI:
     app.include_router(service_usage_router, prefix="/api", tags=["Service Usage APIs"])
     app.include_router(feedback_router, prefix="/api", tags=["Feedback APIs"])
     app.include_router(payment_types_router, prefix="/api", tags=["Payment Types APIs"])
+    app.include_router(export_router, prefix="/api", tags=["Export APIs"])
+    app.include_router(bulk_router, prefix="/api", tags=["Bulk APIs"])
+    app.include_router(availability_router, prefix="/api", tags=["Availability APIs"])
+    app.include_router(overbooking_router, prefix="/api", tags=["Overbooking APIs"])
+    app.include_router(assignment_router, prefix="/api", tags=["Assignment APIs"])
     return app
 
 
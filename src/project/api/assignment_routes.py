@@ -0,0 +1,33 @@
+from datetime import date
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from project.infrastructure.postgres.repository.assignment_repo import AssignmentRepository
+from project.api.depends import get_session
+from project.api.responses import ModelResponse
+from project.schemas.assignment import AssignmentPlanSchema
+from project.core.exceptions import InvalidDateRange
+
+router = APIRouter()
+assignment_repo = AssignmentRepository()
+
+
+@router.get(
+    "/assign_rooms",
+    response_model=AssignmentPlanSchema,
+    status_code=status.HTTP_200_OK
+)
+async def assign_rooms(
+    hotel_id: int,
+    date_from: date = Query(alias="from"),
+    date_to: date = Query(alias="to"),
+    session: AsyncSession = Depends(get_session),
+) -> ModelResponse:
+    # Только план: ничего не записывается, проживания создаются через /api/bulk/stays
+    try:
+        plan = await assignment_repo.plan_assignment(
+            session=session, hotel_id=hotel_id, date_from=date_from, date_to=date_to
+        )
+    except InvalidDateRange as error:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=error.message)
+    return ModelResponse(plan)
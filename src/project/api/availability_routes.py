@@ -0,0 +1,51 @@
+from datetime import date
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from project.core.config import settings
+from project.infrastructure.cache.occupancy import occupancy_cache
+from project.infrastructure.postgres.repository.availability_repo import AvailabilityRepository
+from project.api.depends import get_primary_session
+from project.api.responses import ModelResponse
+from project.schemas.availability import AvailabilitySchema
+from project.core.exceptions import InvalidDateRange
+
+router = APIRouter()
+availability_repo = AvailabilityRepository()
+
+
+@router.get(
+    "/availability",
+    response_model=AvailabilitySchema,
+    status_code=status.HTTP_200_OK
+)
+async def get_availability(
+    hotel_id: int,
+    check_in_date: date,
+    check_out_date: date,
+    capacity: int = Query(default=1, ge=1),
+    # Кеш занятости строится и сверяется по основной БД: с реплики он мог бы пропустить свежие брони
+    session: AsyncSession = Depends(get_primary_session),
+) -> ModelResponse:
+    try:
+        availability = None
+        if settings.AVAILABILITY_CACHE_ENABLED:
+            availability = await occupancy_cache.get_availability(
+                session=session,
+                hotel_id=hotel_id,
+                check_in_date=check_in_date,
+                check_out_date=check_out_date,
+                capacity=capacity,
+            )
+        # Окно за пределами горизонта кеша (или кеш выключен) считаем запросом к БД
+        if availability is None:
+            availability = await availability_repo.get_availability(
+                session=session,
+                hotel_id=hotel_id,
+                check_in_date=check_in_date,
+                check_out_date=check_out_date,
+                capacity=capacity,
+            )
+    except InvalidDateRange as error:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=error.message)
+    return ModelResponse(availability)
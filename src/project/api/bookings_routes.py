@@ -1,29 +1,60 @@
-from fastapi import APIRouter, HTTPException, status
+from datetime import date
+
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
 from project.infrastructure.postgres.repository.bookings_repo import BookingsRepository
-from project.infrastructure.postgres.database import PostgresDatabase
-from project.schemas.bookings import BookingSchema, BookingCreateUpdateSchema
+from project.api.depends import PageParams, get_session
+from project.api.formats import LIST_RESPONSES, list_media_type
+from project.api.responses import ModelResponse
+from project.schemas.pagination import Page
+from project.schemas.bookings import BookingSchema, BookingSortField, BookingCreateUpdateSchema
 from project.core.exceptions import (
+    InvalidCursor,
     ClientNotFound,
     RoomTypeNotFound,
     HotelNotFound,
     BookingNotFound,
     BookingAlreadyExists,
+    CrossShardMove,
+    RoomTypeOverbooked,
 )
 
 router = APIRouter()
 bookings_repo = BookingsRepository()
-database = PostgresDatabase()
 
 @router.get(
     "/all_bookings",
-    response_model=list[BookingSchema],
+    response_model=Page[BookingSchema],
+    responses=LIST_RESPONSES,
     status_code=status.HTTP_200_OK,
 )
-async def get_all_bookings() -> list[BookingSchema]:
-    async with database.session() as session:
-        await bookings_repo.check_connection(session=session)
-        all_bookings = await bookings_repo.get_all_bookings(session=session)
-    return all_bookings
+async def get_all_bookings(
+    hotel_id: int | None = None,
+    client_id: int | None = None,
+    room_type_id: int | None = None,
+    check_in_from: date | None = None,
+    check_in_to: date | None = None,
+    sort_by: BookingSortField = "booking_id",
+    page: PageParams = Depends(),
+    media_type: str = Depends(list_media_type),
+    session: AsyncSession = Depends(get_session),
+) -> ModelResponse:
+    try:
+        all_bookings = await bookings_repo.get_all_bookings(
+            session=session,
+            limit=page.limit,
+            cursor=page.cursor,
+            sort_by=sort_by,
+            descending=page.descending,
+            hotel_id=hotel_id,
+            client_id=client_id,
+            room_type_id=room_type_id,
+            check_in_from=check_in_from,
+            check_in_to=check_in_to,
+        )
+    except InvalidCursor as error:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=error.message)
+    return ModelResponse(all_bookings, media_type=media_type)
 
 
 @router.get(
@@ -31,13 +62,12 @@ async def get_all_bookings() -> list[BookingSchema]:
     response_model=BookingSchema,
     status_code=status.HTTP_200_OK,
 )
-async def get_booking_by_id(booking_id: int) -> BookingSchema:
-    async with database.session() as session:
-        try:
-            booking = await bookings_repo.get_booking_by_id(session=session, booking_id=booking_id)
-        except BookingNotFound as error:
-            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=error.message)
-    return booking
+async def get_booking_by_id(booking_id: int, session: AsyncSession = Depends(get_session)) -> ModelResponse:
+    try:
+        booking = await bookings_repo.get_booking_by_id(session=session, booking_id=booking_id)
+    except BookingNotFound as error:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=error.message)
+    return ModelResponse(booking)
 
 
 @router.post(
@@ -45,26 +75,27 @@ async def get_booking_by_id(booking_id: int) -> BookingSchema:
     response_model=BookingSchema,
     status_code=status.HTTP_201_CREATED,
 )
-async def add_booking(booking_dto: BookingCreateUpdateSchema) -> BookingSchema:
-    async with database.session() as session:
-        try:
-            new_booking = await bookings_repo.create_booking(session=session, booking=booking_dto)
-        except ClientNotFound as error:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND, detail="Client not found"
-            )
-        except RoomTypeNotFound as error:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND, detail="Room type not found"
-            )
-        except HotelNotFound as error:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND, detail="Hotel not found"
-            )
-        except BookingAlreadyExists as error:
-            raise HTTPException(
-                status_code=status.HTTP_409_CONFLICT, detail="Booking already exists"
-            )
+async def add_booking(booking_dto: BookingCreateUpdateSchema, session: AsyncSession = Depends(get_session)) -> BookingSchema:
+    try:
+        new_booking = await bookings_repo.create_booking(session=session, booking=booking_dto)
+    except ClientNotFound as error:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Client not found"
+        )
+    except RoomTypeNotFound as error:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Room type not found"
+        )
+    except HotelNotFound as error:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Hotel not found"
+        )
+    except BookingAlreadyExists as error:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT, detail="Booking already exists"
+        )
+    except RoomTypeOverbooked as error:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=error.message)
     return new_booking
 
 
@@ -74,15 +105,24 @@ async def add_booking(booking_dto: BookingCreateUpdateSchema) -> BookingSchema:
     status_code=status.HTTP_200_OK,
 )
 async def update_booking(
-    booking_id: int, booking_dto: BookingCreateUpdateSchema
+    booking_id: int, booking_dto: BookingCreateUpdateSchema, session: AsyncSession = Depends(get_session)
 ) -> BookingSchema:
-    async with database.session() as session:
-        try:
-            updated_booking = await bookings_repo.update_booking(
-                session=session, booking_id=booking_id, booking=booking_dto
-            )
-        except BookingNotFound as error:
-            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=error.message)
+    try:
+        updated_booking = await bookings_repo.update_booking(
+            session=session, booking_id=booking_id, booking=booking_dto
+        )
+    except BookingNotFound as error:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=error.message)
+    except ClientNotFound as error:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=error.message)
+    except RoomTypeNotFound as error:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=error.message)
+    except HotelNotFound as error:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=error.message)
+    except CrossShardMove as error:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=error.message)
+    except RoomTypeOverbooked as error:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=error.message)
     return updated_booking
 
 
@@ -90,9 +130,8 @@ async def update_booking(
     "/delete_booking/{booking_id}",
     status_code=status.HTTP_204_NO_CONTENT,
 )
-async def delete_booking(booking_id: int) -> None:
-    async with database.session() as session:
-        try:
-            await bookings_repo.delete_booking(session=session, booking_id=booking_id)
-        except BookingNotFound as error:
-            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=error.message)
+async def delete_booking(booking_id: int, session: AsyncSession = Depends(get_session)) -> None:
+    try:
+        await bookings_repo.delete_booking(session=session, booking_id=booking_id)
+    except BookingNotFound as error:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=error.message)
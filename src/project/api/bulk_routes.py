@@ -0,0 +1,68 @@
+from typing import Any
+
+from fastapi import APIRouter, Body, Depends, status
+from pydantic import BaseModel
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from project.api.depends import get_session
+from project.core.config import settings
+from project.infrastructure.postgres.repository.bookings_repo import BookingsRepository
+from project.infrastructure.postgres.repository.service_usage_repo import ServiceUsageRepository
+from project.infrastructure.postgres.repository.stays_repo import StaysRepository
+from project.schemas.bookings import BookingCreateUpdateSchema, BookingSchema
+from project.schemas.bulk import BulkCreateResult, BulkItemError, validate_batch
+from project.schemas.service_usage import ServiceUsageCreateUpdateSchema, ServiceUsageSchema
+from project.schemas.stays import StayCreateUpdateSchema, StaySchema
+
+router = APIRouter()
+bookings_repo = BookingsRepository()
+stays_repo = StaysRepository()
+service_usage_repo = ServiceUsageRepository()
+
+BULK_BODY = Body(..., min_length=1, max_length=settings.BULK_MAX_ITEMS)
+
+
+def _bulk_result(schema: type[BaseModel], created: dict[int, Any], errors: dict[int, list[str]]) -> BulkCreateResult:
+    return BulkCreateResult(
+        created=[schema.model_validate(obj=created[index]) for index in sorted(created)],
+        errors=[BulkItemError(index=index, errors=errors[index]) for index in sorted(errors)],
+    )
+
+
+@router.post(
+    "/bulk/bookings",
+    response_model=BulkCreateResult[BookingSchema],
+    status_code=status.HTTP_201_CREATED
+)
+async def bulk_create_bookings(
+    items: list[Any] = BULK_BODY, session: AsyncSession = Depends(get_session)
+) -> BulkCreateResult[BookingSchema]:
+    bookings, errors = validate_batch(BookingCreateUpdateSchema, items)
+    created, reference_errors = await bookings_repo.bulk_create_bookings(session=session, bookings=bookings)
+    return _bulk_result(BookingSchema, created, errors | reference_errors)
+
+
+@router.post(
+    "/bulk/stays",
+    response_model=BulkCreateResult[StaySchema],
+    status_code=status.HTTP_201_CREATED
+)
+async def bulk_create_stays(
+    items: list[Any] = BULK_BODY, session: AsyncSession = Depends(get_session)
+) -> BulkCreateResult[StaySchema]:
+    stays, errors = validate_batch(StayCreateUpdateSchema, items)
+    created, reference_errors = await stays_repo.bulk_create_stays(session=session, stays=stays)
+    return _bulk_result(StaySchema, created, errors | reference_errors)
+
+
+@router.post(
+    "/bulk/service_usage",
+    response_model=BulkCreateResult[ServiceUsageSchema],
+    status_code=status.HTTP_201_CREATED
+)
+async def bulk_create_service_usage(
+    items: list[Any] = BULK_BODY, session: AsyncSession = Depends(get_session)
+) -> BulkCreateResult[ServiceUsageSchema]:
+    usages, errors = validate_batch(ServiceUsageCreateUpdateSchema, items)
+    created, reference_errors = await service_usage_repo.bulk_create_service_usage(session=session, usages=usages)
+    return _bulk_result(ServiceUsageSchema, created, errors | reference_errors)
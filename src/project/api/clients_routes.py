@@ -1,25 +1,43 @@
-from fastapi import APIRouter, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from project.infrastructure.postgres.repository.clients_repo import ClientsRepository
-from project.infrastructure.postgres.database import PostgresDatabase
-from project.schemas.clients import ClientSchema, ClientCreateUpdateSchema
-from project.core.exceptions import ClientNotFound, ClientAlreadyExists
+from project.api.depends import PageParams, get_session
+from project.api.formats import LIST_RESPONSES, list_media_type
+from project.api.responses import ModelResponse
+from project.schemas.pagination import Page
+from project.schemas.clients import ClientSchema, ClientSortField, ClientCreateUpdateSchema
+from project.core.exceptions import ClientNotFound, ClientAlreadyExists, InvalidCursor
 
 router = APIRouter()
 clients_repo = ClientsRepository()
-database = PostgresDatabase()
 
 
 @router.get(
     "/all_clients",
-    response_model=list[ClientSchema],
+    response_model=Page[ClientSchema],
+    responses=LIST_RESPONSES,
     status_code=status.HTTP_200_OK
 )
-async def get_all_clients() -> list[ClientSchema]:
-    async with database.session() as session:
-        await clients_repo.check_connection(session=session)
-        all_clients = await clients_repo.get_all_clients(session=session)
-    return all_clients
+async def get_all_clients(
+    email: str | None = None,
+    sort_by: ClientSortField = "client_id",
+    page: PageParams = Depends(),
+    media_type: str = Depends(list_media_type),
+    session: AsyncSession = Depends(get_session),
+) -> ModelResponse:
+    try:
+        all_clients = await clients_repo.get_all_clients(
+            session=session,
+            limit=page.limit,
+            cursor=page.cursor,
+            sort_by=sort_by,
+            descending=page.descending,
+            email=email,
+        )
+    except InvalidCursor as error:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=error.message)
+    return ModelResponse(all_clients, media_type=media_type)
 
 
 @router.get(
@@ -27,13 +45,12 @@ async def get_all_clients() -> list[ClientSchema]:
     response_model=ClientSchema,
     status_code=status.HTTP_200_OK
 )
-async def get_client_by_id(client_id: int) -> ClientSchema:
-    async with database.session() as session:
-        try:
-            client = await clients_repo.get_client(session=session, client_id=client_id)
-        except ClientNotFound as error:
-            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=error.message)
-    return client
+async def get_client_by_id(client_id: int, session: AsyncSession = Depends(get_session)) -> ModelResponse:
+    try:
+        client = await clients_repo.get_client(session=session, client_id=client_id)
+    except ClientNotFound as error:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=error.message)
+    return ModelResponse(client)
 
 
 
@@ -42,12 +59,11 @@ async def get_client_by_id(client_id: int) -> ClientSchema:
     response_model=ClientSchema,
     status_code=status.HTTP_201_CREATED
 )
-async def add_client(client_dto: ClientCreateUpdateSchema) -> ClientSchema:
-    async with database.session() as session:
-        try:
-            new_client = await clients_repo.create_client(session=session, client=client_dto)
-        except ClientAlreadyExists as error:
-            raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=error.message)
+async def add_client(client_dto: ClientCreateUpdateSchema, session: AsyncSession = Depends(get_session)) -> ClientSchema:
+    try:
+        new_client = await clients_repo.create_client(session=session, client=client_dto)
+    except ClientAlreadyExists as error:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=error.message)
     return new_client
 
 
@@ -56,12 +72,11 @@ async def add_client(client_dto: ClientCreateUpdateSchema) -> ClientSchema:
     response_model=ClientSchema,
     status_code=status.HTTP_200_OK
 )
-async def update_client(client_id: int, client_dto: ClientCreateUpdateSchema) -> ClientSchema:
-    async with database.session() as session:
-        try:
-            updated_client = await clients_repo.update_client(session=session, client_id=client_id, client=client_dto)
-        except ClientNotFound as error:
-            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=error.message)
+async def update_client(client_id: int, client_dto: ClientCreateUpdateSchema, session: AsyncSession = Depends(get_session)) -> ClientSchema:
+    try:
+        updated_client = await clients_repo.update_client(session=session, client_id=client_id, client=client_dto)
+    except ClientNotFound as error:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=error.message)
     return updated_client
 
 
@@ -69,9 +84,8 @@ async def update_client(client_id: int, client_dto: ClientCreateUpdateSchema) ->
     "/delete_client/{client_id}",
     status_code=status.HTTP_204_NO_CONTENT
 )
-async def delete_client(client_id: int) -> None:
-    async with database.session() as session:
-        try:
-            await clients_repo.delete_client(session=session, client_id=client_id)
-        except ClientNotFound as error:
-            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=error.message)
+async def delete_client(client_id: int, session: AsyncSession = Depends(get_session)) -> None:
+    try:
+        await clients_repo.delete_client(session=session, client_id=client_id)
+    except ClientNotFound as error:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=error.message)
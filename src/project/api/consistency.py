@@ -0,0 +1,62 @@
+import math
+
+from fastapi import Request
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from project.core.config import settings
+from project.infrastructure.postgres.database import format_lsn, parse_lsn
+from project.infrastructure.postgres.replicas import replica_pool
+
+READ_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+_COMMIT_LSN = "commit_lsn"
+# Наибольший pg_lsn: ни одна реплика его не догонит, клиент читает с основной БД, пока живёт cookie
+PRIMARY_ONLY_LSN = 0xFFFFFFFFFFFFFFFF
+
+
+def read_after_lsn(request: Request) -> int | None:
+    """LSN последней записи клиента из cookie; реплика для него должна быть не старше."""
+    value = request.cookies.get(settings.POSTGRES_READ_YOUR_WRITES_COOKIE)
+    if not value:
+        return None
+    try:
+        return parse_lsn(value)
+    except ValueError:
+        return None
+
+
+def remember_commit(request: Request, lsn: int) -> None:
+    setattr(request.state, _COMMIT_LSN, lsn)
+
+
+class ReadYourWritesMiddleware:
+    """Ставит клиенту cookie с LSN его коммита, чтобы следующие GET не ушли на отставшую реплику.
+
+    Коммит сессии выполняется при выходе из зависимости `get_session`; в FastAPI из pyproject
+    (0.115) это происходит до отправки заголовков ответа, поэтому LSN здесь уже известен.
+    Если его нет (FastAPI 0.118+ закрывает зависимости после ответа), успешная запись
+    закрепляет клиента за основной БД на время жизни cookie.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] in READ_METHODS or not replica_pool.enabled:
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_cookie(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                lsn = scope.get("state", {}).get(_COMMIT_LSN)
+                if lsn is None and message["status"] < 400:
+                    lsn = PRIMARY_ONLY_LSN
+                if lsn is not None:
+                    MutableHeaders(scope=message).append(
+                        "set-cookie",
+                        f"{settings.POSTGRES_READ_YOUR_WRITES_COOKIE}={format_lsn(lsn)}; "
+                        f"Max-Age={math.ceil(settings.POSTGRES_READ_YOUR_WRITES_SEC)}; Path=/; HttpOnly; SameSite=lax",
+                    )
+            await send(message)
+
+        await self.app(scope, receive, send_with_cookie)
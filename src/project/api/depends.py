@@ -0,0 +1,39 @@
+from typing import AsyncIterator, Literal
+
+from fastapi import Query, Request
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from project.api.consistency import READ_METHODS, read_after_lsn, remember_commit
+from project.core.config import settings
+from project.infrastructure.postgres.database import database
+from project.infrastructure.postgres.replicas import replica_pool
+
+
+async def get_session(request: Request) -> AsyncIterator[AsyncSession]:
+    """GET и HEAD читают с реплики (если она догнала последнюю запись клиента), остальное — основная БД."""
+    if request.method in READ_METHODS:
+        async with replica_pool.read_session(read_after_lsn(request)) as session:
+            yield session
+        return
+
+    async with database.session() as session:
+        yield session
+    if replica_pool.enabled:
+        remember_commit(request, await database.current_lsn())
+
+
+async def get_primary_session() -> AsyncIterator[AsyncSession]:
+    async with database.session() as session:
+        yield session
+
+
+class PageParams:
+    def __init__(
+        self,
+        limit: int = Query(default=settings.PAGE_DEFAULT_LIMIT, ge=1, le=settings.PAGE_MAX_LIMIT),
+        cursor: str | None = Query(default=None, description="Opaque next_cursor from the previous page"),
+        order: Literal["asc", "desc"] = "asc",
+    ) -> None:
+        self.limit = limit
+        self.cursor = cursor
+        self.descending = order == "desc"
@@ -0,0 +1,59 @@
+from fastapi import Depends, HTTPException, Request, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from project.api.depends import get_session
+from project.api.formats import ETAG_SUFFIXES, list_media_type
+from project.infrastructure.cache.versions import table_versions
+from project.infrastructure.postgres.shards import is_sharded
+
+
+def _matches(if_none_match: str, etag: str) -> bool:
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        # If-None-Match сравнивается слабо: W/ у тега клиента не мешает совпадению
+        if candidate == "*" or candidate.removeprefix("W/") == etag:
+            return True
+    return False
+
+
+class ETag:
+    """Зависимость условного GET для справочников.
+
+    Тег строится из версии таблицы (для списков, с суффиксом формата ответа) или версии
+    строки (для карточки по id).
+    Если тег клиента из If-None-Match совпал, отвечаем 304 до выборки строк и сериализации.
+    """
+
+    def __init__(self, table: str, id_param: str | None = None) -> None:
+        self.table = table
+        self.id_param = id_param
+
+    async def __call__(
+        self,
+        request: Request,
+        response: Response,
+        media_type: str = Depends(list_media_type),
+        session: AsyncSession = Depends(get_session),
+    ) -> str | None:
+        if is_sharded(self.table):
+            # Версии таблиц отелей ведутся в каждом шарде отдельно — общего тега у них нет
+            return None
+        headers = {}
+        if self.id_param is None:
+            version = await table_versions.get(session, self.table)
+            etag = f'"{self.table}-{version}{ETAG_SUFFIXES[media_type]}"'
+            headers["Vary"] = "Accept"
+        else:
+            try:
+                row_id = int(request.path_params[self.id_param])
+            except ValueError:
+                # Некорректный id отклонит валидация самого маршрута
+                return None
+            version = await table_versions.get_row(session, self.table, row_id)
+            etag = f'"{self.table}-{row_id}-{version}"'
+
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match and _matches(if_none_match, etag):
+            raise HTTPException(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag, **headers})
+        response.headers["ETag"] = etag
+        return etag
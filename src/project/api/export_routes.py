@@ -0,0 +1,117 @@
+import csv
+import io
+import json
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, AsyncIterator, Literal
+
+from fastapi import APIRouter, Query, Request, status
+from fastapi.responses import StreamingResponse
+
+from project.api.consistency import read_after_lsn
+from project.api.formats import (
+    ARROW,
+    ARROW_EOS,
+    MSGPACK,
+    msgpack_packer,
+    negotiate,
+    rows_to_arrow_batch,
+    table_arrow_schema,
+)
+from project.core.config import settings
+from project.infrastructure.postgres.replicas import replica_pool
+from project.infrastructure.postgres.repository.export_repo import ExportEntity, ExportRepository
+
+router = APIRouter()
+export_repo = ExportRepository()
+
+ExportFormat = Literal["ndjson", "csv", "msgpack", "arrow"]
+
+MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+    "msgpack": MSGPACK,
+    "arrow": ARROW,
+}
+FORMATS = {media_type: format for format, media_type in MEDIA_TYPES.items()}
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        # Строкой, а не float: суммы в выгрузке для сверки должны совпадать с БД до копейки
+        return str(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+async def _ndjson_chunks(entity: ExportEntity, columns: list[str], batch_size: int, min_lsn: int | None) -> AsyncIterator[bytes]:
+    # Сессия открывается внутри генератора: зависимость get_session закрылась бы до начала стриминга
+    async with replica_pool.read_session(min_lsn) as session:
+        async for rows in export_repo.stream_rows(session=session, entity=entity, batch_size=batch_size):
+            yield "".join(
+                json.dumps(dict(zip(columns, row)), default=_json_default, ensure_ascii=False) + "\n"
+                for row in rows
+            ).encode()
+
+
+async def _csv_chunks(entity: ExportEntity, columns: list[str], batch_size: int, min_lsn: int | None) -> AsyncIterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+    yield buffer.getvalue().encode()
+
+    async with replica_pool.read_session(min_lsn) as session:
+        async for rows in export_repo.stream_rows(session=session, entity=entity, batch_size=batch_size):
+            buffer.seek(0)
+            buffer.truncate()
+            writer.writerows(rows)
+            yield buffer.getvalue().encode()
+
+
+async def _msgpack_chunks(entity: ExportEntity, columns: list[str], batch_size: int, min_lsn: int | None) -> AsyncIterator[bytes]:
+    # Поток MessagePack-объектов, по одному на строку; читается msgpack.Unpacker
+    packer = msgpack_packer()
+    async with replica_pool.read_session(min_lsn) as session:
+        async for rows in export_repo.stream_rows(session=session, entity=entity, batch_size=batch_size):
+            yield b"".join(packer.pack(dict(zip(columns, row))) for row in rows)
+
+
+async def _arrow_chunks(entity: ExportEntity, columns: list[str], batch_size: int, min_lsn: int | None) -> AsyncIterator[bytes]:
+    # IPC-поток Arrow: схема, затем по record batch на пачку серверного курсора, затем EOS.
+    # Decimal и даты остаются типизированными (decimal128, date32), без перевода в текст
+    schema = table_arrow_schema(export_repo.get_table(entity))
+    yield schema.serialize().to_pybytes()
+    async with replica_pool.read_session(min_lsn) as session:
+        async for rows in export_repo.stream_rows(session=session, entity=entity, batch_size=batch_size):
+            yield rows_to_arrow_batch(schema, rows).serialize().to_pybytes()
+    yield ARROW_EOS
+
+
+CHUNKS = {
+    "ndjson": _ndjson_chunks,
+    "csv": _csv_chunks,
+    "msgpack": _msgpack_chunks,
+    "arrow": _arrow_chunks,
+}
+
+
+@router.get(
+    "/export/{entity}",
+    status_code=status.HTTP_200_OK,
+    response_class=StreamingResponse,
+)
+async def export_entity(
+    request: Request,
+    entity: ExportEntity,
+    format: ExportFormat | None = Query(default=None, description="Overrides the Accept header"),
+    batch_size: int = Query(default=settings.EXPORT_BATCH_SIZE, ge=1, le=50_000),
+) -> StreamingResponse:
+    if format is None:
+        format = FORMATS[negotiate(request.headers.get("accept"), tuple(FORMATS), MEDIA_TYPES["ndjson"])]
+    columns = export_repo.get_columns(entity)
+    return StreamingResponse(
+        CHUNKS[format](entity, columns, batch_size, read_after_lsn(request)),
+        media_type=MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{entity}.{format}"', "Vary": "Accept"},
+    )
@@ -1,24 +1,44 @@
-from fastapi import APIRouter, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
 from project.infrastructure.postgres.repository.feedback_repo import FeedbackRepository
-from project.infrastructure.postgres.database import PostgresDatabase
-from project.schemas.feedback import FeedbackSchema, FeedbackCreateUpdateSchema
-from project.core.exceptions import FeedbackNotFound,HotelNotFound,StayNotFound,FeedbackAlreadyExists
+from project.api.depends import PageParams, get_session
+from project.api.formats import LIST_RESPONSES, list_media_type
+from project.api.responses import ModelResponse
+from project.schemas.pagination import Page
+from project.schemas.feedback import FeedbackSchema, FeedbackSortField, FeedbackCreateUpdateSchema
+from project.core.exceptions import FeedbackNotFound,HotelNotFound,StayNotFound,FeedbackAlreadyExists, InvalidCursor, CrossShardMove
 
 router = APIRouter()
 feedback_repo = FeedbackRepository()
-database = PostgresDatabase()
 
 
 @router.get(
     "/all_feedbacks",
-    response_model=list[FeedbackSchema],
+    response_model=Page[FeedbackSchema],
+    responses=LIST_RESPONSES,
     status_code=status.HTTP_200_OK
 )
-async def get_all_feedbacks() -> list[FeedbackSchema]:
-    async with database.session() as session:
-        await feedback_repo.check_connection(session=session)
-        all_feedbacks = await feedback_repo.get_all_feedbacks(session=session)
-    return all_feedbacks
+async def get_all_feedbacks(
+    hotel_id: int | None = None,
+    stay_id: int | None = None,
+    sort_by: FeedbackSortField = "feedback_id",
+    page: PageParams = Depends(),
+    media_type: str = Depends(list_media_type),
+    session: AsyncSession = Depends(get_session),
+) -> ModelResponse:
+    try:
+        all_feedbacks = await feedback_repo.get_all_feedbacks(
+            session=session,
+            limit=page.limit,
+            cursor=page.cursor,
+            sort_by=sort_by,
+            descending=page.descending,
+            hotel_id=hotel_id,
+            stay_id=stay_id,
+        )
+    except InvalidCursor as error:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=error.message)
+    return ModelResponse(all_feedbacks, media_type=media_type)
 
 
 @router.get(
@@ -26,13 +46,12 @@ async def get_all_feedbacks() -> list[FeedbackSchema]:
     response_model=FeedbackSchema,
     status_code=status.HTTP_200_OK
 )
-async def get_feedback_by_id(feedback_id: int) -> FeedbackSchema:
-    async with database.session() as session:
-        try:
-            feedback = await feedback_repo.get_feedback_by_id(session=session, feedback_id=feedback_id)
-        except FeedbackNotFound as error:
-            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=error.message)
-    return feedback
+async def get_feedback_by_id(feedback_id: int, session: AsyncSession = Depends(get_session)) -> ModelResponse:
+    try:
+        feedback = await feedback_repo.get_feedback_by_id(session=session, feedback_id=feedback_id)
+    except FeedbackNotFound as error:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=error.message)
+    return ModelResponse(feedback)
 
 
 @router.post(
@@ -40,16 +59,15 @@ async def get_feedback_by_id(feedback_id: int) -> FeedbackSchema:
     response_model=FeedbackSchema,
     status_code=status.HTTP_201_CREATED
 )
-async def add_feedback(feedback_dto: FeedbackCreateUpdateSchema) -> FeedbackSchema:
-    async with database.session() as session:
-        try:
-            new_feedback = await feedback_repo.create_feedback(session=session, feedback=feedback_dto)
-        except HotelNotFound as error:
-            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Hotel not found")
-        except StayNotFound as error:
-            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Stay not found")
-        except FeedbackAlreadyExists as error:
-            raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Feedback already exists")
+async def add_feedback(feedback_dto: FeedbackCreateUpdateSchema, session: AsyncSession = Depends(get_session)) -> FeedbackSchema:
+    try:
+        new_feedback = await feedback_repo.create_feedback(session=session, feedback=feedback_dto)
+    except HotelNotFound as error:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Hotel not found")
+    except StayNotFound as error:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Stay not found")
+    except FeedbackAlreadyExists as error:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Feedback already exists")
     return new_feedback
 
 
@@ -58,12 +76,13 @@ async def add_feedback(feedback_dto: FeedbackCreateUpdateSchema) -> FeedbackSche
     response_model=FeedbackSchema,
     status_code=status.HTTP_200_OK
 )
-async def update_feedback(feedback_id: int, feedback_dto: FeedbackCreateUpdateSchema) -> FeedbackSchema:
-    async with database.session() as session:
-        try:
-            updated_feedback = await feedback_repo.update_feedback(session=session, feedback_id=feedback_id, feedback=feedback_dto)
-        except FeedbackNotFound as error:
-            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=error.message)
+async def update_feedback(feedback_id: int, feedback_dto: FeedbackCreateUpdateSchema, session: AsyncSession = Depends(get_session)) -> FeedbackSchema:
+    try:
+        updated_feedback = await feedback_repo.update_feedback(session=session, feedback_id=feedback_id, feedback=feedback_dto)
+    except FeedbackNotFound as error:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=error.message)
+    except CrossShardMove as error:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=error.message)
     return updated_feedback
 
 
@@ -71,9 +90,8 @@ async def update_feedback(feedback_id: int, feedback_dto: FeedbackCreateUpdateSc
     "/delete_feedback/{feedback_id}",
     status_code=status.HTTP_204_NO_CONTENT
 )
-async def delete_feedback(feedback_id: int) -> None:
-    async with database.session() as session:
-        try:
-            await feedback_repo.delete_feedback(session=session, feedback_id=feedback_id)
-        except FeedbackNotFound as error:
-            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=error.message)
+async def delete_feedback(feedback_id: int, session: AsyncSession = Depends(get_session)) -> None:
+    try:
+        await feedback_repo.delete_feedback(session=session, feedback_id=feedback_id)
+    except FeedbackNotFound as error:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=error.message)
@@ -0,0 +1,132 @@
+import types
+import typing
+from datetime import date, datetime
+from decimal import Decimal
+from functools import lru_cache
+from typing import Any, Iterable
+
+import msgpack
+import pyarrow as pa
+from fastapi import Request
+from pydantic import BaseModel
+from sqlalchemy import Table
+
+JSON = "application/json"
+MSGPACK = "application/msgpack"
+ARROW = "application/vnd.apache.arrow.stream"
+
+# Форматы списков; порядок — предпочтение сервера при равных q
+LIST_MEDIA_TYPES = (JSON, MSGPACK, ARROW)
+# Для OpenAPI: у списков кроме JSON есть двоичные представления
+LIST_RESPONSES = {200: {"content": {MSGPACK: {}, ARROW: {}}}}
+# Суффикс ETag: разные представления одного списка — разные теги
+ETAG_SUFFIXES = {JSON: "", MSGPACK: "-msgpack", ARROW: "-arrow"}
+
+# Конец IPC-потока Arrow: маркер продолжения и нулевая длина метаданных
+ARROW_EOS = b"\xff\xff\xff\xff\x00\x00\x00\x00"
+
+_PYTHON_ARROW_TYPES = {
+    int: pa.int64(),
+    float: pa.float64(),
+    bool: pa.bool_(),
+    str: pa.string(),
+    date: pa.date32(),
+    datetime: pa.timestamp("us"),
+}
+
+
+def negotiate(accept: str | None, offers: tuple[str, ...], default: str) -> str:
+    """Выбирает формат ответа по заголовку Accept (с учётом q); без подходящего — `default`."""
+    if not accept:
+        return default
+    ranges = []
+    for position, part in enumerate(accept.split(",")):
+        media_range, *params = [item.strip() for item in part.split(";")]
+        quality = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if quality > 0:
+            ranges.append((-quality, position, media_range.lower()))
+
+    for _, _, media_range in sorted(ranges):
+        if media_range in offers:
+            return media_range
+        if media_range in ("*/*", "application/*"):
+            return default
+    # Неизвестные форматы не отклоняем (406), а отвечаем как раньше
+    return default
+
+
+async def list_media_type(request: Request) -> str:
+    return negotiate(request.headers.get("accept"), LIST_MEDIA_TYPES, JSON)
+
+
+# MessagePack
+
+def _msgpack_default(value: Any) -> Any:
+    # Даты — строками ISO, Decimal — строкой без потери точности, как в NDJSON-выгрузке;
+    # у MessagePack нет ни даты, ни десятичного типа
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return str(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not MessagePack serializable")
+
+
+def msgpack_packer() -> msgpack.Packer:
+    return msgpack.Packer(default=_msgpack_default, datetime=False)
+
+
+def pack_msgpack(value: Any) -> bytes:
+    return msgpack_packer().pack(value)
+
+
+# Arrow IPC
+
+def _arrow_field(name: str, annotation: Any) -> pa.Field:
+    nullable = False
+    if typing.get_origin(annotation) in (typing.Union, types.UnionType):
+        args = typing.get_args(annotation)
+        nullable = type(None) in args
+        annotation = next(arg for arg in args if arg is not type(None))
+    # Остальное (EmailStr и т.п.) — строкой
+    return pa.field(name, _PYTHON_ARROW_TYPES.get(annotation, pa.string()), nullable=nullable)
+
+
+@lru_cache
+def model_arrow_schema(model: type[BaseModel]) -> pa.Schema:
+    return pa.schema([_arrow_field(name, field.annotation) for name, field in model.model_fields.items()])
+
+
+def table_arrow_schema(table: Table) -> pa.Schema:
+    fields = []
+    for column in table.columns:
+        python_type = column.type.python_type
+        if python_type is Decimal:
+            arrow_type = pa.decimal128(column.type.precision, column.type.scale)
+        else:
+            arrow_type = _PYTHON_ARROW_TYPES.get(python_type, pa.string())
+        fields.append(pa.field(column.key, arrow_type, nullable=column.nullable))
+    return pa.schema(fields)
+
+
+def arrow_batch(schema: pa.Schema, columns: Iterable[list[Any]]) -> pa.RecordBatch:
+    return pa.RecordBatch.from_arrays(
+        [pa.array(values, type=field.type) for field, values in zip(schema, columns)],
+        schema=schema,
+    )
+
+
+def rows_to_arrow_batch(schema: pa.Schema, rows: list[tuple[Any, ...]]) -> pa.RecordBatch:
+    """Пачка строк запроса, развёрнутая по столбцам, без промежуточных словарей."""
+    columns = zip(*rows) if rows else ([] for _ in schema)
+    return arrow_batch(schema, (list(values) for values in columns))
+
+
+def arrow_stream(schema: pa.Schema, batches: Iterable[pa.RecordBatch]) -> bytes:
+    return b"".join([schema.serialize().to_pybytes(), *(batch.serialize().to_pybytes() for batch in batches), ARROW_EOS])
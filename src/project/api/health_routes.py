@@ -0,0 +1,67 @@
+import time
+
+from fastapi import APIRouter, status
+from fastapi.responses import JSONResponse
+
+from project.infrastructure.cache.reference import caches
+from project.infrastructure.cache.singleflight import flights
+from project.infrastructure.postgres.health import health_monitor
+from project.infrastructure.postgres.replicas import replica_pool
+from project.infrastructure.postgres.shards import shard_router
+
+router = APIRouter()
+
+
+@router.get(
+    "/live",
+    status_code=status.HTTP_200_OK
+)
+async def live() -> dict:
+    return {"status": "ok"}
+
+
+@router.get(
+    "/ready",
+    status_code=status.HTTP_200_OK
+)
+async def ready() -> JSONResponse:
+    checked_ago = None
+    if health_monitor.last_checked_at is not None:
+        checked_ago = round(time.monotonic() - health_monitor.last_checked_at, 3)
+
+    body = {
+        "status": "ok" if health_monitor.is_ready else "unavailable",
+        "database": health_monitor.is_ready,
+        "checked_sec_ago": checked_ago,
+    }
+    if not health_monitor.is_ready:
+        body["error"] = health_monitor.last_error
+        return JSONResponse(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, content=body)
+    return JSONResponse(status_code=status.HTTP_200_OK, content=body)
+
+
+@router.get(
+    "/caches",
+    status_code=status.HTTP_200_OK
+)
+async def cache_stats() -> dict:
+    stats = {name: cache.stats() for name, cache in caches.items()}
+    for name, flight in flights.items():
+        stats.setdefault(name, {}).update(flight.stats())
+    return stats
+
+
+@router.get(
+    "/replicas",
+    status_code=status.HTTP_200_OK
+)
+async def replica_stats() -> dict:
+    return replica_pool.stats()
+
+
+@router.get(
+    "/shards",
+    status_code=status.HTTP_200_OK
+)
+async def shard_stats() -> dict:
+    return shard_router.stats()
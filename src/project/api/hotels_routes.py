@@ -1,38 +1,59 @@
-from fastapi import APIRouter, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from project.infrastructure.postgres.repository.hotels_repo import HotelsRepository
-from project.infrastructure.postgres.database import PostgresDatabase
-from project.schemas.hotels import HotelSchema, HotelCreateUpdateSchema
-from project.core.exceptions import HotelNotFound, HotelAlreadyExists
+from project.api.etag import ETag
+from project.api.depends import PageParams, get_session
+from project.api.formats import LIST_RESPONSES, list_media_type
+from project.api.responses import ModelResponse
+from project.schemas.pagination import Page
+from project.schemas.hotels import HotelSchema, HotelSortField, HotelCreateUpdateSchema
+from project.core.exceptions import HotelNotFound, HotelAlreadyExists, InvalidCursor
 
 router = APIRouter()
 hotels_repo = HotelsRepository()
-database = PostgresDatabase()
 
 @router.get(
     "/all_hotels",
-    response_model=list[HotelSchema],
-    status_code=status.HTTP_200_OK
+    response_model=Page[HotelSchema],
+    responses=LIST_RESPONSES,
+    status_code=status.HTTP_200_OK,
+    dependencies=[Depends(ETag("hotels"))],
 )
-async def get_all_hotels() -> list[HotelSchema]:
-    async with database.session() as session:
-        await hotels_repo.check_connection(session=session)
-        all_hotels = await hotels_repo.get_all_hotels(session=session)
-    return all_hotels
+async def get_all_hotels(
+    response: Response,
+    name: str | None = None,
+    sort_by: HotelSortField = "hotel_id",
+    page: PageParams = Depends(),
+    media_type: str = Depends(list_media_type),
+    session: AsyncSession = Depends(get_session),
+) -> ModelResponse:
+    try:
+        all_hotels = await hotels_repo.get_all_hotels(
+            session=session,
+            limit=page.limit,
+            cursor=page.cursor,
+            sort_by=sort_by,
+            descending=page.descending,
+            name=name,
+        )
+    except InvalidCursor as error:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=error.message)
+    return ModelResponse(all_hotels, media_type=media_type, headers=response.headers)
 
 
 @router.get(
     "/hotel/{hotel_id}",
     response_model=HotelSchema,
-    status_code=status.HTTP_200_OK
+    status_code=status.HTTP_200_OK,
+    dependencies=[Depends(ETag("hotels", id_param="hotel_id"))],
 )
-async def get_hotel_by_id(hotel_id: int) -> HotelSchema:
-    async with database.session() as session:
-        try:
-            hotel = await hotels_repo.get_hotel(session=session, hotel_id=hotel_id)
-        except HotelNotFound as error:
-            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=error.message)
-    return hotel
+async def get_hotel_by_id(hotel_id: int, response: Response, session: AsyncSession = Depends(get_session)) -> ModelResponse:
+    try:
+        hotel = await hotels_repo.get_hotel(session=session, hotel_id=hotel_id)
+    except HotelNotFound as error:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=error.message)
+    return ModelResponse(hotel, headers=response.headers)
 
 
 @router.post(
@@ -40,12 +61,11 @@ async def get_hotel_by_id(hotel_id: int) -> HotelSchema:
     response_model=HotelSchema,
     status_code=status.HTTP_201_CREATED
 )
-async def add_hotel(hotel_dto: HotelCreateUpdateSchema) -> HotelSchema:
-    async with database.session() as session:
-        try:
-            new_hotel = await hotels_repo.create_hotel(session=session, hotel=hotel_dto)
-        except HotelAlreadyExists as error:
-            raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=error.message)
+async def add_hotel(hotel_dto: HotelCreateUpdateSchema, session: AsyncSession = Depends(get_session)) -> HotelSchema:
+    try:
+        new_hotel = await hotels_repo.create_hotel(session=session, hotel=hotel_dto)
+    except HotelAlreadyExists as error:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=error.message)
     return new_hotel
 
 
@@ -54,12 +74,11 @@ async def add_hotel(hotel_dto: HotelCreateUpdateSchema) -> HotelSchema:
     response_model=HotelSchema,
     status_code=status.HTTP_200_OK
 )
-async def update_hotel(hotel_id: int, hotel_dto: HotelCreateUpdateSchema) -> HotelSchema:
-    async with database.session() as session:
-        try:
-            updated_hotel = await hotels_repo.update_hotel(session=session, hotel_id=hotel_id, hotel=hotel_dto)
-        except HotelNotFound as error:
-            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=error.message)
+async def update_hotel(hotel_id: int, hotel_dto: HotelCreateUpdateSchema, session: AsyncSession = Depends(get_session)) -> HotelSchema:
+    try:
+        updated_hotel = await hotels_repo.update_hotel(session=session, hotel_id=hotel_id, hotel=hotel_dto)
+    except HotelNotFound as error:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=error.message)
     return updated_hotel
 
 
@@ -67,9 +86,8 @@ async def update_hotel(hotel_id: int, hotel_dto: HotelCreateUpdateSchema) -> Hot
     "/delete_hotel/{hotel_id}",
     status_code=status.HTTP_204_NO_CONTENT
 )
-async def delete_hotel(hotel_id: int) -> None:
-    async with database.session() as session:
-        try:
-            await hotels_repo.delete_hotel(session=session, hotel_id=hotel_id)
-        except HotelNotFound as error:
-            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=error.message)
+async def delete_hotel(hotel_id: int, session: AsyncSession = Depends(get_session)) -> None:
+    try:
+        await hotels_repo.delete_hotel(session=session, hotel_id=hotel_id)
+    except HotelNotFound as error:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=error.message)
@@ -0,0 +1,32 @@
+from datetime import date
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from project.infrastructure.postgres.repository.overbooking_repo import OverbookingRepository
+from project.api.depends import get_session
+from project.api.responses import ModelResponse
+from project.schemas.overbooking import OverbookingReportSchema
+from project.core.exceptions import InvalidDateRange
+
+router = APIRouter()
+overbooking_repo = OverbookingRepository()
+
+
+@router.get(
+    "/overbooking_report",
+    response_model=OverbookingReportSchema,
+    status_code=status.HTTP_200_OK
+)
+async def get_overbooking_report(
+    hotel_id: int,
+    date_from: date = Query(alias="from"),
+    date_to: date = Query(alias="to"),
+    session: AsyncSession = Depends(get_session),
+) -> ModelResponse:
+    try:
+        report = await overbooking_repo.get_report(
+            session=session, hotel_id=hotel_id, date_from=date_from, date_to=date_to
+        )
+    except InvalidDateRange as error:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=error.message)
+    return ModelResponse(report)
@@ -1,38 +1,57 @@
-from fastapi import APIRouter, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
 from project.infrastructure.postgres.repository.payment_types_repo import PaymentTypesRepository
-from project.infrastructure.postgres.database import PostgresDatabase
-from project.schemas.payment_types import PaymentTypeSchema, PaymentTypeCreateUpdateSchema
-from project.core.exceptions import PaymentTypeNotFound, PaymentTypeAlreadyExists
+from project.api.etag import ETag
+from project.api.depends import PageParams, get_session
+from project.api.formats import LIST_RESPONSES, list_media_type
+from project.api.responses import ModelResponse
+from project.schemas.pagination import Page
+from project.schemas.payment_types import PaymentTypeSchema, PaymentTypeSortField, PaymentTypeCreateUpdateSchema
+from project.core.exceptions import PaymentTypeNotFound, PaymentTypeAlreadyExists, InvalidCursor
 
 router = APIRouter()
 payment_types_repo = PaymentTypesRepository()
-database = PostgresDatabase()
 
 
 @router.get(
     "/all_payment_types",
-    response_model=list[PaymentTypeSchema],
-    status_code=status.HTTP_200_OK
+    response_model=Page[PaymentTypeSchema],
+    responses=LIST_RESPONSES,
+    status_code=status.HTTP_200_OK,
+    dependencies=[Depends(ETag("payment_types"))],
 )
-async def get_all_payment_types() -> list[PaymentTypeSchema]:
-    async with database.session() as session:
-        await payment_types_repo.check_connection(session=session)
-        all_payment_types = await payment_types_repo.get_all_payment_types(session=session)
-    return all_payment_types
+async def get_all_payment_types(
+    response: Response,
+    sort_by: PaymentTypeSortField = "type_payment_id",
+    page: PageParams = Depends(),
+    media_type: str = Depends(list_media_type),
+    session: AsyncSession = Depends(get_session),
+) -> ModelResponse:
+    try:
+        all_payment_types = await payment_types_repo.get_all_payment_types(
+            session=session,
+            limit=page.limit,
+            cursor=page.cursor,
+            sort_by=sort_by,
+            descending=page.descending,
+        )
+    except InvalidCursor as error:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=error.message)
+    return ModelResponse(all_payment_types, media_type=media_type, headers=response.headers)
 
 
 @router.get(
     "/payment_type/{type_payment_id}",
     response_model=PaymentTypeSchema,
-    status_code=status.HTTP_200_OK
+    status_code=status.HTTP_200_OK,
+    dependencies=[Depends(ETag("payment_types", id_param="type_payment_id"))],
 )
-async def get_payment_type_by_id(type_payment_id: int) -> PaymentTypeSchema:
-    async with database.session() as session:
-        try:
-            payment_type = await payment_types_repo.get_payment_type_by_id(session=session, type_payment_id=type_payment_id)
-        except PaymentTypeNotFound as error:
-            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=error.message)
-    return payment_type
+async def get_payment_type_by_id(type_payment_id: int, response: Response, session: AsyncSession = Depends(get_session)) -> ModelResponse:
+    try:
+        payment_type = await payment_types_repo.get_payment_type_by_id(session=session, type_payment_id=type_payment_id)
+    except PaymentTypeNotFound as error:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=error.message)
+    return ModelResponse(payment_type, headers=response.headers)
 
 
 @router.post(
@@ -40,14 +59,13 @@ async def get_payment_type_by_id(type_payment_id: int) -> PaymentTypeSchema:
     response_model=PaymentTypeSchema,
     status_code=status.HTTP_201_CREATED
 )
-async def add_payment_type(payment_type_dto: PaymentTypeCreateUpdateSchema) -> PaymentTypeSchema:
-    async with database.session() as session:
-        try:
-            new_payment_type = await payment_types_repo.create_payment_type(
-                session=session, payment_type=payment_type_dto
-            )
-        except PaymentTypeAlreadyExists as error:
-            raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Payment type already exists")
+async def add_payment_type(payment_type_dto: PaymentTypeCreateUpdateSchema, session: AsyncSession = Depends(get_session)) -> PaymentTypeSchema:
+    try:
+        new_payment_type = await payment_types_repo.create_payment_type(
+            session=session, payment_type=payment_type_dto
+        )
+    except PaymentTypeAlreadyExists as error:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Payment type already exists")
     return new_payment_type
 
 @router.put(
@@ -55,12 +73,11 @@ async def add_payment_type(payment_type_dto: PaymentTypeCreateUpdateSchema) -> P
     response_model=PaymentTypeSchema,
     status_code=status.HTTP_200_OK
 )
-async def update_payment_type(type_payment_id: int, payment_type_dto: PaymentTypeCreateUpdateSchema) -> PaymentTypeSchema:
-    async with database.session() as session:
-        try:
-            updated_payment_type = await payment_types_repo.update_payment_type(session=session, type_payment_id=type_payment_id, payment_type=payment_type_dto)
-        except PaymentTypeNotFound as error:
-            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=error.message)
+async def update_payment_type(type_payment_id: int, payment_type_dto: PaymentTypeCreateUpdateSchema, session: AsyncSession = Depends(get_session)) -> PaymentTypeSchema:
+    try:
+        updated_payment_type = await payment_types_repo.update_payment_type(session=session, type_payment_id=type_payment_id, payment_type=payment_type_dto)
+    except PaymentTypeNotFound as error:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=error.message)
     return updated_payment_type
 
 
@@ -68,9 +85,8 @@ async def update_payment_type(type_payment_id: int, payment_type_dto: PaymentTyp
     "/delete_payment_type/{type_payment_id}",
     status_code=status.HTTP_204_NO_CONTENT
 )
-async def delete_payment_type(type_payment_id: int) -> None:
-    async with database.session() as session:
-        try:
-            await payment_types_repo.delete_payment_type(session=session, type_payment_id=type_payment_id)
-        except PaymentTypeNotFound as error:
-            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=error.message)
+async def delete_payment_type(type_payment_id: int, session: AsyncSession = Depends(get_session)) -> None:
+    try:
+        await payment_types_repo.delete_payment_type(session=session, type_payment_id=type_payment_id)
+    except PaymentTypeNotFound as error:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=error.message)
@@ -0,0 +1,45 @@
+import typing
+
+from fastapi import Response
+from pydantic import BaseModel
+from pydantic_core import to_json
+
+from project.api.formats import ARROW, JSON, MSGPACK, arrow_batch, arrow_stream, model_arrow_schema, pack_msgpack
+from project.schemas.pagination import Page
+
+
+def _arrow_page(page: Page) -> bytes:
+    item_model = typing.get_args(type(page).model_fields["items"].annotation)[0]
+    schema = model_arrow_schema(item_model)
+    if page.next_cursor is not None:
+        schema = schema.with_metadata({"next_cursor": page.next_cursor})
+    columns = ([getattr(item, name) for item in page.items] for name in schema.names)
+    return arrow_stream(schema, [arrow_batch(schema, columns)])
+
+
+class ModelResponse(Response):
+    """Ответ из готовой pydantic-модели.
+
+    Репозитории уже возвращают провалидированные схемы, поэтому повторная проверка по
+    `response_model` и проход через jsonable_encoder не нужны: pydantic-core (Rust)
+    сериализует модель сразу в bytes. `response_model` в декораторе остаётся для OpenAPI.
+    Маршрут, возвращающий Response, теряет заголовки, выставленные зависимостями, —
+    их передают через `headers=response.headers`.
+
+    Списки (`Page`) отдаются и в MessagePack, и в Arrow IPC (одна пачка по столбцам,
+    курсор следующей страницы — в метаданных схемы), если маршрут передал выбранный `media_type`.
+    """
+
+    media_type = JSON
+
+    def __init__(self, content: BaseModel, *args, **kwargs) -> None:
+        super().__init__(content, *args, **kwargs)
+        if isinstance(content, Page):
+            self.headers["Vary"] = "Accept"
+
+    def render(self, content: BaseModel) -> bytes:
+        if self.media_type == MSGPACK:
+            return pack_msgpack(content.model_dump(by_alias=True))
+        if self.media_type == ARROW:
+            return _arrow_page(content)
+        return to_json(content, by_alias=True)
@@ -1,12 +1,16 @@
-from fastapi import APIRouter, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
 from project.infrastructure.postgres.repository.rooms_repo import RoomsRepository
-from project.infrastructure.postgres.database import PostgresDatabase
-from project.schemas.rooms import RoomSchema, RoomCreateUpdateSchema
-from project.core.exceptions import RoomNotFound, RoomAlreadyExists, RoomCapacity, RoomPerPrice, ForeignKeyConstraintViolation
+from project.api.etag import ETag
+from project.api.depends import PageParams, get_session
+from project.api.formats import LIST_RESPONSES, list_media_type
+from project.api.responses import ModelResponse
+from project.schemas.pagination import Page
+from project.schemas.rooms import RoomSchema, RoomSortField, RoomCreateUpdateSchema
+from project.core.exceptions import RoomNotFound, RoomAlreadyExists, RoomCapacity, RoomPerPrice, ForeignKeyConstraintViolation, InvalidCursor, CrossShardMove
 
 router = APIRouter()
 rooms_repo = RoomsRepository()
-database = PostgresDatabase()
 
 
 @router.post(
@@ -14,43 +18,63 @@ database = PostgresDatabase()
     response_model=RoomSchema,
     status_code=status.HTTP_201_CREATED
 )
-async def add_room(room_dto: RoomCreateUpdateSchema) -> RoomSchema:
-    async with database.session() as session:
-        try:
-            new_room = await rooms_repo.create_room(session=session, room=room_dto)
-        except RoomCapacity as error:
-            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=error.message)
-        except RoomPerPrice as error:
-            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=error.message)
-        except RoomAlreadyExists as error:
-            raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=error.message)
+async def add_room(room_dto: RoomCreateUpdateSchema, session: AsyncSession = Depends(get_session)) -> RoomSchema:
+    try:
+        new_room = await rooms_repo.create_room(session=session, room=room_dto)
+    except RoomCapacity as error:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=error.message)
+    except RoomPerPrice as error:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=error.message)
+    except RoomAlreadyExists as error:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=error.message)
     return new_room
 
 
 @router.get(
     "/all_rooms",
-    response_model=list[RoomSchema],
-    status_code=status.HTTP_200_OK
+    response_model=Page[RoomSchema],
+    responses=LIST_RESPONSES,
+    status_code=status.HTTP_200_OK,
+    dependencies=[Depends(ETag("rooms"))],
 )
-async def get_all_rooms() -> list[RoomSchema]:
-    async with database.session() as session:
-        all_rooms = await rooms_repo.get_all_rooms(session=session)
-        valid_rooms = [room for room in all_rooms if room.capacity >= 1]
-    return valid_rooms
+async def get_all_rooms(
+    response: Response,
+    hotel_id: int | None = None,
+    room_type_id: int | None = None,
+    min_capacity: int | None = None,
+    sort_by: RoomSortField = "room_id",
+    page: PageParams = Depends(),
+    media_type: str = Depends(list_media_type),
+    session: AsyncSession = Depends(get_session),
+) -> ModelResponse:
+    try:
+        all_rooms = await rooms_repo.get_all_rooms(
+            session=session,
+            limit=page.limit,
+            cursor=page.cursor,
+            sort_by=sort_by,
+            descending=page.descending,
+            hotel_id=hotel_id,
+            room_type_id=room_type_id,
+            min_capacity=min_capacity,
+        )
+    except InvalidCursor as error:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=error.message)
+    return ModelResponse(all_rooms, media_type=media_type, headers=response.headers)
 
 
 @router.get(
     "/room/{room_id}",
     response_model=RoomSchema,
-    status_code=status.HTTP_200_OK
+    status_code=status.HTTP_200_OK,
+    dependencies=[Depends(ETag("rooms", id_param="room_id"))],
 )
-async def get_room_by_id(room_id: int) -> RoomSchema:
-    async with database.session() as session:
-        try:
-            room = await rooms_repo.get_room_by_id(session=session, room_id=room_id)
-        except RoomNotFound as error:
-            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=error.message)
-    return room
+async def get_room_by_id(room_id: int, response: Response, session: AsyncSession = Depends(get_session)) -> ModelResponse:
+    try:
+        room = await rooms_repo.get_room_by_id(session=session, room_id=room_id)
+    except RoomNotFound as error:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=error.message)
+    return ModelResponse(room, headers=response.headers)
 
 
 @router.put(
@@ -58,16 +82,17 @@ async def get_room_by_id(room_id: int) -> RoomSchema:
     response_model=RoomSchema,
     status_code=status.HTTP_200_OK
 )
-async def update_room(room_id: int, room_dto: RoomCreateUpdateSchema) -> RoomSchema:
-    async with database.session() as session:
-        try:
-            updated_room = await rooms_repo.update_room(session=session, room_id=room_id, room=room_dto)
-        except RoomNotFound as error:
-            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=error.message)
-        except RoomCapacity as error:
-            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=error.message)
-        except RoomPerPrice as error:
-            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=error.message)
+async def update_room(room_id: int, room_dto: RoomCreateUpdateSchema, session: AsyncSession = Depends(get_session)) -> RoomSchema:
+    try:
+        updated_room = await rooms_repo.update_room(session=session, room_id=room_id, room=room_dto)
+    except RoomNotFound as error:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=error.message)
+    except RoomCapacity as error:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=error.message)
+    except RoomPerPrice as error:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=error.message)
+    except CrossShardMove as error:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=error.message)
     return updated_room
 
 
@@ -75,11 +100,10 @@ async def update_room(room_id: int, room_dto: RoomCreateUpdateSchema) -> RoomSch
     "/delete_room/{room_id}",
     status_code=status.HTTP_204_NO_CONTENT
 )
-async def delete_room(room_id: int) -> None:
-    async with database.session() as session:
-        try:
-            await rooms_repo.delete_room(session=session, room_id=room_id)
-        except RoomNotFound as error:
-            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=error.message)
-        except ForeignKeyConstraintViolation as error:
-            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=error.message)
+async def delete_room(room_id: int, session: AsyncSession = Depends(get_session)) -> None:
+    try:
+        await rooms_repo.delete_room(session=session, room_id=room_id)
+    except RoomNotFound as error:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=error.message)
+    except ForeignKeyConstraintViolation as error:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=error.message)
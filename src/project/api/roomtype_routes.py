@@ -1,12 +1,16 @@
-from fastapi import APIRouter, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
 from project.infrastructure.postgres.repository.roomtypes_repo import RoomTypesRepository
-from project.infrastructure.postgres.database import PostgresDatabase
-from project.schemas.roomtypes import RoomTypeSchema, RoomTypeCreateUpdateSchema
-from project.core.exceptions import RoomPerPrice, RoomAlreadyExists, HotelNotFound,RoomCapacity
+from project.api.etag import ETag
+from project.api.depends import PageParams, get_session
+from project.api.formats import LIST_RESPONSES, list_media_type
+from project.api.responses import ModelResponse
+from project.schemas.pagination import Page
+from project.schemas.roomtypes import RoomTypeSchema, RoomTypeSortField, RoomTypeCreateUpdateSchema
+from project.core.exceptions import RoomPerPrice, RoomAlreadyExists, HotelNotFound,RoomCapacity, InvalidCursor, RoomTypeNotFound, CrossShardMove
 
 router = APIRouter()
 roomtypes_repo = RoomTypesRepository()
-database = PostgresDatabase()
 
 
 @router.post(
@@ -14,44 +18,63 @@ database = PostgresDatabase()
     response_model=RoomTypeSchema,
     status_code=status.HTTP_201_CREATED
 )
-async def add_roomtype(roomtype_dto: RoomTypeCreateUpdateSchema) -> RoomTypeSchema:
-    async with database.session() as session:
-        try:
-            new_roomtype = await roomtypes_repo.create_roomtype(session=session, roomtype=roomtype_dto)
-        except RoomCapacity as error:
-            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=error.message)
-        except RoomPerPrice as error:
-            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=error.message)
-        except RoomAlreadyExists as error:
-            raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=error.message)
-        except HotelNotFound as error:
-            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=error.message)
+async def add_roomtype(roomtype_dto: RoomTypeCreateUpdateSchema, session: AsyncSession = Depends(get_session)) -> RoomTypeSchema:
+    try:
+        new_roomtype = await roomtypes_repo.create_roomtype(session=session, roomtype=roomtype_dto)
+    except RoomCapacity as error:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=error.message)
+    except RoomPerPrice as error:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=error.message)
+    except RoomAlreadyExists as error:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=error.message)
+    except HotelNotFound as error:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=error.message)
     return new_roomtype
 
 
 @router.get(
     "/all_roomtypes",
-    response_model=list[RoomTypeSchema],
-    status_code=status.HTTP_200_OK
+    response_model=Page[RoomTypeSchema],
+    responses=LIST_RESPONSES,
+    status_code=status.HTTP_200_OK,
+    dependencies=[Depends(ETag("room_types"))],
 )
-async def get_all_roomtypes() -> list[RoomTypeSchema]:
-    async with database.session() as session:
-        all_roomtypes = await roomtypes_repo.get_all_roomtypes(session=session)
-    return all_roomtypes
+async def get_all_roomtypes(
+    response: Response,
+    hotel_id: int | None = None,
+    min_capacity: int | None = None,
+    sort_by: RoomTypeSortField = "room_type_id",
+    page: PageParams = Depends(),
+    media_type: str = Depends(list_media_type),
+    session: AsyncSession = Depends(get_session),
+) -> ModelResponse:
+    try:
+        all_roomtypes = await roomtypes_repo.get_all_roomtypes(
+            session=session,
+            limit=page.limit,
+            cursor=page.cursor,
+            sort_by=sort_by,
+            descending=page.descending,
+            hotel_id=hotel_id,
+            min_capacity=min_capacity,
+        )
+    except InvalidCursor as error:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=error.message)
+    return ModelResponse(all_roomtypes, media_type=media_type, headers=response.headers)
 
 
 @router.get(
     "/roomtype/{room_type_id}",
     response_model=RoomTypeSchema,
-    status_code=status.HTTP_200_OK
+    status_code=status.HTTP_200_OK,
+    dependencies=[Depends(ETag("room_types", id_param="room_type_id"))],
 )
-async def get_roomtype_by_id(room_type_id: int) -> RoomTypeSchema:
-    async with database.session() as session:
-        try:
-            roomtype = await roomtypes_repo.get_roomtype_by_id(session=session, room_type_id=room_type_id)
-        except RoomAlreadyExists as error:
-            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=error.message)
-    return roomtype
+async def get_roomtype_by_id(room_type_id: int, response: Response, session: AsyncSession = Depends(get_session)) -> ModelResponse:
+    try:
+        roomtype = await roomtypes_repo.get_roomtype_by_id(session=session, room_type_id=room_type_id)
+    except RoomTypeNotFound as error:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=error.message)
+    return ModelResponse(roomtype, headers=response.headers)
 
 
 @router.put(
@@ -59,18 +82,21 @@ async def get_roomtype_by_id(room_type_id: int) -> RoomTypeSchema:
     response_model=RoomTypeSchema,
     status_code=status.HTTP_200_OK
 )
-async def update_roomtype(room_type_id: int, roomtype_dto: RoomTypeCreateUpdateSchema) -> RoomTypeSchema:
-    async with database.session() as session:
-        try:
-            updated_roomtype = await roomtypes_repo.update_roomtype(session=session, room_type_id=room_type_id, roomtype=roomtype_dto)
-        except RoomCapacity as error:
-            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=error.message)
-        except RoomPerPrice as error:
-            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=error.message)
-        except RoomAlreadyExists as error:
-            raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=error.message)
-        except HotelNotFound as error:
-            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=error.message)
+async def update_roomtype(room_type_id: int, roomtype_dto: RoomTypeCreateUpdateSchema, session: AsyncSession = Depends(get_session)) -> RoomTypeSchema:
+    try:
+        updated_roomtype = await roomtypes_repo.update_roomtype(session=session, room_type_id=room_type_id, roomtype=roomtype_dto)
+    except RoomCapacity as error:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=error.message)
+    except RoomPerPrice as error:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=error.message)
+    except RoomAlreadyExists as error:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=error.message)
+    except HotelNotFound as error:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=error.message)
+    except RoomTypeNotFound as error:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=error.message)
+    except CrossShardMove as error:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=error.message)
     return updated_roomtype
 
 
@@ -78,9 +104,8 @@ async def update_roomtype(room_type_id: int, roomtype_dto: RoomTypeCreateUpdateS
     "/delete_roomtype/{room_type_id}",
     status_code=status.HTTP_204_NO_CONTENT
 )
-async def delete_roomtype(room_type_id: int) -> None:
-    async with database.session() as session:
-        try:
-            await roomtypes_repo.delete_roomtype(session=session, room_type_id=room_type_id)
-        except RoomAlreadyExists as error:
-            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=error.message)
+async def delete_roomtype(room_type_id: int, session: AsyncSession = Depends(get_session)) -> None:
+    try:
+        await roomtypes_repo.delete_roomtype(session=session, room_type_id=room_type_id)
+    except RoomTypeNotFound as error:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=error.message)
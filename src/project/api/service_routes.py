@@ -1,37 +1,56 @@
-from fastapi import APIRouter, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
 from project.infrastructure.postgres.repository.services_repo import ServicesRepository
-from project.infrastructure.postgres.database import PostgresDatabase
-from project.schemas.services import ServiceSchema, ServiceCreateUpdateSchema
-from project.core.exceptions import ServiceNotFound, ServiceAlreadyExists,InvalidServicePrice
+from project.api.etag import ETag
+from project.api.depends import PageParams, get_session
+from project.api.formats import LIST_RESPONSES, list_media_type
+from project.api.responses import ModelResponse
+from project.schemas.pagination import Page
+from project.schemas.services import ServiceSchema, ServiceSortField, ServiceCreateUpdateSchema
+from project.core.exceptions import ServiceNotFound, ServiceAlreadyExists,InvalidServicePrice, InvalidCursor
 
 router = APIRouter()
 services_repo = ServicesRepository()
-database = PostgresDatabase()
 
 @router.get(
     "/all_services",
-    response_model=list[ServiceSchema],
-    status_code=status.HTTP_200_OK
+    response_model=Page[ServiceSchema],
+    responses=LIST_RESPONSES,
+    status_code=status.HTTP_200_OK,
+    dependencies=[Depends(ETag("services"))],
 )
-async def get_all_services() -> list[ServiceSchema]:
-    async with database.session() as session:
-        await services_repo.check_connection(session=session)
-        all_services = await services_repo.get_all_services(session=session)
-    return all_services
+async def get_all_services(
+    response: Response,
+    sort_by: ServiceSortField = "service_id",
+    page: PageParams = Depends(),
+    media_type: str = Depends(list_media_type),
+    session: AsyncSession = Depends(get_session),
+) -> ModelResponse:
+    try:
+        all_services = await services_repo.get_all_services(
+            session=session,
+            limit=page.limit,
+            cursor=page.cursor,
+            sort_by=sort_by,
+            descending=page.descending,
+        )
+    except InvalidCursor as error:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=error.message)
+    return ModelResponse(all_services, media_type=media_type, headers=response.headers)
 
 
 @router.get(
     "/service/{service_id}",
     response_model=ServiceSchema,
-    status_code=status.HTTP_200_OK
+    status_code=status.HTTP_200_OK,
+    dependencies=[Depends(ETag("services", id_param="service_id"))],
 )
-async def get_service_by_id(service_id: int) -> ServiceSchema:
-    async with database.session() as session:
-        try:
-            service = await services_repo.get_service_by_id(session=session, service_id=service_id)
-        except ServiceNotFound as error:
-            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=error.message)
-    return service
+async def get_service_by_id(service_id: int, response: Response, session: AsyncSession = Depends(get_session)) -> ModelResponse:
+    try:
+        service = await services_repo.get_service_by_id(session=session, service_id=service_id)
+    except ServiceNotFound as error:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=error.message)
+    return ModelResponse(service, headers=response.headers)
 
 
 @router.post(
@@ -39,14 +58,13 @@ async def get_service_by_id(service_id: int) -> ServiceSchema:
     response_model=ServiceSchema,
     status_code=status.HTTP_201_CREATED
 )
-async def add_service(service_dto: ServiceCreateUpdateSchema) -> ServiceSchema:
-    async with database.session() as session:
-        try:
-            new_service = await services_repo.create_service(session=session, service=service_dto)
-        except InvalidServicePrice as error:
-            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=error.message)
-        except ServiceAlreadyExists as error:
-            raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=error.message)
+async def add_service(service_dto: ServiceCreateUpdateSchema, session: AsyncSession = Depends(get_session)) -> ServiceSchema:
+    try:
+        new_service = await services_repo.create_service(session=session, service=service_dto)
+    except InvalidServicePrice as error:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=error.message)
+    except ServiceAlreadyExists as error:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=error.message)
     return new_service
 
 @router.put(
@@ -54,14 +72,13 @@ async def add_service(service_dto: ServiceCreateUpdateSchema) -> ServiceSchema:
     response_model=ServiceSchema,
     status_code=status.HTTP_200_OK
 )
-async def update_service(service_id: int, service_dto: ServiceCreateUpdateSchema) -> ServiceSchema:
-    async with database.session() as session:
-        try:
-            updated_service = await services_repo.update_service(
-                session=session, service_id=service_id, service=service_dto
-            )
-        except ServiceNotFound as error:
-            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=error.message)
+async def update_service(service_id: int, service_dto: ServiceCreateUpdateSchema, session: AsyncSession = Depends(get_session)) -> ServiceSchema:
+    try:
+        updated_service = await services_repo.update_service(
+            session=session, service_id=service_id, service=service_dto
+        )
+    except ServiceNotFound as error:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=error.message)
     return updated_service
 
 
@@ -69,9 +86,8 @@ async def update_service(service_id: int, service_dto: ServiceCreateUpdateSchema
     "/delete_service/{service_id}",
     status_code=status.HTTP_204_NO_CONTENT
 )
-async def delete_service(service_id: int) -> None:
-    async with database.session() as session:
-        try:
-            await services_repo.delete_service(session=session, service_id=service_id)
-        except ServiceNotFound as error:
-            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=error.message)
+async def delete_service(service_id: int, session: AsyncSession = Depends(get_session)) -> None:
+    try:
+        await services_repo.delete_service(session=session, service_id=service_id)
+    except ServiceNotFound as error:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=error.message)
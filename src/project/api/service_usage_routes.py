@@ -1,23 +1,43 @@
-from fastapi import APIRouter, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
 from project.infrastructure.postgres.repository.service_usage_repo import ServiceUsageRepository
-from project.infrastructure.postgres.database import PostgresDatabase
-from project.schemas.service_usage import ServiceUsageSchema, ServiceUsageCreateUpdateSchema
-from project.core.exceptions import ServiceUsageNotFound,StayNotFound,ServiceNotFound,ServiceUsageAlreadyExists
+from project.api.depends import PageParams, get_session
+from project.api.formats import LIST_RESPONSES, list_media_type
+from project.api.responses import ModelResponse
+from project.schemas.pagination import Page
+from project.schemas.service_usage import ServiceUsageSchema, ServiceUsageSortField, ServiceUsageCreateUpdateSchema
+from project.core.exceptions import ServiceUsageNotFound,StayNotFound,ServiceNotFound,ServiceUsageAlreadyExists, InvalidCursor
 
 router = APIRouter()
 service_usage_repo = ServiceUsageRepository()
-database = PostgresDatabase()
 
 @router.get(
     "/all_service_usage",
-    response_model=list[ServiceUsageSchema],
+    response_model=Page[ServiceUsageSchema],
+    responses=LIST_RESPONSES,
     status_code=status.HTTP_200_OK
 )
-async def get_all_service_usage() -> list[ServiceUsageSchema]:
-    async with database.session() as session:
-        await service_usage_repo.check_connection(session=session)
-        all_usage = await service_usage_repo.get_all_service_usage(session=session)
-    return all_usage
+async def get_all_service_usage(
+    stay_id: int | None = None,
+    service_id: int | None = None,
+    sort_by: ServiceUsageSortField = "service_usage_id",
+    page: PageParams = Depends(),
+    media_type: str = Depends(list_media_type),
+    session: AsyncSession = Depends(get_session),
+) -> ModelResponse:
+    try:
+        all_usage = await service_usage_repo.get_all_service_usage(
+            session=session,
+            limit=page.limit,
+            cursor=page.cursor,
+            sort_by=sort_by,
+            descending=page.descending,
+            stay_id=stay_id,
+            service_id=service_id,
+        )
+    except InvalidCursor as error:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=error.message)
+    return ModelResponse(all_usage, media_type=media_type)
 
 
 @router.get(
@@ -25,13 +45,12 @@ async def get_all_service_usage() -> list[ServiceUsageSchema]:
     response_model=ServiceUsageSchema,
     status_code=status.HTTP_200_OK
 )
-async def get_service_usage_by_id(usage_id: int) -> ServiceUsageSchema:
-    async with database.session() as session:
-        try:
-            usage = await service_usage_repo.get_service_usage(session=session, usage_id=usage_id)
-        except ServiceUsageNotFound as error:
-            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=error.message)
-    return usage
+async def get_service_usage_by_id(usage_id: int, session: AsyncSession = Depends(get_session)) -> ModelResponse:
+    try:
+        usage = await service_usage_repo.get_service_usage(session=session, usage_id=usage_id)
+    except ServiceUsageNotFound as error:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=error.message)
+    return ModelResponse(usage)
 
 
 @router.post(
@@ -39,16 +58,15 @@ async def get_service_usage_by_id(usage_id: int) -> ServiceUsageSchema:
     response_model=ServiceUsageSchema,
     status_code=status.HTTP_201_CREATED
 )
-async def add_service_usage(service_usage_dto: ServiceUsageCreateUpdateSchema) -> ServiceUsageSchema:
-    async with database.session() as session:
-        try:
-            new_service_usage = await service_usage_repo.create_service_usage(
-                session=session, usage=service_usage_dto
-            )
-        except ValueError as error:
-            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(error))
-        except IntegrityError as error:
-            raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(error))
+async def add_service_usage(service_usage_dto: ServiceUsageCreateUpdateSchema, session: AsyncSession = Depends(get_session)) -> ServiceUsageSchema:
+    try:
+        new_service_usage = await service_usage_repo.create_service_usage(
+            session=session, usage=service_usage_dto
+        )
+    except StayNotFound as error:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=error.message)
+    except ServiceNotFound as error:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=error.message)
     return new_service_usage
 
 
@@ -58,14 +76,17 @@ async def add_service_usage(service_usage_dto: ServiceUsageCreateUpdateSchema) -
     response_model=ServiceUsageSchema,
     status_code=status.HTTP_200_OK
 )
-async def update_service_usage(usage_id: int, usage_dto: ServiceUsageCreateUpdateSchema) -> ServiceUsageSchema:
-    async with database.session() as session:
-        try:
-            updated_usage = await service_usage_repo.update_service_usage(
-                session=session, usage_id=usage_id, usage=usage_dto
-            )
-        except ServiceUsageNotFound as error:
-            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=error.message)
+async def update_service_usage(usage_id: int, usage_dto: ServiceUsageCreateUpdateSchema, session: AsyncSession = Depends(get_session)) -> ServiceUsageSchema:
+    try:
+        updated_usage = await service_usage_repo.update_service_usage(
+            session=session, usage_id=usage_id, usage=usage_dto
+        )
+    except ServiceUsageNotFound as error:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=error.message)
+    except StayNotFound as error:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=error.message)
+    except ServiceNotFound as error:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=error.message)
     return updated_usage
 
 
@@ -73,9 +94,8 @@ async def update_service_usage(usage_id: int, usage_dto: ServiceUsageCreateUpdat
     "/delete_service_usage/{usage_id}",
     status_code=status.HTTP_204_NO_CONTENT
 )
-async def delete_service_usage(usage_id: int) -> None:
-    async with database.session() as session:
-        try:
-            await service_usage_repo.delete_service_usage(session=session, usage_id=usage_id)
-        except ServiceUsageNotFound as error:
-            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=error.message)
+async def delete_service_usage(usage_id: int, session: AsyncSession = Depends(get_session)) -> None:
+    try:
+        await service_usage_repo.delete_service_usage(session=session, usage_id=usage_id)
+    except ServiceUsageNotFound as error:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=error.message)
@@ -1,30 +1,59 @@
-from fastapi import APIRouter, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import date
 from project.infrastructure.postgres.repository.stays_repo import StaysRepository
-from project.infrastructure.postgres.database import PostgresDatabase
-from project.schemas.stays import StaySchema, StayCreateUpdateSchema
+from project.api.depends import PageParams, get_session
+from project.api.formats import LIST_RESPONSES, list_media_type
+from project.api.responses import ModelResponse
+from project.schemas.pagination import Page
+from project.schemas.stays import StaySchema, StaySortField, StayCreateUpdateSchema
 from project.core.exceptions import (
+    InvalidCursor,
     StayNotFound,
     RoomNotFound,
     BookingNotFound,
     StayAlreadyExists,
     InvalidStayDates,
     InvalidPaymentAmount,
+    PaymentTypeNotFound,
+    RoomOccupied,
 )
 router = APIRouter()
 stays_repo = StaysRepository()
-database = PostgresDatabase()
 
 @router.get(
     "/all_stays",
-    response_model=list[StaySchema],
+    response_model=Page[StaySchema],
+    responses=LIST_RESPONSES,
     status_code=status.HTTP_200_OK
 )
-async def get_all_stays() -> list[StaySchema]:
-    async with database.session() as session:
-        await stays_repo.check_connection(session=session)
-        all_stays = await stays_repo.get_all_stays(session=session)
-    return all_stays
+async def get_all_stays(
+    booking_id: int | None = None,
+    room_id: int | None = None,
+    type_payment_id: int | None = None,
+    check_in_from: date | None = None,
+    check_in_to: date | None = None,
+    sort_by: StaySortField = "stay_id",
+    page: PageParams = Depends(),
+    media_type: str = Depends(list_media_type),
+    session: AsyncSession = Depends(get_session),
+) -> ModelResponse:
+    try:
+        all_stays = await stays_repo.get_all_stays(
+            session=session,
+            limit=page.limit,
+            cursor=page.cursor,
+            sort_by=sort_by,
+            descending=page.descending,
+            booking_id=booking_id,
+            room_id=room_id,
+            type_payment_id=type_payment_id,
+            check_in_from=check_in_from,
+            check_in_to=check_in_to,
+        )
+    except InvalidCursor as error:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=error.message)
+    return ModelResponse(all_stays, media_type=media_type)
 
 
 @router.get(
@@ -32,13 +61,12 @@ async def get_all_stays() -> list[StaySchema]:
     response_model=StaySchema,
     status_code=status.HTTP_200_OK
 )
-async def get_stay_by_id(stay_id: int) -> StaySchema:
-    async with database.session() as session:
-        try:
-            stay = await stays_repo.get_stay(session=session, stay_id=stay_id)
-        except StayNotFound as error:
-            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=error.message)
-    return stay
+async def get_stay_by_id(stay_id: int, session: AsyncSession = Depends(get_session)) -> ModelResponse:
+    try:
+        stay = await stays_repo.get_stay(session=session, stay_id=stay_id)
+    except StayNotFound as error:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=error.message)
+    return ModelResponse(stay)
 
 
 @router.post(
@@ -46,7 +74,7 @@ async def get_stay_by_id(stay_id: int) -> StaySchema:
     response_model=StaySchema,
     status_code=status.HTTP_201_CREATED
 )
-async def add_stay(stay_dto: StayCreateUpdateSchema) -> StaySchema:
+async def add_stay(stay_dto: StayCreateUpdateSchema, session: AsyncSession = Depends(get_session)) -> StaySchema:
     # Валидация дат check_in_date и check_out_date
     if stay_dto.check_in_date >= stay_dto.check_out_date:
         raise HTTPException(
@@ -61,15 +89,18 @@ async def add_stay(stay_dto: StayCreateUpdateSchema) -> StaySchema:
             detail=InvalidPaymentAmount(message="Payment must be greater than or equal to 0").message
         )
 
-    async with database.session() as session:
-        try:
-            new_stay = await stays_repo.create_stay(session=session, stay=stay_dto)
-        except RoomNotFound as error:
-            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=error.message)
-        except BookingNotFound as error:
-            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=error.message)
-        except StayAlreadyExists as error:
-            raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=error.message)
+    try:
+        new_stay = await stays_repo.create_stay(session=session, stay=stay_dto)
+    except RoomNotFound as error:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=error.message)
+    except BookingNotFound as error:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=error.message)
+    except PaymentTypeNotFound as error:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=error.message)
+    except StayAlreadyExists as error:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=error.message)
+    except RoomOccupied as error:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=error.message)
     return new_stay
 
 @router.put(
@@ -77,14 +108,21 @@ async def add_stay(stay_dto: StayCreateUpdateSchema) -> StaySchema:
     response_model=StaySchema,
     status_code=status.HTTP_200_OK
 )
-async def update_stay(stay_id: int, stay_dto: StayCreateUpdateSchema) -> StaySchema:
-    async with database.session() as session:
-        try:
-            updated_stay = await stays_repo.update_stay(
-                session=session, stay_id=stay_id, stay=stay_dto
-            )
-        except StayNotFound as error:
-            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=error.message)
+async def update_stay(stay_id: int, stay_dto: StayCreateUpdateSchema, session: AsyncSession = Depends(get_session)) -> StaySchema:
+    try:
+        updated_stay = await stays_repo.update_stay(
+            session=session, stay_id=stay_id, stay=stay_dto
+        )
+    except StayNotFound as error:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=error.message)
+    except RoomNotFound as error:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=error.message)
+    except BookingNotFound as error:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=error.message)
+    except PaymentTypeNotFound as error:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=error.message)
+    except RoomOccupied as error:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=error.message)
     return updated_stay
 
 
@@ -92,9 +130,8 @@ async def update_stay(stay_id: int, stay_dto: StayCreateUpdateSchema) -> StaySch
     "/delete_stay/{stay_id}",
     status_code=status.HTTP_204_NO_CONTENT
 )
-async def delete_stay(stay_id: int) -> None:
-    async with database.session() as session:
-        try:
-            await stays_repo.delete_stay(session=session, stay_id=stay_id)
-        except StayNotFound as error:
-            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=error.message)
+async def delete_stay(stay_id: int, session: AsyncSession = Depends(get_session)) -> None:
+    try:
+        await stays_repo.delete_stay(session=session, stay_id=stay_id)
+    except StayNotFound as error:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=error.message)
@@ -17,6 +17,59 @@ class Settings(BaseSettings):
     POSTGRES_PASSWORD: SecretStr = "1944"
     POSTGRES_RECONNECT_INTERVAL_SEC: int = 1
 
+    # Параметры пула соединений (один пул на воркер)
+    POSTGRES_POOL_SIZE: int = 10
+    POSTGRES_MAX_OVERFLOW: int = 5
+    POSTGRES_POOL_RECYCLE_SEC: int = 1800
+    POSTGRES_POOL_PRE_PING: bool = True
+    POSTGRES_POOL_TIMEOUT_SEC: float = 30
+    POSTGRES_CONNECT_TIMEOUT_SEC: float = 10
+    POSTGRES_COMMAND_TIMEOUT_SEC: float = 60
+    POSTGRES_HEALTH_CHECK_INTERVAL_SEC: float = 5
+
+    # Реплики для GET-запросов (JSON-список URL вида postgresql+asyncpg://...); пусто — всё на основной БД
+    POSTGRES_REPLICA_URLS: list[str] = []
+    POSTGRES_REPLICA_CHECK_INTERVAL_SEC: float = 1
+    # Реплика, отставшая сильнее, исключается из чтения
+    POSTGRES_REPLICA_MAX_LAG_SEC: float = 10
+    # После записи клиент читает с реплики, только если она догнала его коммит (LSN в cookie);
+    # cookie живёт столько секунд, дальше подходит любая живая реплика
+    POSTGRES_READ_YOUR_WRITES_SEC: float = 10
+    POSTGRES_READ_YOUR_WRITES_COOKIE: str = "pg_read_after"
+
+    # Шарды по отелям: имя -> URL отдельной БД с той же схемой (миграции прогоняются на каждой).
+    # Отели, которых нет в POSTGRES_HOTEL_SHARDS (hotel_id -> имя шарда), живут в основной БД
+    POSTGRES_SHARDS: dict[str, str] = {}
+    POSTGRES_HOTEL_SHARDS: dict[int, str] = {}
+
+    # Повтор участка записи (SAVEPOINT) после дедлока или сбоя сериализации
+    POSTGRES_CONFLICT_RETRIES: int = 3
+    POSTGRES_CONFLICT_RETRY_MAX_WAIT_SEC: float = 0.2
+
+    PAGE_DEFAULT_LIMIT: int = 50
+    PAGE_MAX_LIMIT: int = 500
+    EXPORT_BATCH_SIZE: int = 1000
+    BULK_MAX_ITEMS: int = 1000
+
+    # Кеш занятости номеров для /api/availability (на каждый воркер)
+    AVAILABILITY_CACHE_ENABLED: bool = True
+    AVAILABILITY_HORIZON_DAYS: int = 365
+    AVAILABILITY_CACHE_MAX_HOTELS: int = 100
+    AVAILABILITY_DRIFT_CHECK_SEC: float = 60
+
+    # Кеш справочников (отели, типы номеров, услуги, типы оплаты)
+    REFERENCE_CACHE_TTL_SEC: float = 300
+    REFERENCE_CACHE_MAX_SIZE: int = 1024
+
+    # Инвалидация кешей между воркерами через LISTEN/NOTIFY
+    CACHE_INVALIDATION_ENABLED: bool = True
+    CACHE_INVALIDATION_CHANNEL: str = "cache_invalidation"
+
+    # Общий для воркеров хоста снимок номеров, типов номеров и услуг в shared memory
+    REFERENCE_SNAPSHOT_ENABLED: bool = False
+    REFERENCE_SNAPSHOT_NAME: str = "hotel_reference"
+    REFERENCE_SNAPSHOT_RETRY_SEC: float = 5
+
     @property
     def postgres_url(self) -> str:
         creds = f"{self.POSTGRES_USER.get_secret_value()}:{self.POSTGRES_PASSWORD.get_secret_value()}"
@@ -163,4 +163,29 @@ class InvalidTotalPrice(Exception):
 class StayNotFound(Exception):
     def __init__(self, message="Stay not found"):
         self.message = message
-        super().__init__(self.message)
\ No newline at end of file
+        super().__init__(self.message)
+
+class InvalidCursor(Exception):
+    def __init__(self, message="Invalid pagination cursor"):
+        self.message = message
+        super().__init__(self.message)
+
+class InvalidDateRange(Exception):
+    def __init__(self, message="check_out_date must be later than check_in_date"):
+        self.message = message
+        super().__init__(self.message)
+
+class CrossShardMove(Exception):
+    def __init__(self, message="Moving a record to a hotel stored in another shard is not supported"):
+        self.message = message
+        super().__init__(self.message)
+
+class RoomTypeOverbooked(Exception):
+    def __init__(self, message="Not enough rooms of this type for the booking dates"):
+        self.message = message
+        super().__init__(self.message)
+
+class RoomOccupied(Exception):
+    def __init__(self, message="Room is already occupied for these dates"):
+        self.message = message
+        super().__init__(self.message)
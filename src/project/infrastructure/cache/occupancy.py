@@ -0,0 +1,486 @@
+import asyncio
+import logging
+import time
+from collections import OrderedDict, defaultdict
+from contextlib import asynccontextmanager
+from datetime import date
+
+import numpy as np
+from sqlalchemy import Integer, func, type_coerce
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from project.core.config import settings
+from project.core.exceptions import InvalidDateRange
+from project.infrastructure.postgres.models import Booking, Room, RoomType, Stay
+from project.infrastructure.postgres.notifications import invalidation_bus
+from project.infrastructure.postgres.shards import shard_router
+from project.schemas.availability import AvailabilitySchema, RoomTypeAvailabilitySchema
+from project.schemas.rooms import RoomSchema
+
+logger = logging.getLogger(__name__)
+
+# Точка отсчёта для сумм по датам в отпечатке состояния
+EPOCH = date(2000, 1, 1)
+
+
+def _days(value: date) -> int:
+    return (value - EPOCH).days
+
+
+class HotelOccupancy:
+    """Занятость номеров одного отеля на горизонте [origin, origin + days).
+
+    `occupied` — битовая матрица ночи × номера в формате np.packbits: номер i лежит
+    в байте i >> 3 под маской 0x80 >> (i & 7). Брони без заселения хранятся как счётчики
+    начал и окончаний по типам номеров, чтобы число пересекающих окно броней
+    считалось двумя суммами.
+    """
+
+    def __init__(
+        self,
+        hotel_id: int,
+        origin: date,
+        days: int,
+        rooms: list[RoomSchema],
+        room_types: list[RoomType],
+    ) -> None:
+        self.hotel_id = hotel_id
+        self.origin = origin
+        self.days = days
+        self.checked_at = time.monotonic()
+
+        # Номера упорядочены как в SQL-версии: по типу, затем по номеру комнаты
+        self.rooms = rooms
+        self.room_index = {room.room_id: index for index, room in enumerate(rooms)}
+        self.room_types = [
+            (room_type.room_type_id, room_type.room_type, float(room_type.price_per_night), room_type.capacity)
+            for room_type in room_types
+        ]
+        self.type_index = {room_type.room_type_id: index for index, room_type in enumerate(room_types)}
+        self.capacity = np.array([room.capacity for room in rooms], dtype=np.int32)
+        self.room_type = np.array([self.type_index.get(room.room_type_id, -1) for room in rooms], dtype=np.int32)
+
+        self.occupied = np.zeros((days, (len(rooms) + 7) // 8), dtype=np.uint8)
+        self.starts = np.zeros((len(room_types), days + 1), dtype=np.int32)
+        self.ends = np.zeros((len(room_types), days + 1), dtype=np.int32)
+
+        # stay_id -> (room_id, booking_id, check_in_date, check_out_date) для номеров отеля
+        self.stays: dict[int, tuple[int, int, date, date]] = {}
+        self.room_stays: dict[int, set[int]] = defaultdict(set)
+        # booking_id -> (room_type_id, check_in_date, check_out_date) для броней отеля
+        self.bookings: dict[int, tuple[int, date, date]] = {}
+        # Проживания по броням отеля (номер может быть и в другом отеле)
+        self.booking_stays: dict[int, set[int]] = defaultdict(set)
+        self.stay_bookings: dict[int, int] = {}
+
+    def nights(self, check_in_date: date, check_out_date: date) -> tuple[int, int] | None:
+        start = max((check_in_date - self.origin).days, 0)
+        end = min((check_out_date - self.origin).days, self.days)
+        if start >= end:
+            return None
+        return start, end
+
+    def covers(self, check_in_date: date, check_out_date: date) -> bool:
+        return check_in_date >= self.origin and (check_out_date - self.origin).days <= self.days
+
+    def _draw_room(self, index: int) -> None:
+        byte, mask = index >> 3, np.uint8(0x80 >> (index & 7))
+        self.occupied[:, byte] &= ~mask
+        for stay_id in self.room_stays.get(index, ()):
+            _, _, check_in_date, check_out_date = self.stays[stay_id]
+            nights = self.nights(check_in_date, check_out_date)
+            if nights is not None:
+                self.occupied[nights[0]:nights[1], byte] |= mask
+
+    def _count_pending(self, booking_id: int, delta: int) -> None:
+        room_type_id, check_in_date, check_out_date = self.bookings[booking_id]
+        type_index = self.type_index.get(room_type_id)
+        nights = self.nights(check_in_date, check_out_date)
+        if type_index is None or nights is None:
+            return
+        self.starts[type_index, nights[0]] += delta
+        self.ends[type_index, nights[1]] += delta
+
+    def _is_pending(self, booking_id: int) -> bool:
+        return booking_id in self.bookings and not self.booking_stays.get(booking_id)
+
+    def add_stay(self, stay_id: int, room_id: int, booking_id: int, check_in_date: date, check_out_date: date) -> None:
+        index = self.room_index.get(room_id)
+        if index is not None:
+            self.stays[stay_id] = (room_id, booking_id, check_in_date, check_out_date)
+            self.room_stays[index].add(stay_id)
+            self._draw_room(index)
+        if booking_id in self.bookings:
+            was_pending = self._is_pending(booking_id)
+            self.booking_stays[booking_id].add(stay_id)
+            self.stay_bookings[stay_id] = booking_id
+            if was_pending:
+                self._count_pending(booking_id, -1)
+
+    def remove_stay(self, stay_id: int) -> None:
+        stay = self.stays.pop(stay_id, None)
+        if stay is not None:
+            index = self.room_index[stay[0]]
+            self.room_stays[index].discard(stay_id)
+            self._draw_room(index)
+        booking_id = self.stay_bookings.pop(stay_id, None)
+        if booking_id is not None:
+            self.booking_stays[booking_id].discard(stay_id)
+            if self._is_pending(booking_id):
+                self._count_pending(booking_id, 1)
+
+    def add_booking(self, booking_id: int, room_type_id: int, check_in_date: date, check_out_date: date) -> None:
+        self.bookings[booking_id] = (room_type_id, check_in_date, check_out_date)
+        if self._is_pending(booking_id):
+            self._count_pending(booking_id, 1)
+
+    def remove_booking(self, booking_id: int) -> None:
+        if self._is_pending(booking_id):
+            self._count_pending(booking_id, -1)
+        self.bookings.pop(booking_id, None)
+
+    def availability(self, check_in_date: date, check_out_date: date, capacity: int) -> AvailabilitySchema:
+        start, end = (check_in_date - self.origin).days, (check_out_date - self.origin).days
+
+        busy = np.bitwise_or.reduce(self.occupied[start:end], axis=0)
+        busy = np.unpackbits(busy, count=len(self.rooms)).astype(bool)
+        free = ~busy & (self.capacity >= capacity) & (self.room_type >= 0)
+        free_indexes = np.flatnonzero(free)
+
+        free_rooms = np.bincount(self.room_type[free_indexes], minlength=len(self.room_types))
+        # Брони, пересекающие окно: начались до его конца минус закончились до его начала
+        pending = self.starts[:, :end].sum(axis=1) - self.ends[:, :start + 1].sum(axis=1)
+
+        return AvailabilitySchema(
+            hotel_id=self.hotel_id,
+            check_in_date=check_in_date,
+            check_out_date=check_out_date,
+            rooms=[self.rooms[index] for index in free_indexes],
+            room_types=[
+                RoomTypeAvailabilitySchema(
+                    room_type_id=room_type_id,
+                    room_type=room_type,
+                    price_per_night=price_per_night,
+                    capacity=type_capacity,
+                    free_rooms=int(free_rooms[index]),
+                    pending_bookings=int(pending[index]),
+                    remaining=max(int(free_rooms[index] - pending[index]), 0),
+                )
+                for index, (room_type_id, room_type, price_per_night, type_capacity) in enumerate(self.room_types)
+            ],
+        )
+
+    def fingerprint(self) -> tuple[int, ...]:
+        # Должен совпадать с OccupancyCache._fetch_fingerprint
+        stays = self.stays.values()
+        bookings = self.bookings.values()
+        return (
+            len(self.stays),
+            sum(self.stays),
+            sum(stay[0] for stay in stays),
+            sum(stay[1] for stay in stays),
+            sum(_days(stay[2]) for stay in stays),
+            sum(_days(stay[3]) for stay in stays),
+            len(self.bookings),
+            sum(self.bookings),
+            sum(booking[0] for booking in bookings),
+            sum(_days(booking[1]) for booking in bookings),
+            sum(_days(booking[2]) for booking in bookings),
+            len(self.stay_bookings),
+            sum(self.stay_bookings),
+            len(self.rooms),
+            sum(self.room_index),
+            sum(room.room_type_id for room in self.rooms),
+            sum(room.capacity for room in self.rooms),
+            len(self.room_types),
+            sum(self.type_index),
+        )
+
+
+class OccupancyCache:
+    """Кеш занятости по отелям для поиска свободных номеров без запросов к БД.
+
+    Отель загружается при первом обращении и дальше обновляется после коммита
+    изменений проживаний и броней (см. `on_commit`), в других воркерах — по NOTIFY.
+    Изменения номеров и типов номеров сбрасывают отель целиком. Раз в `drift_check_sec`
+    отпечаток кеша сверяется с БД, при расхождении отель перестраивается.
+    """
+
+    def __init__(self, horizon_days: int, max_hotels: int, drift_check_sec: float) -> None:
+        self._horizon_days = horizon_days
+        self._max_hotels = max_hotels
+        self._drift_check_sec = drift_check_sec
+        self._hotels: OrderedDict[int, HotelOccupancy] = OrderedDict()
+        # Блокировка отеля живёт, пока её держат или ждут, иначе словарь рос бы на каждый запрошенный id
+        self._locks: dict[int, asyncio.Lock] = {}
+        self._lock_users: dict[int, int] = {}
+        # События, пришедшие во время загрузки отеля, применяются к нему после загрузки
+        self._loading: dict[int, list[tuple[str, tuple]]] = {}
+
+    async def get_availability(
+        self,
+        session: AsyncSession,
+        hotel_id: int,
+        check_in_date: date,
+        check_out_date: date,
+        capacity: int = 1,
+    ) -> AvailabilitySchema | None:
+        """Возвращает None, если окно выходит за горизонт кеша — тогда нужен запрос к БД."""
+        if check_out_date <= check_in_date:
+            raise InvalidDateRange()
+
+        hotel = await self._get_hotel(shard_router.for_hotel(session, hotel_id), hotel_id)
+        if not hotel.covers(check_in_date, check_out_date):
+            return None
+        return hotel.availability(check_in_date, check_out_date, capacity)
+
+    def clear(self) -> None:
+        self._hotels.clear()
+
+    @asynccontextmanager
+    async def _hotel_lock(self, hotel_id: int):
+        lock = self._locks.setdefault(hotel_id, asyncio.Lock())
+        self._lock_users[hotel_id] = self._lock_users.get(hotel_id, 0) + 1
+        try:
+            async with lock:
+                yield
+        finally:
+            self._lock_users[hotel_id] -= 1
+            if not self._lock_users[hotel_id]:
+                del self._lock_users[hotel_id]
+                del self._locks[hotel_id]
+
+    async def _get_hotel(self, session: AsyncSession, hotel_id: int) -> HotelOccupancy:
+        async with self._hotel_lock(hotel_id):
+            hotel = self._hotels.get(hotel_id)
+            if hotel is not None and hotel.origin != date.today():
+                hotel = None
+            if hotel is not None and time.monotonic() - hotel.checked_at > self._drift_check_sec:
+                if await self._fetch_fingerprint(session, hotel_id) == hotel.fingerprint():
+                    hotel.checked_at = time.monotonic()
+                else:
+                    logger.warning("Occupancy cache drift for hotel %s, rebuilding", hotel_id)
+                    hotel = None
+            if hotel is None:
+                hotel = await self._load(session, hotel_id)
+            else:
+                self._hotels.move_to_end(hotel_id)
+            return hotel
+
+    async def _load(self, session: AsyncSession, hotel_id: int) -> HotelOccupancy:
+        self._hotels.pop(hotel_id, None)
+        self._loading[hotel_id] = events = []
+        try:
+            hotel = await self._build(session, hotel_id)
+        finally:
+            del self._loading[hotel_id]
+
+        # Повторное применение идемпотентно, поэтому события, уже попавшие в выборку, не мешают
+        for kind, args in events:
+            if not self._dispatch(hotel, kind, args):
+                # Номера или типы номеров поменялись во время загрузки — отдаём как есть, не кешируем
+                return hotel
+
+        # Без номеров и типов номеров (в том числе несуществующий отель) кешировать нечего,
+        # а пустые записи вытесняли бы из LRU настоящие отели
+        if not hotel.rooms and not hotel.room_types:
+            return hotel
+
+        self._hotels[hotel_id] = hotel
+        while len(self._hotels) > self._max_hotels:
+            self._hotels.popitem(last=False)
+        return hotel
+
+    async def _build(self, session: AsyncSession, hotel_id: int) -> HotelOccupancy:
+        rooms = await session.scalars(
+            select(Room).where(Room.hotel_id == hotel_id).order_by(Room.room_type_id, Room.room_number)
+        )
+        room_types = await session.scalars(
+            select(RoomType).where(RoomType.hotel_id == hotel_id).order_by(RoomType.room_type_id)
+        )
+        hotel = HotelOccupancy(
+            hotel_id=hotel_id,
+            origin=date.today(),
+            days=self._horizon_days,
+            rooms=[RoomSchema.model_validate(obj=room) for room in rooms],
+            room_types=list(room_types),
+        )
+
+        bookings = await session.execute(
+            select(Booking.booking_id, Booking.room_type_id, Booking.check_in_date, Booking.check_out_date)
+            .where(Booking.hotel_id == hotel_id)
+        )
+        for booking_id, room_type_id, check_in_date, check_out_date in bookings:
+            hotel.bookings[booking_id] = (room_type_id, check_in_date, check_out_date)
+
+        stays = await session.execute(
+            select(Stay.stay_id, Stay.room_id, Stay.booking_id, Stay.check_in_date, Stay.check_out_date)
+            .join(Room, Room.room_id == Stay.room_id)
+            .where(Room.hotel_id == hotel_id)
+        )
+        for stay_id, room_id, booking_id, check_in_date, check_out_date in stays:
+            index = hotel.room_index.get(room_id)
+            if index is None:
+                # Номер добавлен после выборки номеров — расхождение поймает сверка отпечатка
+                continue
+            hotel.stays[stay_id] = (room_id, booking_id, check_in_date, check_out_date)
+            hotel.room_stays[index].add(stay_id)
+
+        booking_stays = await session.execute(
+            select(Stay.stay_id, Stay.booking_id)
+            .join(Booking, Booking.booking_id == Stay.booking_id)
+            .where(Booking.hotel_id == hotel_id)
+        )
+        for stay_id, booking_id in booking_stays:
+            hotel.booking_stays[booking_id].add(stay_id)
+            hotel.stay_bookings[stay_id] = booking_id
+
+        for index in hotel.room_stays:
+            hotel._draw_room(index)
+        for booking_id in hotel.bookings:
+            if hotel._is_pending(booking_id):
+                hotel._count_pending(booking_id, 1)
+        return hotel
+
+    async def _fetch_fingerprint(self, session: AsyncSession, hotel_id: int) -> tuple[int, ...]:
+        def total(column):
+            return func.coalesce(func.sum(column), 0)
+
+        def total_days(column):
+            return total(type_coerce(column - EPOCH, Integer))
+
+        stays = (
+            select(
+                func.count(),
+                total(Stay.stay_id),
+                total(Stay.room_id),
+                total(Stay.booking_id),
+                total_days(Stay.check_in_date),
+                total_days(Stay.check_out_date),
+            )
+            .join(Room, Room.room_id == Stay.room_id)
+            .where(Room.hotel_id == hotel_id)
+            .subquery()
+        )
+        bookings = (
+            select(
+                func.count(),
+                total(Booking.booking_id),
+                total(Booking.room_type_id),
+                total_days(Booking.check_in_date),
+                total_days(Booking.check_out_date),
+            )
+            .where(Booking.hotel_id == hotel_id)
+            .subquery()
+        )
+        booking_stays = (
+            select(func.count(), total(Stay.stay_id))
+            .join(Booking, Booking.booking_id == Stay.booking_id)
+            .where(Booking.hotel_id == hotel_id)
+            .subquery()
+        )
+        rooms = (
+            select(func.count(), total(Room.room_id), total(Room.room_type_id), total(Room.capacity))
+            .where(Room.hotel_id == hotel_id)
+            .subquery()
+        )
+        room_types = (
+            select(func.count(), total(RoomType.room_type_id))
+            .where(RoomType.hotel_id == hotel_id)
+            .subquery()
+        )
+        result = await session.execute(
+            select(*stays.c, *bookings.c, *booking_stays.c, *rooms.c, *room_types.c)
+        )
+        return tuple(int(value) for value in result.one())
+
+    def _dispatch(self, hotel: HotelOccupancy, kind: str, args: tuple) -> bool:
+        """Применяет событие к отелю; False — отель устарел и должен быть сброшен."""
+        if kind == "stay_saved":
+            hotel.remove_stay(args[0])
+            hotel.add_stay(*args)
+        elif kind == "stay_deleted":
+            hotel.remove_stay(*args)
+        elif kind == "booking_saved":
+            booking_id, hotel_id, room_type_id, check_in_date, check_out_date = args
+            hotel.remove_booking(booking_id)
+            if hotel_id == hotel.hotel_id:
+                hotel.add_booking(booking_id, room_type_id, check_in_date, check_out_date)
+        elif kind == "booking_deleted":
+            hotel.remove_booking(*args)
+        elif kind == "room_changed":
+            room_id, hotel_id = args
+            return room_id not in hotel.room_index and hotel_id != hotel.hotel_id
+        elif kind == "room_type_changed":
+            room_type_id, hotel_id = args
+            return room_type_id not in hotel.type_index and hotel_id != hotel.hotel_id
+        return True
+
+    def apply(self, kind: str, args: tuple) -> None:
+        for hotel_id, hotel in list(self._hotels.items()):
+            if not self._dispatch(hotel, kind, args):
+                del self._hotels[hotel_id]
+        for events in self._loading.values():
+            events.append((kind, args))
+
+
+occupancy_cache = OccupancyCache(
+    horizon_days=settings.AVAILABILITY_HORIZON_DAYS,
+    max_hotels=settings.AVAILABILITY_CACHE_MAX_HOTELS,
+    drift_check_sec=settings.AVAILABILITY_DRIFT_CHECK_SEC,
+)
+
+
+def _track(session: AsyncSession, kind: str, *args) -> None:
+    # Аргументы снимаются со строк до коммита; применяются после коммита здесь и по NOTIFY в других воркерах
+    invalidation_bus.publish(session, {"topic": "occupancy", "kind": kind, "args": args})
+
+
+def _on_invalidation(message: dict) -> None:
+    # Из NOTIFY даты приходят строками
+    args = tuple(date.fromisoformat(arg) if isinstance(arg, str) else arg for arg in message["args"])
+    occupancy_cache.apply(message["kind"], args)
+
+
+invalidation_bus.subscribe("occupancy", _on_invalidation, reset=occupancy_cache.clear)
+
+
+def track_stay(session: AsyncSession, stay: Stay) -> None:
+    _track(
+        session,
+        "stay_saved",
+        stay.stay_id,
+        stay.room_id,
+        stay.booking_id,
+        stay.check_in_date,
+        stay.check_out_date,
+    )
+
+
+def track_stay_deleted(session: AsyncSession, stay_id: int) -> None:
+    _track(session, "stay_deleted", stay_id)
+
+
+def track_booking(session: AsyncSession, booking: Booking) -> None:
+    _track(
+        session,
+        "booking_saved",
+        booking.booking_id,
+        booking.hotel_id,
+        booking.room_type_id,
+        booking.check_in_date,
+        booking.check_out_date,
+    )
+
+
+def track_booking_deleted(session: AsyncSession, booking_id: int) -> None:
+    _track(session, "booking_deleted", booking_id)
+
+
+def track_room(session: AsyncSession, room_id: int, hotel_id: int | None = None) -> None:
+    _track(session, "room_changed", room_id, hotel_id)
+
+
+def track_room_type(session: AsyncSession, room_type_id: int, hotel_id: int | None = None) -> None:
+    _track(session, "room_type_changed", room_type_id, hotel_id)
@@ -0,0 +1,112 @@
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Hashable
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from project.core.config import settings
+from project.infrastructure.cache.singleflight import single_flight
+from project.infrastructure.postgres.notifications import invalidation_bus
+
+
+class TTLCache:
+    """LRU-кеш с ограничением времени жизни записи и счётчиками попаданий.
+
+    Промахи по одному ключу, пришедшие одновременно, загружаются одним запросом (`get_or_load`).
+    """
+
+    def __init__(self, name: str, max_size: int, ttl_sec: float) -> None:
+        self.name = name
+        self._max_size = max_size
+        self._ttl_sec = ttl_sec
+        self._items: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._generation = 0
+        self._flight = single_flight(name)
+
+    def get(self, key: Hashable) -> Any | None:
+        item = self._items.get(key)
+        if item is None or item[0] < time.monotonic():
+            if item is not None:
+                del self._items[key]
+            self.misses += 1
+            return None
+        self._items.move_to_end(key)
+        self.hits += 1
+        return item[1]
+
+    def set(self, key: Hashable, value: Any) -> Any:
+        self._items[key] = (time.monotonic() + self._ttl_sec, value)
+        self._items.move_to_end(key)
+        while len(self._items) > self._max_size:
+            self._items.popitem(last=False)
+            self.evictions += 1
+        return value
+
+    async def get_or_load(
+        self, session: AsyncSession, key: Hashable, load: Callable[[AsyncSession], Awaitable[Any]]
+    ) -> Any:
+        value = self.get(key)
+        if value is not None:
+            return value
+        generation = self._generation
+        value = await self._flight.do(session, key, load)
+        # Сброс во время загрузки означает, что результат мог устареть: отдаём, но не запоминаем
+        if generation == self._generation:
+            self.set(key, value)
+        return value
+
+    def clear(self) -> None:
+        self._items.clear()
+        self._generation += 1
+        self._flight.forget()
+
+    def clear_on_commit(self, session: AsyncSession) -> None:
+        # Сбрасываем после коммита, чтобы параллельное чтение старой строки не пережило изменение;
+        # остальные воркеры сбросят свою копию по NOTIFY
+        invalidation_bus.publish(session, {"topic": "reference", "cache": self.name})
+
+    def stats(self) -> dict:
+        return {
+            "size": len(self._items),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+
+caches: dict[str, TTLCache] = {}
+
+
+def reference_cache(name: str) -> TTLCache:
+    """Кеш справочника (отели, типы номеров, услуги, типы оплаты); меняются редко, читаются постоянно."""
+    cache = caches[name] = TTLCache(
+        name=name,
+        max_size=settings.REFERENCE_CACHE_MAX_SIZE,
+        ttl_sec=settings.REFERENCE_CACHE_TTL_SEC,
+    )
+    return cache
+
+
+def _on_invalidation(message: dict) -> None:
+    cache = caches.get(message["cache"])
+    if cache is not None:
+        cache.clear()
+
+
+def _on_version(message: dict) -> None:
+    # Таблицу изменили (возможно, мимо приложения) — имена кешей совпадают с именами таблиц
+    cache = caches.get(message["table"])
+    if cache is not None:
+        cache.clear()
+
+
+def _clear_all() -> None:
+    for cache in caches.values():
+        cache.clear()
+
+
+invalidation_bus.subscribe("reference", _on_invalidation, reset=_clear_all)
+invalidation_bus.subscribe("version", _on_version, reset=_clear_all)
@@ -0,0 +1,89 @@
+import asyncio
+from functools import partial
+from typing import Awaitable, Callable, Hashable, TypeVar
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from project.infrastructure.postgres.database import database, on_commit
+from project.infrastructure.postgres.notifications import invalidation_bus
+from project.infrastructure.postgres.replicas import is_replica
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """Склеивает одинаковые параллельные чтения: один запрос к БД, общий результат.
+
+    Первый запрос по ключу выполняет загрузку в собственной сессии, остальные ждут её
+    результата (или ошибки). Отдельная сессия нужна, чтобы отмена ведущего HTTP-запроса
+    не прерывала ожидающих. Сессия с уже начатой транзакцией не склеивается — она может
+    видеть свои незафиксированные изменения. Сессия реплики своих изменений не имеет,
+    а кеши должны заполняться с основной БД, поэтому она склеивается всегда.
+    """
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self._calls: dict[Hashable, asyncio.Task] = {}
+        self.leaders = 0
+        self.joined = 0
+
+    async def do(self, session: AsyncSession, key: Hashable, load: Callable[[AsyncSession], Awaitable[T]]) -> T:
+        if session.in_transaction() and not is_replica(session):
+            return await load(session)
+
+        task = self._calls.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._run(load))
+            self._calls[key] = task
+            task.add_done_callback(partial(self._done, key))
+            self.leaders += 1
+        else:
+            self.joined += 1
+        return await asyncio.shield(task)
+
+    async def _run(self, load: Callable[[AsyncSession], Awaitable[T]]) -> T:
+        async with database.session() as session:
+            return await load(session)
+
+    def _done(self, key: Hashable, task: asyncio.Task) -> None:
+        if self._calls.get(key) is task:
+            del self._calls[key]
+        if not task.cancelled():
+            # Если все ожидающие отменены, ошибку никто не заберёт — не даём asyncio ругаться на это
+            task.exception()
+
+    def forget(self) -> None:
+        # Уже ждущие получат начатый результат, новые запросы пойдут в БД заново
+        self._calls.clear()
+
+    def forget_on_commit(self, session: AsyncSession) -> None:
+        on_commit(session, self.forget)
+
+    def stats(self) -> dict:
+        return {
+            "in_flight": len(self._calls),
+            "leaders": self.leaders,
+            "joined": self.joined,
+        }
+
+
+flights: dict[str, SingleFlight] = {}
+
+
+def single_flight(name: str) -> SingleFlight:
+    flight = flights[name] = SingleFlight(name)
+    return flight
+
+
+def _on_version(message: dict) -> None:
+    flight = flights.get(message["table"])
+    if flight is not None:
+        flight.forget()
+
+
+def _forget_all() -> None:
+    for flight in flights.values():
+        flight.forget()
+
+
+invalidation_bus.subscribe("version", _on_version, reset=_forget_all)
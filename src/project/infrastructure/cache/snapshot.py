@@ -0,0 +1,350 @@
+import asyncio
+import fcntl
+import logging
+import os
+import tempfile
+import time
+from multiprocessing import resource_tracker, shared_memory
+
+import numpy as np
+from sqlalchemy.future import select
+
+from project.core.config import settings
+from project.infrastructure.postgres.database import database
+from project.infrastructure.postgres.models import Room, RoomType, Service
+from project.infrastructure.postgres.notifications import invalidation_bus
+from project.schemas.rooms import RoomSchema
+from project.schemas.roomtypes import RoomTypeSchema
+from project.schemas.services import ServiceSchema
+
+logger = logging.getLogger(__name__)
+
+# Ширина строк совпадает с длиной столбцов в models.py
+ROOM_DTYPE = np.dtype([
+    ("room_id", "<i8"),
+    ("hotel_id", "<i8"),
+    ("room_type_id", "<i8"),
+    ("room_number", "<U20"),
+    ("price_per_night", "<f8"),
+    ("capacity", "<i8"),
+])
+ROOM_TYPE_DTYPE = np.dtype([
+    ("room_type_id", "<i8"),
+    ("hotel_id", "<i8"),
+    ("room_number", "<U20"),
+    ("room_type", "<U50"),
+    ("price_per_night", "<f8"),
+    ("capacity", "<i8"),
+])
+SERVICE_DTYPE = np.dtype([
+    ("service_id", "<i8"),
+    ("service_name", "<U100"),
+    ("price", "<f8"),
+])
+# started_at — время начала чтения из БД; по нему читатель понимает, видит ли снимок его изменения
+META_DTYPE = np.dtype([
+    ("started_at", "<f8"),
+    ("rooms", "<i8"),
+    ("room_types", "<i8"),
+    ("services", "<i8"),
+])
+HEADER_DTYPE = np.dtype([("generation", "<i8")])
+
+_REBUILD_DELAY_SEC = 0.1
+
+
+def _layout(rooms: int, room_types: int, services: int) -> tuple[list[int], int]:
+    offsets, offset = [], META_DTYPE.itemsize
+    for dtype, count in ((ROOM_DTYPE, rooms), (ROOM_TYPE_DTYPE, room_types), (SERVICE_DTYPE, services)):
+        offset += -offset % 8
+        offsets.append(offset)
+        offset += dtype.itemsize * count
+    return offsets, max(offset, 1)
+
+
+def _attach(name: str) -> shared_memory.SharedMemory:
+    segment = shared_memory.SharedMemory(name=name)
+    # Иначе resource_tracker удалит сегмент при выходе любого подключившегося процесса
+    resource_tracker.unregister(segment._name, "shared_memory")
+    return segment
+
+
+def _unlink(name: str) -> None:
+    try:
+        segment = shared_memory.SharedMemory(name=name)
+    except FileNotFoundError:
+        return
+    segment.close()
+    segment.unlink()
+
+
+def _create(name: str, size: int) -> shared_memory.SharedMemory:
+    _unlink(name)
+    segment = shared_memory.SharedMemory(name=name, create=True, size=size)
+    # Снимок переживает перезапуск воркеров, старые поколения удаляет сборщик
+    resource_tracker.unregister(segment._name, "shared_memory")
+    return segment
+
+
+class _MappedSnapshot:
+    def __init__(self, generation: int, segment: shared_memory.SharedMemory) -> None:
+        self.generation = generation
+        self.segment = segment
+        meta = np.ndarray((), dtype=META_DTYPE, buffer=segment.buf)
+        self.started_at = float(meta["started_at"])
+        offsets, _ = _layout(int(meta["rooms"]), int(meta["room_types"]), int(meta["services"]))
+        self.rooms = self._view(ROOM_DTYPE, int(meta["rooms"]), offsets[0])
+        self.room_types = self._view(ROOM_TYPE_DTYPE, int(meta["room_types"]), offsets[1])
+        self.services = self._view(SERVICE_DTYPE, int(meta["services"]), offsets[2])
+        del meta
+
+    def _view(self, dtype: np.dtype, count: int, offset: int) -> np.ndarray:
+        array = np.ndarray((count,), dtype=dtype, buffer=self.segment.buf, offset=offset)
+        array.flags.writeable = False
+        return array
+
+    def close(self) -> None:
+        self.rooms = self.room_types = self.services = None
+        try:
+            self.segment.close()
+        except BufferError:
+            # Кто-то ещё держит представление — память освободится вместе с ним
+            pass
+
+
+def _find(array: np.ndarray, key: str, value: int) -> np.void | None:
+    ids = array[key]
+    index = int(np.searchsorted(ids, value))
+    if index < len(ids) and ids[index] == value:
+        return array[index]
+    return None
+
+
+class ReferenceSnapshot:
+    """Снимок номеров, типов номеров и услуг в разделяемой памяти, один на хост.
+
+    Собирает его один воркер — тот, кто захватил файловую блокировку; остальные
+    подключают готовый сегмент только на чтение и ищут строки бинарным поиском по id
+    без копирования. Номер текущего поколения лежит в отдельном маленьком сегменте-заголовке,
+    каждое поколение — в своём сегменте. После изменения справочника в любом воркере
+    снимок не используется, пока не появится поколение, начатое позже этого изменения.
+    """
+
+    def __init__(self, name: str, refresh_sec: float, retry_sec: float) -> None:
+        self._name = name
+        self._refresh_sec = refresh_sec
+        self._retry_sec = retry_sec
+        self._header: shared_memory.SharedMemory | None = None
+        self._header_view: np.ndarray | None = None
+        self._mapped: _MappedSnapshot | None = None
+        self._invalidated_at = 0.0
+        self._lock_file = None
+        self._dirty = asyncio.Event()
+        self._task: asyncio.Task | None = None
+
+    # Чтение
+
+    def _current(self) -> _MappedSnapshot | None:
+        if not settings.REFERENCE_SNAPSHOT_ENABLED:
+            return None
+        if self._header is None:
+            try:
+                self._header = _attach(self._name)
+            except FileNotFoundError:
+                return None
+            self._header_view = np.ndarray((), dtype=HEADER_DTYPE, buffer=self._header.buf)
+
+        generation = int(self._header_view["generation"])
+        if generation == 0:
+            return None
+        if self._mapped is None or self._mapped.generation != generation:
+            try:
+                segment = _attach(f"{self._name}_{generation}")
+            except FileNotFoundError:
+                return None
+            if self._mapped is not None:
+                self._mapped.close()
+            self._mapped = _MappedSnapshot(generation, segment)
+
+        if self._mapped.started_at <= self._invalidated_at:
+            return None
+        return self._mapped
+
+    def get_room(self, room_id: int) -> RoomSchema | None:
+        snapshot = self._current()
+        row = snapshot and _find(snapshot.rooms, "room_id", room_id)
+        if row is None:
+            return None
+        return RoomSchema(
+            room_id=int(row["room_id"]),
+            hotel_id=int(row["hotel_id"]),
+            room_type_id=int(row["room_type_id"]),
+            room_number=str(row["room_number"]),
+            price_per_night=float(row["price_per_night"]),
+            capacity=int(row["capacity"]),
+        )
+
+    def get_roomtype(self, room_type_id: int) -> RoomTypeSchema | None:
+        snapshot = self._current()
+        row = snapshot and _find(snapshot.room_types, "room_type_id", room_type_id)
+        if row is None:
+            return None
+        return RoomTypeSchema(
+            room_type_id=int(row["room_type_id"]),
+            hotel_id=int(row["hotel_id"]),
+            room_number=str(row["room_number"]),
+            room_type=str(row["room_type"]),
+            price_per_night=float(row["price_per_night"]),
+            capacity=int(row["capacity"]),
+        )
+
+    def get_service(self, service_id: int) -> ServiceSchema | None:
+        snapshot = self._current()
+        row = snapshot and _find(snapshot.services, "service_id", service_id)
+        if row is None:
+            return None
+        return ServiceSchema(
+            service_id=int(row["service_id"]),
+            service_name=str(row["service_name"]),
+            price=float(row["price"]),
+        )
+
+    def invalidate(self) -> None:
+        self._invalidated_at = time.time()
+        self._dirty.set()
+
+    def refresh(self) -> None:
+        self._dirty.set()
+
+    # Сборка
+
+    def _try_lock(self) -> bool:
+        if self._lock_file is not None:
+            return True
+        lock_file = open(os.path.join(tempfile.gettempdir(), f"{self._name}.lock"), "w")
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            lock_file.close()
+            return False
+        self._lock_file = lock_file
+        return True
+
+    async def build(self) -> int:
+        started_at = time.time()
+        async with database.session() as session:
+            rooms = (await session.execute(
+                select(
+                    Room.room_id, Room.hotel_id, Room.room_type_id, Room.room_number,
+                    Room.price_per_night, Room.capacity,
+                ).order_by(Room.room_id)
+            )).all()
+            room_types = (await session.execute(
+                select(
+                    RoomType.room_type_id, RoomType.hotel_id, RoomType.room_number, RoomType.room_type,
+                    RoomType.price_per_night, RoomType.capacity,
+                ).order_by(RoomType.room_type_id)
+            )).all()
+            services = (await session.execute(
+                select(Service.service_id, Service.service_name, Service.price).order_by(Service.service_id)
+            )).all()
+
+        try:
+            header = _attach(self._name)
+        except FileNotFoundError:
+            header = _create(self._name, HEADER_DTYPE.itemsize)
+        header_view = np.ndarray((), dtype=HEADER_DTYPE, buffer=header.buf)
+        previous = int(header_view["generation"])
+        generation = previous + 1
+
+        offsets, size = _layout(len(rooms), len(room_types), len(services))
+        segment = _create(f"{self._name}_{generation}", size)
+        meta = np.ndarray((), dtype=META_DTYPE, buffer=segment.buf)
+        meta["started_at"] = started_at
+        meta["rooms"], meta["room_types"], meta["services"] = len(rooms), len(room_types), len(services)
+        for dtype, rows, offset in zip((ROOM_DTYPE, ROOM_TYPE_DTYPE, SERVICE_DTYPE), (rooms, room_types, services), offsets):
+            array = np.ndarray((len(rows),), dtype=dtype, buffer=segment.buf, offset=offset)
+            array[:] = [tuple(row) for row in rows]
+            del array
+        del meta
+        segment.close()
+
+        # Поколение публикуется последним, когда сегмент уже заполнен
+        header_view["generation"] = generation
+        del header_view
+        header.close()
+
+        if previous:
+            # Уже подключённые воркеры продолжают читать старый сегмент до переключения
+            _unlink(f"{self._name}_{previous}")
+        return generation
+
+    async def _run(self) -> None:
+        self._dirty.set()
+        while True:
+            try:
+                if self._try_lock():
+                    try:
+                        # Без NOTIFY о чужих изменениях не узнать, поэтому пересобираем и по таймеру
+                        await asyncio.wait_for(self._dirty.wait(), self._refresh_sec)
+                    except asyncio.TimeoutError:
+                        pass
+                    # NOTIFY приходит сюда в момент коммита, а писатель отмечает изменение чуть позже,
+                    # после возврата из COMMIT; пауза гарантирует, что сборка начнётся после его отметки,
+                    # и заодно склеивает пачку изменений в одну пересборку
+                    await asyncio.sleep(_REBUILD_DELAY_SEC)
+                    self._dirty.clear()
+                    generation = await self.build()
+                    logger.info("Reference snapshot %s generation %s built", self._name, generation)
+                    continue
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                logger.warning("Reference snapshot build failed: %s", exc)
+                self._dirty.set()
+            await asyncio.sleep(self._retry_sec)
+
+    def start(self) -> None:
+        if not settings.REFERENCE_SNAPSHOT_ENABLED or self._task is not None:
+            return
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._lock_file is not None:
+            self._lock_file.close()
+            self._lock_file = None
+
+
+reference_snapshot = ReferenceSnapshot(
+    name=settings.REFERENCE_SNAPSHOT_NAME,
+    refresh_sec=settings.REFERENCE_CACHE_TTL_SEC,
+    retry_sec=settings.REFERENCE_SNAPSHOT_RETRY_SEC,
+)
+
+
+def _on_reference(message: dict) -> None:
+    if message["cache"] in ("room_types", "services"):
+        reference_snapshot.invalidate()
+
+
+def _on_occupancy(message: dict) -> None:
+    if message["kind"] == "room_changed":
+        reference_snapshot.invalidate()
+
+
+def _on_version(message: dict) -> None:
+    if message["table"] in ("rooms", "room_types", "services"):
+        reference_snapshot.invalidate()
+
+
+# При переподключении снимок не отключаем (его поддерживает сборщик), только просим пересобрать
+invalidation_bus.subscribe("reference", _on_reference, reset=reference_snapshot.refresh)
+invalidation_bus.subscribe("occupancy", _on_occupancy, reset=reference_snapshot.refresh)
+invalidation_bus.subscribe("version", _on_version, reset=reference_snapshot.refresh)
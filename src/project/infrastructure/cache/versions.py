@@ -0,0 +1,90 @@
+from collections import defaultdict
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from project.infrastructure.cache.singleflight import SingleFlight
+from project.infrastructure.postgres.models import TableVersion
+from project.infrastructure.postgres.notifications import invalidation_bus
+
+
+class TableVersions:
+    """Версии справочных таблиц для ETag.
+
+    Версию таблицы увеличивает триггер `bump_table_version` на каждую изменяющую
+    инструкцию, в том числе выполненную мимо приложения, и сообщает её в канал инвалидации
+    вместе с id изменённых строк. Пока слушатель NOTIFY подключён, версии берутся из памяти
+    без обращения к БД; иначе — одним чтением строки `table_versions` по первичному ключу.
+    Версия строки — версия таблицы на момент её последнего изменения, известного воркеру.
+    """
+
+    def __init__(self) -> None:
+        self._versions: dict[str, int] = {}
+        # Версия таблицы, начиная с которой известны все изменённые строки
+        self._since: dict[str, int] = {}
+        self._changed: dict[str, dict[int, int]] = defaultdict(dict)
+        self._resets = 0
+        # Отдельная сессия не открывает транзакцию в сессии запроса, и её чтения остаются склеиваемыми
+        self._flight = SingleFlight("table_versions")
+
+    async def _fetch(self, session: AsyncSession, table: str) -> int:
+        async def load(session: AsyncSession) -> int:
+            version = await session.scalar(select(TableVersion.version).where(TableVersion.table_name == table))
+            return version or 0
+
+        return await self._flight.do(session, table, load)
+
+    async def get(self, session: AsyncSession, table: str) -> int:
+        if not invalidation_bus.is_listening:
+            version = await self._fetch(session, table)
+            if version > self._versions.get(table, 0):
+                # Без NOTIFY о чужом изменении узнаём здесь; кеши сбрасываем, чтобы новый тег
+                # не выдавался вместе со старым содержимым
+                invalidation_bus.deliver({"topic": "version", "table": table, "version": version, "ids": None})
+            return version
+        if table in self._since:
+            return self._versions[table]
+
+        resets = self._resets
+        version = await self._fetch(session, table)
+        # Пока ждали ответа, уведомления могли уже увеличить версию — берём большую
+        if resets == self._resets and invalidation_bus.is_listening:
+            self._since.setdefault(table, version)
+            self._versions[table] = max(self._versions.get(table, 0), version)
+        return version
+
+    async def get_row(self, session: AsyncSession, table: str, row_id: int) -> int:
+        version = await self.get(session, table)
+        if table not in self._since:
+            # Без слушателя об отдельных строках ничего не известно — хватит версии таблицы
+            return version
+        return self._changed[table].get(row_id, self._since[table])
+
+    def apply(self, table: str, version: int, ids: list[int] | None) -> None:
+        if version <= self._versions.get(table, 0) and table in self._since:
+            return
+        self._versions[table] = max(self._versions.get(table, 0), version)
+        if ids is None:
+            # Изменилось слишком много строк, чтобы их перечислить
+            self._since[table] = version
+            self._changed[table].clear()
+            return
+        changed = self._changed[table]
+        for row_id in ids:
+            changed[row_id] = version
+
+    def reset(self) -> None:
+        self._resets += 1
+        self._versions.clear()
+        self._since.clear()
+        self._changed.clear()
+
+
+table_versions = TableVersions()
+
+
+def _on_version(message: dict) -> None:
+    table_versions.apply(message["table"], message["version"], message["ids"])
+
+
+invalidation_bus.subscribe("version", _on_version, reset=table_versions.reset)
@@ -0,0 +1,46 @@
+from typing import Iterable
+
+from pydantic import BaseModel
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import InstrumentedAttribute
+
+
+async def find_missing_ids(session: AsyncSession, column: InstrumentedAttribute, ids: Iterable[int]) -> set[int]:
+    """Одним запросом возвращает те идентификаторы из ids, которых нет в column."""
+    ids = set(ids)
+    if not ids:
+        return set()
+    result = await session.execute(select(column).where(column.in_(ids)))
+    return ids - set(result.scalars().all())
+
+
+async def check_references(
+    session: AsyncSession,
+    items: dict[int, object],
+    references: list[tuple[str, InstrumentedAttribute, str]],
+) -> dict[int, list[str]]:
+    """Проверяет внешние ключи пакета: один set-based запрос на каждый внешний ключ.
+
+    references: (поле схемы, столбец первичного ключа, сообщение об ошибке).
+    """
+    errors: dict[int, list[str]] = {}
+    for field, column, message in references:
+        missing = await find_missing_ids(session, column, (getattr(item, field) for item in items.values()))
+        if not missing:
+            continue
+        for index, item in items.items():
+            if getattr(item, field) in missing:
+                errors.setdefault(index, []).append(f"{field}: {message}")
+    return errors
+
+
+async def bulk_insert(session: AsyncSession, model: type, items: dict[int, BaseModel]) -> dict[int, object]:
+    """Многострочный INSERT ... RETURNING одним запросом, результат сопоставлен с индексами items."""
+    if not items:
+        return {}
+    result = await session.scalars(
+        insert(model).returning(model, sort_by_parameter_order=True),
+        [item.model_dump() for item in items.values()],
+    )
+    return dict(zip(items, result.all()))
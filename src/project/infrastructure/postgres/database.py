@@ -1,36 +1,152 @@
+import logging
 from contextlib import asynccontextmanager
-from typing import Any, AsyncIterator, Dict
+from typing import Any, AsyncIterator, Callable, Dict
 
-from sqlalchemy import JSON, MetaData, String
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
-from sqlalchemy.orm import DeclarativeBase
+from sqlalchemy import JSON, MetaData, String, event, text
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import DeclarativeBase, Session
 
 from project.core.config import settings
 
 
+def create_engine(url: str) -> AsyncEngine:
+    return create_async_engine(
+        url,
+        pool_size=settings.POSTGRES_POOL_SIZE,
+        max_overflow=settings.POSTGRES_MAX_OVERFLOW,
+        pool_recycle=settings.POSTGRES_POOL_RECYCLE_SEC,
+        pool_pre_ping=settings.POSTGRES_POOL_PRE_PING,
+        pool_timeout=settings.POSTGRES_POOL_TIMEOUT_SEC,
+        connect_args={
+            "timeout": settings.POSTGRES_CONNECT_TIMEOUT_SEC,
+            "command_timeout": settings.POSTGRES_COMMAND_TIMEOUT_SEC,
+        },
+    )
+
+
+def create_session_factory(engine: AsyncEngine) -> async_sessionmaker[AsyncSession]:
+    return async_sessionmaker(
+        bind=engine,
+        autocommit=False,
+        autoflush=False,
+        expire_on_commit=False,
+        class_=AsyncSession,
+    )
+
+
 class PostgresDatabase:
+    """Один движок и пул соединений на процесс.
+
+    Движок создаётся в lifespan приложения (`connect`) и закрывается при остановке (`disconnect`).
+    """
+
     def __init__(self) -> None:
-        self._engine = create_async_engine(settings.postgres_url)
-        self._session_factory = async_sessionmaker(
-            bind=self._engine,
-            autocommit=False,
-            autoflush=False,
-            expire_on_commit=False,
-            class_=AsyncSession,
-        )
+        self._engine: AsyncEngine | None = None
+        self._session_factory: async_sessionmaker[AsyncSession] | None = None
+
+    @property
+    def engine(self) -> AsyncEngine:
+        if self._engine is None:
+            raise RuntimeError("Database engine is not initialized, call connect() first")
+        return self._engine
+
+    def connect(self) -> None:
+        if self._engine is not None:
+            return
+
+        self._engine = create_engine(settings.postgres_url)
+        self._session_factory = create_session_factory(self._engine)
+
+    async def disconnect(self) -> None:
+        if self._engine is None:
+            return
+
+        await self._engine.dispose()
+        self._engine = None
+        self._session_factory = None
 
     @asynccontextmanager
     async def session(self) -> AsyncIterator[AsyncSession]:
+        if self._session_factory is None:
+            raise RuntimeError("Database engine is not initialized, call connect() first")
+
         async with self._session_factory() as session:
             try:
                 yield session
+                await commit_attached(session)
                 await session.commit()
             except Exception:
                 await session.rollback()
                 raise
+            finally:
+                await close_attached(session)
+
+    async def current_lsn(self) -> int:
+        """Текущая позиция WAL на основной БД — после коммита по ней проверяется, догнала ли реплика."""
+        async with self.engine.connect() as connection:
+            return parse_lsn(await connection.scalar(text("SELECT pg_current_wal_lsn()::text")))
+
+
+def parse_lsn(value: str) -> int:
+    # pg_lsn в тексте — «старшие/младшие» 32 бита в hex: 16/B374D848
+    high, _, low = value.partition("/")
+    return (int(high, 16) << 32) | int(low, 16)
+
+
+def format_lsn(lsn: int) -> str:
+    return f"{lsn >> 32:X}/{lsn & 0xFFFFFFFF:X}"
 
 
 database = PostgresDatabase()
+logger = logging.getLogger(__name__)
+
+_ON_COMMIT_KEY = "on_commit"
+_ATTACHED_KEY = "attached"
+
+
+def on_commit(session: AsyncSession, callback: Callable[..., None], *args: Any) -> None:
+    """Вызвать `callback(*args)` после коммита внешней транзакции сессии; её откат вызов отменяет.
+
+    SAVEPOINT (`begin_nested`, в том числе повтор в `retry_conflicts`) на вызов не влияет:
+    ни его фиксация, ни откат не запускают и не отменяют уже зарегистрированные обработчики.
+    """
+    session.sync_session.info.setdefault(_ON_COMMIT_KEY, []).append((callback, args))
+
+
+def attach_session(session: AsyncSession, other: AsyncSession) -> None:
+    """Сессия `other` фиксируется перед `session` и закрывается вместе с ней (без двухфазного коммита)."""
+    session.sync_session.info.setdefault(_ATTACHED_KEY, []).append(other)
+
+
+async def commit_attached(session: AsyncSession) -> None:
+    for other in session.sync_session.info.get(_ATTACHED_KEY, ()):
+        await other.commit()
+
+
+async def close_attached(session: AsyncSession) -> None:
+    # Незафиксированная транзакция откатывается при закрытии
+    for other in session.sync_session.info.pop(_ATTACHED_KEY, ()):
+        await other.close()
+
+
+@event.listens_for(Session, "after_commit")
+def _run_on_commit(session: Session) -> None:
+    # События коммита и отката приходят и для SAVEPOINT — их пропускаем
+    if session.in_nested_transaction():
+        return
+    for callback, args in session.info.pop(_ON_COMMIT_KEY, []):
+        try:
+            callback(*args)
+        except Exception:
+            # Транзакция уже зафиксирована, ошибка обработчика не должна превращаться в ошибку запроса
+            logger.exception("on_commit callback %r failed", callback)
+
+
+@event.listens_for(Session, "after_rollback")
+def _drop_on_commit(session: Session) -> None:
+    if session.in_nested_transaction():
+        return
+    session.info.pop(_ON_COMMIT_KEY, None)
 metadata = MetaData(schema=settings.POSTGRES_SCHEMA)
 
 
@@ -0,0 +1,23 @@
+from sqlalchemy.exc import DBAPIError, IntegrityError
+from sqlalchemy.orm import InstrumentedAttribute
+
+
+def constraint_name(exc: IntegrityError) -> str | None:
+    """Имя нарушенного ограничения из исходного исключения asyncpg."""
+    return getattr(exc.orig.__cause__, "constraint_name", None) or getattr(exc.orig, "constraint_name", None)
+
+
+def foreign_key_name(column: InstrumentedAttribute) -> str:
+    # Миграции не задают имена внешним ключам, поэтому Postgres называет их <table>_<column>_fkey
+    return f"{column.table.name}_{column.key}_fkey"
+
+
+def translate_integrity_error(exc: IntegrityError, errors: dict[str, type[Exception]]) -> Exception:
+    """Возвращает доменное исключение для нарушенного ограничения или исходную ошибку."""
+    error = errors.get(constraint_name(exc))
+    return error() if error is not None else exc
+
+
+def sqlstate(exc: DBAPIError) -> str | None:
+    """Код ошибки Postgres (SQLSTATE) из исходного исключения asyncpg."""
+    return getattr(exc.orig.__cause__, "sqlstate", None) or getattr(exc.orig, "sqlstate", None)
@@ -0,0 +1,65 @@
+import asyncio
+import logging
+import time
+
+from sqlalchemy import text
+
+from project.core.config import settings
+from project.infrastructure.postgres.database import PostgresDatabase, database
+
+logger = logging.getLogger(__name__)
+
+
+class DatabaseHealthMonitor:
+    """Фоновая проверка доступности БД.
+
+    Результат последней проверки кешируется, поэтому `/health/ready` и обычные запросы
+    не делают лишний `SELECT 1`.
+    """
+
+    def __init__(self, db: PostgresDatabase, interval_sec: float) -> None:
+        self._db = db
+        self._interval_sec = interval_sec
+        self._task: asyncio.Task | None = None
+        self.is_ready: bool = False
+        self.last_checked_at: float | None = None
+        self.last_error: str | None = None
+
+    async def check(self) -> bool:
+        try:
+            async with self._db.engine.connect() as connection:
+                await connection.execute(text("SELECT 1"))
+        except Exception as exc:
+            if self.is_ready or self.last_checked_at is None:
+                logger.error("Database health check failed: %s", exc)
+            self.is_ready = False
+            self.last_error = str(exc)
+        else:
+            self.is_ready = True
+            self.last_error = None
+        self.last_checked_at = time.monotonic()
+        return self.is_ready
+
+    async def _run(self) -> None:
+        while True:
+            await self.check()
+            await asyncio.sleep(self._interval_sec)
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        self.is_ready = False
+
+
+health_monitor = DatabaseHealthMonitor(database, interval_sec=settings.POSTGRES_HEALTH_CHECK_INTERVAL_SEC)
@@ -0,0 +1,98 @@
+from datetime import date, timedelta
+
+from sqlalchemy import Date, Interval, cast, func, literal, select, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from project.infrastructure.postgres.models import Room, RoomType, RoomTypeInventory
+
+
+def _nights(check_in_date: date, check_out_date: date):
+    return (
+        RoomTypeInventory.night >= check_in_date,
+        RoomTypeInventory.night < check_out_date,
+    )
+
+
+async def _lock_room_type(session: AsyncSession, room_type_id: int, exclusive: bool = False) -> None:
+    # Брони держат строку типа FOR SHARE, изменения номеров — FOR UPDATE: иначе capacity новых
+    # ночей, посчитанная по номерам без учёта чужой открытой транзакции, так и осталась бы неверной
+    await session.execute(
+        select(RoomType.room_type_id)
+        .where(RoomType.room_type_id == room_type_id)
+        .with_for_update(read=not exclusive)
+    )
+
+
+async def reserve(session: AsyncSession, room_type_id: int, check_in_date: date, check_out_date: date) -> bool:
+    """Занимает по номеру типа на каждую ночь [заезд, выезд); False — какая-то ночь распродана.
+
+    Недостающие строки журнала создаются с текущим числом номеров типа, затем один
+    UPDATE ... WHERE sold < capacity по диапазону первичного ключа. Строка блокируется
+    до коммита, и конкурирующая бронь перепроверяет условие уже по новому sold.
+    При неудаче частично занятые ночи возвращаются, транзакция остаётся рабочей.
+    """
+    nights = (check_out_date - check_in_date).days
+    if nights <= 0:
+        return True
+
+    night = func.generate_series(
+        cast(check_in_date, Date),
+        cast(check_out_date - timedelta(days=1), Date),
+        cast(literal("1 day"), Interval),
+    )
+    await _lock_room_type(session, room_type_id)
+    rooms = select(func.count()).where(Room.room_type_id == room_type_id).scalar_subquery()
+    await session.execute(
+        insert(RoomTypeInventory)
+        .from_select(
+            ["room_type_id", "night", "sold", "capacity"],
+            select(literal(room_type_id), cast(night, Date), literal(0), rooms),
+        )
+        .on_conflict_do_nothing()
+    )
+
+    result = await session.execute(
+        update(RoomTypeInventory)
+        .where(
+            RoomTypeInventory.room_type_id == room_type_id,
+            *_nights(check_in_date, check_out_date),
+            RoomTypeInventory.sold < RoomTypeInventory.capacity,
+        )
+        .values(sold=RoomTypeInventory.sold + 1)
+        .returning(RoomTypeInventory.night)
+    )
+    reserved = result.scalars().all()
+    if len(reserved) == nights:
+        return True
+    if reserved:
+        await session.execute(
+            update(RoomTypeInventory)
+            .where(RoomTypeInventory.room_type_id == room_type_id, RoomTypeInventory.night.in_(reserved))
+            .values(sold=RoomTypeInventory.sold - 1)
+        )
+    return False
+
+
+async def release(session: AsyncSession, room_type_id: int, check_in_date: date, check_out_date: date) -> None:
+    # Тот же порядок, что в reserve: сначала тип, потом строки журнала — без дедлока с change_capacity
+    await _lock_room_type(session, room_type_id)
+    await session.execute(
+        update(RoomTypeInventory)
+        .where(RoomTypeInventory.room_type_id == room_type_id, *_nights(check_in_date, check_out_date))
+        .values(sold=RoomTypeInventory.sold - 1)
+    )
+
+
+async def change_capacity(session: AsyncSession, room_type_id: int, delta: int) -> None:
+    """Номер добавлен в тип или убран из него: меняется capacity всех уже заведённых ночей.
+
+    Ждёт открытые транзакции броней этого типа, а новые брони ждут коммита изменения номера,
+    так что reserve считает capacity новых ночей уже по зафиксированным номерам.
+    """
+    await _lock_room_type(session, room_type_id, exclusive=True)
+    await session.execute(
+        update(RoomTypeInventory)
+        .where(RoomTypeInventory.room_type_id == room_type_id)
+        .values(capacity=RoomTypeInventory.capacity + delta)
+    )
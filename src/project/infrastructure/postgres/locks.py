@@ -0,0 +1,76 @@
+from datetime import date
+from typing import Awaitable, Callable, Iterable, TypeVar
+
+from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncSession
+from tenacity import AsyncRetrying, retry_if_exception, stop_after_attempt, wait_random_exponential
+
+from project.core.config import settings
+from project.infrastructure.postgres.errors import sqlstate
+
+T = TypeVar("T")
+
+# Пространства ключей advisory-блокировок: ночи типа номера (брони) и ночи номера (проживания)
+ROOM_TYPE_NIGHTS = 1
+ROOM_NIGHTS = 2
+
+# serialization_failure, deadlock_detected
+CONFLICT_SQLSTATES = frozenset({"40001", "40P01"})
+
+# Ключ — (пространство, id, ночь) в одном bigint; совпадение ключей после обрезки лишь
+# заставит подождать, но не нарушит проверку. Блокировки берутся одним запросом по
+# возрастанию ключа, поэтому транзакции, пересекающиеся по ночам, не ждут друг друга по кругу
+_LOCK_NIGHTS = text("""
+    SELECT count(pg_advisory_xact_lock(key)) FROM (
+        SELECT DISTINCT (CAST(:namespace AS bigint) << 56)
+                        | ((r.resource_id::bigint & 4294967295) << 20)
+                        | ((night::date - DATE '2000-01-01') & 1048575) AS key
+          FROM unnest(CAST(:resource_ids AS integer[]), CAST(:check_ins AS date[]), CAST(:check_outs AS date[]))
+               AS r(resource_id, check_in_date, check_out_date),
+               generate_series(r.check_in_date, r.check_out_date - 1, interval '1 day') AS night
+         ORDER BY key
+    ) AS keys
+""")
+
+
+async def lock_nights(session: AsyncSession, namespace: int, ranges: Iterable[tuple[int, date, date]]) -> None:
+    """Транзакционные advisory-блокировки на ночи [заезд, выезд) каждого ресурса из `ranges`.
+
+    Блокируются только затронутые ночи: записи по другим типам номеров (номерам) и другим
+    датам идут параллельно. Снимаются при коммите или откате.
+    """
+    ranges = [(resource_id, start, end) for resource_id, start, end in ranges if start < end]
+    if not ranges:
+        return
+    resource_ids, check_ins, check_outs = zip(*ranges)
+    await session.execute(
+        _LOCK_NIGHTS,
+        {
+            "namespace": namespace,
+            "resource_ids": list(resource_ids),
+            "check_ins": list(check_ins),
+            "check_outs": list(check_outs),
+        },
+    )
+
+
+def is_conflict(exc: BaseException) -> bool:
+    return isinstance(exc, DBAPIError) and sqlstate(exc) in CONFLICT_SQLSTATES
+
+
+async def retry_conflicts(session: AsyncSession, operation: Callable[[], Awaitable[T]]) -> T:
+    """`operation` внутри SAVEPOINT; дедлок или сбой сериализации откатывает только его и повторяет.
+
+    Откат к точке сохранения снимает взятые в ней блокировки, остальная транзакция запроса
+    не теряется. Доменные ошибки из `operation` пробрасываются без повтора.
+    """
+    async for attempt in AsyncRetrying(
+        retry=retry_if_exception(is_conflict),
+        stop=stop_after_attempt(settings.POSTGRES_CONFLICT_RETRIES),
+        wait=wait_random_exponential(multiplier=0.01, max=settings.POSTGRES_CONFLICT_RETRY_MAX_WAIT_SEC),
+        reraise=True,
+    ):
+        with attempt:
+            async with session.begin_nested():
+                return await operation()
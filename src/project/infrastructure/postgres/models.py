@@ -1,11 +1,15 @@
 from datetime import datetime, date
 from sqlalchemy.orm import Mapped, mapped_column, relationship
-from sqlalchemy import ForeignKey, DECIMAL, String, Integer, Date
+from sqlalchemy import ForeignKey, DECIMAL, String, Integer, BigInteger, Date, Index, func
+from sqlalchemy.dialects.postgresql import ExcludeConstraint
 from project.infrastructure.postgres.database import Base
 
 
 class Client(Base):
     __tablename__ = "clients"
+    __table_args__ = (
+        Index("ix_clients_email", "email"),
+    )
 
     client_id: Mapped[int] = mapped_column(primary_key=True)
     full_name: Mapped[str] = mapped_column(nullable=False)
@@ -30,6 +34,9 @@ class Hotel(Base):
 
 class RoomType(Base):
     __tablename__ = "room_types"
+    __table_args__ = (
+        Index("ix_room_types_hotel_id", "hotel_id"),
+    )
 
     room_type_id: Mapped[int] = mapped_column(primary_key=True)
     hotel_id: Mapped[int] = mapped_column(ForeignKey("hotels.hotel_id"), nullable=False)
@@ -45,6 +52,11 @@ class RoomType(Base):
 
 class Room(Base):
     __tablename__ = "rooms"
+    __table_args__ = (
+        Index("ix_rooms_hotel_id", "hotel_id"),
+        Index("ix_rooms_room_type_id", "room_type_id"),
+        Index("ix_rooms_room_number", "room_number"),
+    )
 
     room_id: Mapped[int] = mapped_column(primary_key=True)
     hotel_id: Mapped[int] = mapped_column(ForeignKey("hotels.hotel_id"), nullable=False)
@@ -59,6 +71,11 @@ class Room(Base):
 
 class Booking(Base):
     __tablename__ = "bookings"
+    __table_args__ = (
+        Index("ix_bookings_hotel_id_check_in_date_check_out_date", "hotel_id", "check_in_date", "check_out_date"),
+        Index("ix_bookings_client_id", "client_id"),
+        Index("ix_bookings_room_type_id", "room_type_id"),
+    )
 
     booking_id: Mapped[int] = mapped_column(primary_key=True)
     client_id: Mapped[int] = mapped_column(ForeignKey("clients.client_id"), nullable=False)
@@ -73,6 +90,18 @@ class Booking(Base):
     hotel = relationship("Hotel", back_populates="bookings")
 
 
+class RoomTypeInventory(Base):
+    """Продано броней и всего номеров типа на ночь; ведут репозитории броней и номеров."""
+    __tablename__ = "room_type_inventory"
+
+    room_type_id: Mapped[int] = mapped_column(
+        ForeignKey("room_types.room_type_id", ondelete="CASCADE"), primary_key=True
+    )
+    night: Mapped[date] = mapped_column(Date, primary_key=True)
+    sold: Mapped[int] = mapped_column(nullable=False, server_default="0")
+    capacity: Mapped[int] = mapped_column(nullable=False)
+
+
 class PaymentType(Base):
     __tablename__ = "payment_types"
 
@@ -82,6 +111,11 @@ class PaymentType(Base):
 
 class Stay(Base):
     __tablename__ = "stays"
+    __table_args__ = (
+        Index("ix_stays_booking_id", "booking_id"),
+        Index("ix_stays_room_id", "room_id"),
+        Index("ix_stays_type_payment_id", "type_payment_id"),
+    )
 
     stay_id: Mapped[int] = mapped_column(primary_key=True)
     room_id: Mapped[int] = mapped_column(ForeignKey("rooms.room_id"), nullable=False)
@@ -97,6 +131,38 @@ class Stay(Base):
     payment_type = relationship("PaymentType")
 
 
+class TableVersion(Base):
+    """Счётчик изменений таблицы, увеличивается триггером bump_table_version."""
+    __tablename__ = "table_versions"
+
+    table_name: Mapped[str] = mapped_column(String(63), primary_key=True)
+    version: Mapped[int] = mapped_column(BigInteger, nullable=False, server_default="0")
+
+
+# GiST-индексы по полуоткрытому интервалу [заезд, выезд) для поиска пересечений через &&
+Index(
+    "ix_bookings_date_range",
+    func.daterange(Booking.check_in_date, Booking.check_out_date),
+    postgresql_using="gist",
+)
+Index(
+    "ix_stays_date_range",
+    func.daterange(Stay.check_in_date, Stay.check_out_date),
+    postgresql_using="gist",
+)
+
+# Номер не занят двумя проживаниями в пересекающиеся ночи; равенство room_id в GiST даёт btree_gist
+STAY_ROOM_OVERLAP = "ex_stays_room_id_date_range"
+Stay.__table__.append_constraint(
+    ExcludeConstraint(
+        (Stay.room_id, "="),
+        (func.daterange(Stay.check_in_date, Stay.check_out_date), "&&"),
+        name=STAY_ROOM_OVERLAP,
+        using="gist",
+    )
+)
+
+
 class Service(Base):
     __tablename__ = "services"
 
@@ -107,6 +173,10 @@ class Service(Base):
 
 class ServiceUsage(Base):
     __tablename__ = "service_usage"
+    __table_args__ = (
+        Index("ix_service_usage_stay_id", "stay_id"),
+        Index("ix_service_usage_service_id", "service_id"),
+    )
 
     service_usage_id: Mapped[int] = mapped_column(primary_key=True)
     stay_id: Mapped[int] = mapped_column(ForeignKey("stays.stay_id"), nullable=False)
@@ -120,6 +190,10 @@ class ServiceUsage(Base):
 
 class Feedback(Base):
     __tablename__ = "feedback"
+    __table_args__ = (
+        Index("ix_feedback_hotel_id_stay_id", "hotel_id", "stay_id"),
+        Index("ix_feedback_stay_id", "stay_id"),
+    )
 
     feedback_id: Mapped[int] = mapped_column(primary_key=True)
     hotel_id: Mapped[int] = mapped_column(ForeignKey("hotels.hotel_id"), nullable=False)
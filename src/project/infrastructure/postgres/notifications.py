@@ -0,0 +1,166 @@
+import asyncio
+import json
+import logging
+import os
+import socket
+from collections import defaultdict
+from typing import Callable
+
+import asyncpg
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from project.core.config import settings
+from project.infrastructure.postgres.database import on_commit
+from project.infrastructure.postgres.shards import shard_router
+
+logger = logging.getLogger(__name__)
+
+_NOTIFY_KEY = "notify"
+# Ограничение Postgres на payload NOTIFY — 8000 байт, оставляем запас на конверт с source
+_MAX_PAYLOAD_BYTES = 7500
+
+
+def _source() -> str:
+    # Вычисляется при каждом вызове, чтобы воркеры после fork не делили один идентификатор
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+class InvalidationBus:
+    """Шина инвалидации кешей между воркерами через Postgres LISTEN/NOTIFY.
+
+    Своему воркеру сообщение доставляется после коммита (`on_commit`). Для остальных оно
+    копится в сессии и уходит одним `pg_notify` прямо перед коммитом, поэтому Postgres
+    доставит его только если транзакция зафиксирована. Каждый воркер держит отдельное
+    asyncpg-соединение с LISTEN и передаёт сообщения подписчикам по `topic`.
+    После переподключения часть уведомлений могла потеряться, поэтому подписчикам
+    отправляется сброс. При шардировании слушается и каждый шард: там коммитятся изменения
+    данных отелей и срабатывают триггеры версий.
+    """
+
+    def __init__(self, channel: str) -> None:
+        self._channel = channel
+        self._handlers: dict[str, list[Callable[[dict], None]]] = defaultdict(list)
+        self._resets: list[Callable[[], None]] = []
+        self._tasks: list[asyncio.Task] = []
+        self._listening: set[str] = set()
+
+    @property
+    def is_listening(self) -> bool:
+        # Пропущенное уведомление любого шарда оставило бы кеш устаревшим, поэтому нужны все
+        return bool(self._tasks) and len(self._listening) == len(self._tasks)
+
+    def subscribe(self, topic: str, handler: Callable[[dict], None], reset: Callable[[], None]) -> None:
+        self._handlers[topic].append(handler)
+        self._resets.append(reset)
+
+    def publish(self, session: AsyncSession, message: dict) -> None:
+        on_commit(session, self._dispatch, message)
+        if settings.CACHE_INVALIDATION_ENABLED:
+            session.sync_session.info.setdefault(_NOTIFY_KEY, []).append(message)
+
+    def deliver(self, message: dict) -> None:
+        """Передать сообщение подписчикам этого воркера без NOTIFY."""
+        self._dispatch(message)
+
+    def _dispatch(self, message: dict) -> None:
+        for handler in self._handlers.get(message["topic"], ()):
+            handler(message)
+
+    def _payloads(self, messages: list[dict]) -> list[str]:
+        # Дробим на пакеты, чтобы каждый поместился в лимит NOTIFY
+        batches, batch, size = [], [], 0
+        for message in messages:
+            message_size = len(json.dumps(message, default=str)) + 2
+            if batch and size + message_size > _MAX_PAYLOAD_BYTES:
+                batches.append(batch)
+                batch, size = [], 0
+            batch.append(message)
+            size += message_size
+        if batch:
+            batches.append(batch)
+        return [json.dumps({"source": _source(), "messages": batch}, default=str) for batch in batches]
+
+    def _on_notification(self, connection, pid: int, channel: str, payload: str) -> None:
+        try:
+            body = json.loads(payload)
+            if body["source"] == _source():
+                # Свой воркер получил сообщение в on_commit
+                return
+            for message in body["messages"]:
+                self._dispatch(message)
+        except Exception:
+            logger.exception("Failed to handle cache invalidation %r", payload)
+
+    def _reset(self) -> None:
+        for reset in self._resets:
+            reset()
+
+    async def _listen(self, url: str) -> None:
+        dsn = url.replace("postgresql+asyncpg://", "postgresql://", 1)
+        connection = await asyncpg.connect(dsn, timeout=settings.POSTGRES_CONNECT_TIMEOUT_SEC)
+        closed = asyncio.Event()
+        connection.add_termination_listener(lambda _: closed.set())
+        try:
+            await connection.add_listener(self._channel, self._on_notification)
+            self._listening.add(url)
+            self._reset()
+            while not closed.is_set():
+                try:
+                    await asyncio.wait_for(closed.wait(), settings.POSTGRES_HEALTH_CHECK_INTERVAL_SEC)
+                except asyncio.TimeoutError:
+                    # Обрыв сети без закрытия сокета так не заметить, поэтому пингуем
+                    await connection.fetchval("SELECT 1", timeout=settings.POSTGRES_COMMAND_TIMEOUT_SEC)
+        finally:
+            self._listening.discard(url)
+            if not connection.is_closed():
+                await connection.close()
+
+    async def _run(self, url: str) -> None:
+        while True:
+            try:
+                await self._listen(url)
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                logger.warning("Cache invalidation listener failed: %s", exc)
+            await asyncio.sleep(settings.POSTGRES_RECONNECT_INTERVAL_SEC)
+
+    def start(self) -> None:
+        if not settings.CACHE_INVALIDATION_ENABLED or self._tasks:
+            return
+        self._tasks = [asyncio.create_task(self._run(url)) for url in [settings.postgres_url, *shard_router.urls]]
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        self._tasks = []
+
+
+invalidation_bus = InvalidationBus(settings.CACHE_INVALIDATION_CHANNEL)
+
+
+@event.listens_for(Session, "before_commit")
+def _send_notifications(session: Session) -> None:
+    # Как и on_commit, уведомления привязаны к внешней транзакции, а не к SAVEPOINT
+    if session.in_nested_transaction():
+        return
+    messages = session.info.pop(_NOTIFY_KEY, None)
+    if not messages:
+        return
+    session.execute(
+        text("SELECT pg_notify(:channel, payload) FROM unnest(CAST(:payloads AS text[])) AS payload"),
+        {"channel": settings.CACHE_INVALIDATION_CHANNEL, "payloads": invalidation_bus._payloads(messages)},
+    )
+
+
+@event.listens_for(Session, "after_rollback")
+def _drop_notifications(session: Session) -> None:
+    if session.in_nested_transaction():
+        return
+    session.info.pop(_NOTIFY_KEY, None)
@@ -0,0 +1,96 @@
+import base64
+import binascii
+import json
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any
+
+from sqlalchemy import Select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import InstrumentedAttribute
+
+from project.core.exceptions import InvalidCursor
+
+
+def _dump_value(value: Any) -> Any:
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return str(value)
+    return value
+
+
+def _load_value(column: InstrumentedAttribute, value: Any) -> Any:
+    python_type = column.type.python_type
+    if python_type is date:
+        return date.fromisoformat(value)
+    if python_type is datetime:
+        return datetime.fromisoformat(value)
+    if python_type is Decimal:
+        return Decimal(value)
+    return python_type(value)
+
+
+def encode_cursor(sort_by: str, value: Any, pk: int) -> str:
+    payload = json.dumps([sort_by, _dump_value(value), pk], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, sort_by: str, sort_column: InstrumentedAttribute) -> tuple[Any, int]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        cursor_sort_by, value, pk = json.loads(base64.urlsafe_b64decode(padded))
+        if cursor_sort_by != sort_by:
+            raise InvalidCursor("Cursor was issued for a different sort order")
+        return _load_value(sort_column, value), int(pk)
+    except InvalidCursor:
+        raise
+    except (binascii.Error, ValueError, TypeError) as exc:
+        raise InvalidCursor() from exc
+
+
+async def paginate(
+    session: AsyncSession,
+    query: Select,
+    pk_column: InstrumentedAttribute,
+    sort_column: InstrumentedAttribute,
+    sort_by: str,
+    limit: int,
+    cursor: str | None = None,
+    descending: bool = False,
+) -> tuple[list[Any], str | None]:
+    """Keyset-пагинация по (sort_column, pk_column).
+
+    Вместо OFFSET продолжаем с последней пары (значение сортировки, первичный ключ),
+    поэтому время ответа не зависит от номера страницы и размера таблицы.
+    """
+    same_column = sort_column is pk_column
+    key = pk_column if same_column else tuple_(sort_column, pk_column)
+
+    if cursor is not None:
+        value, pk = decode_cursor(cursor, sort_by, sort_column)
+        bound = pk if same_column else tuple_(value, pk)
+        query = query.where(key < bound if descending else key > bound)
+
+    if same_column:
+        order_by = [pk_column.desc() if descending else pk_column.asc()]
+    else:
+        order_by = [
+            sort_column.desc() if descending else sort_column.asc(),
+            pk_column.desc() if descending else pk_column.asc(),
+        ]
+
+    result = await session.execute(query.order_by(*order_by).limit(limit + 1))
+    # select(Model) отдаёт ORM-объекты, select(*колонки) — строки; у обоих значения доступны по имени
+    descriptions = query.column_descriptions
+    if len(descriptions) == 1 and isinstance(descriptions[0]["expr"], type):
+        rows = list(result.scalars().all())
+    else:
+        rows = list(result.all())
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_cursor(sort_by, getattr(last, sort_column.key), getattr(last, pk_column.key))
+    return rows, next_cursor
@@ -0,0 +1,174 @@
+import asyncio
+import logging
+import random
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from project.core.config import settings
+from project.infrastructure.postgres.database import (
+    PostgresDatabase,
+    close_attached,
+    create_engine,
+    create_session_factory,
+    database,
+    parse_lsn,
+)
+
+logger = logging.getLogger(__name__)
+
+REPLICA_KEY = "replica"
+
+# На реплике — позиция воспроизведённого WAL; URL, указывающий на основную БД (dev), тоже работает
+_REPLAY_LSN = text(
+    "SELECT (CASE WHEN pg_is_in_recovery() THEN pg_last_wal_replay_lsn() ELSE pg_current_wal_lsn() END)::text"
+)
+
+
+class Replica:
+    def __init__(self, name: str, url: str) -> None:
+        self.name = name
+        self.engine = create_engine(url)
+        self.session_factory = create_session_factory(self.engine)
+        self.replay_lsn: int | None = None
+        self.lag_sec: float | None = None
+        self.last_error: str | None = None
+
+    def stats(self) -> dict:
+        return {
+            "available": self.lag_sec is not None and self.last_error is None,
+            "lag_sec": None if self.lag_sec is None else round(self.lag_sec, 3),
+            "error": self.last_error,
+        }
+
+
+class ReplicaPool:
+    """Пул реплик для чтения и фоновый замер их отставания.
+
+    Раз в `interval_sec` запоминается текущий LSN основной БД и читается LSN воспроизведения
+    каждой реплики. Отставание реплики — возраст самого свежего замера основной БД, который
+    она уже догнала; реплика, отставшая больше `max_lag_sec` (или недоступная), в выбор не
+    попадает. Без подходящей реплики чтение идёт в основную БД.
+    """
+
+    def __init__(self, db: PostgresDatabase, urls: list[str], interval_sec: float, max_lag_sec: float) -> None:
+        self._db = db
+        self._urls = urls
+        self._interval_sec = interval_sec
+        self._max_lag_sec = max_lag_sec
+        self._replicas: list[Replica] = []
+        # (monotonic, LSN основной БД) за последние max_lag_sec
+        self._primary_lsns: deque[tuple[float, int]] = deque()
+        self._task: asyncio.Task | None = None
+        self.reads = 0
+        self.fallbacks = 0
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self._urls)
+
+    def connect(self) -> None:
+        if self._replicas or not self.enabled:
+            return
+        self._replicas = [Replica(f"replica{number}", url) for number, url in enumerate(self._urls, start=1)]
+        self._task = asyncio.create_task(self._run())
+
+    async def disconnect(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        for replica in self._replicas:
+            await replica.engine.dispose()
+        self._replicas = []
+        self._primary_lsns.clear()
+
+    async def check(self) -> None:
+        try:
+            primary_lsn = await self._db.current_lsn()
+        except Exception as exc:
+            # Без свежего замера основной БД отставание реплик растёт и они выпадают сами
+            logger.warning("Primary LSN check failed: %s", exc)
+        else:
+            self._primary_lsns.append((time.monotonic(), primary_lsn))
+        while self._primary_lsns and time.monotonic() - self._primary_lsns[0][0] > self._max_lag_sec:
+            self._primary_lsns.popleft()
+
+        for replica in self._replicas:
+            try:
+                async with replica.engine.connect() as connection:
+                    replica.replay_lsn = parse_lsn(await connection.scalar(_REPLAY_LSN))
+            except Exception as exc:
+                if replica.last_error is None:
+                    logger.error("Replica %s check failed: %s", replica.name, exc)
+                replica.last_error = str(exc)
+                replica.lag_sec = None
+                continue
+            replica.last_error = None
+            replica.lag_sec = self._lag(replica.replay_lsn)
+
+    def _lag(self, replay_lsn: int) -> float | None:
+        for checked_at, primary_lsn in reversed(self._primary_lsns):
+            if replay_lsn >= primary_lsn:
+                return time.monotonic() - checked_at
+        return None
+
+    async def _run(self) -> None:
+        while True:
+            await self.check()
+            await asyncio.sleep(self._interval_sec)
+
+    def choose(self, min_lsn: int | None = None) -> Replica | None:
+        candidates = [
+            replica
+            for replica in self._replicas
+            if replica.lag_sec is not None
+            and replica.last_error is None
+            and (min_lsn is None or replica.replay_lsn >= min_lsn)
+        ]
+        return random.choice(candidates) if candidates else None
+
+    @asynccontextmanager
+    async def read_session(self, min_lsn: int | None = None) -> AsyncIterator[AsyncSession]:
+        """Сессия только для чтения: реплика, догнавшая `min_lsn`, иначе основная БД."""
+        replica = self.choose(min_lsn)
+        if replica is None:
+            if self.enabled:
+                self.fallbacks += 1
+            async with self._db.session() as session:
+                yield session
+            return
+
+        self.reads += 1
+        async with replica.session_factory() as session:
+            session.info[REPLICA_KEY] = replica.name
+            try:
+                yield session
+            finally:
+                await close_attached(session)
+
+    def stats(self) -> dict:
+        return {
+            "reads": self.reads,
+            "fallbacks": self.fallbacks,
+            **{replica.name: replica.stats() for replica in self._replicas},
+        }
+
+
+def is_replica(session: AsyncSession) -> bool:
+    return REPLICA_KEY in session.info
+
+
+replica_pool = ReplicaPool(
+    database,
+    urls=settings.POSTGRES_REPLICA_URLS,
+    interval_sec=settings.POSTGRES_REPLICA_CHECK_INTERVAL_SEC,
+    max_lag_sec=settings.POSTGRES_REPLICA_MAX_LAG_SEC,
+)
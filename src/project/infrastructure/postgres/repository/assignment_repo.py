@@ -0,0 +1,149 @@
+from bisect import bisect_right, insort
+from collections import defaultdict, deque
+from datetime import date
+
+from sqlalchemy import exists
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+from project.infrastructure.postgres.models import Booking, Room, RoomType, Stay
+from project.infrastructure.postgres.repository.availability_repo import date_range
+from project.infrastructure.postgres.shards import shard_router
+from project.schemas.assignment import AssignmentPlanSchema, RoomAssignmentSchema
+from project.core.exceptions import InvalidDateRange
+
+
+def assign_rooms(
+    bookings: list[tuple[int, int, date, date]],
+    rooms: dict[int, list[int]],
+    occupied: dict[int, list[tuple[date, date]]],
+) -> dict[int, int]:
+    """Жадная раскраска интервального графа: брони (id, тип, заезд, выезд) -> номер.
+
+    Брони каждого типа идут по дате заезда; бронь получает номер своего типа, освободившийся
+    позже всех, но не позже заезда (best fit), и только если до выезда у номера не начинается
+    уже записанное проживание из `occupied`. Так номера заполняются без лишних окон, а длинные
+    свободные отрезки остаются целыми. `rooms` — номера типа в порядке предпочтения.
+    """
+    plan = {}
+    by_type = defaultdict(list)
+    for booking in bookings:
+        if booking[2] < booking[3]:
+            by_type[booking[1]].append(booking)
+
+    for room_type_id, type_bookings in by_type.items():
+        room_ids = rooms.get(room_type_id, [])
+        if not room_ids:
+            continue
+        type_bookings.sort(key=lambda booking: (booking[2], booking[3], booking[0]))
+        # При равной дате освобождения берётся последний в списке free, поэтому ранг убывает
+        # с порядком предпочтения: первый номер из `rooms` идёт последним
+        rank = {room_id: -index for index, room_id in enumerate(room_ids)}
+        fixed = sorted(
+            (start, end, room_id) for room_id in room_ids for start, end in occupied.get(room_id, ()) if start < end
+        )
+        # Начала ещё не пройденных записанных проживаний каждого номера
+        upcoming = {room_id: deque() for room_id in room_ids}
+        for start, _, room_id in fixed:
+            upcoming[room_id].append(start)
+        free_since = dict.fromkeys(room_ids, date.min)
+        # (свободен с, ранг, номер) по возрастанию
+        free = sorted((date.min, rank[room_id], room_id) for room_id in room_ids)
+        position = 0
+
+        for booking_id, _, check_in_date, check_out_date in type_bookings:
+            while position < len(fixed) and fixed[position][0] <= check_in_date:
+                _, end, room_id = fixed[position]
+                position += 1
+                upcoming[room_id].popleft()
+                if end > free_since[room_id]:
+                    free.remove((free_since[room_id], rank[room_id], room_id))
+                    free_since[room_id] = end
+                    insort(free, (end, rank[room_id], room_id))
+
+            index = bisect_right(free, (check_in_date, 1)) - 1
+            while index >= 0 and upcoming[free[index][2]] and upcoming[free[index][2]][0] < check_out_date:
+                index -= 1
+            if index < 0:
+                continue
+            _, _, room_id = free.pop(index)
+            free_since[room_id] = check_out_date
+            insort(free, (check_out_date, rank[room_id], room_id))
+            plan[booking_id] = room_id
+    return plan
+
+
+class AssignmentRepository:
+    async def plan_assignment(
+        self, session: AsyncSession, hotel_id: int, date_from: date, date_to: date
+    ) -> AssignmentPlanSchema:
+        if date_to <= date_from:
+            raise InvalidDateRange("to must be later than from")
+
+        session = shard_router.for_hotel(session, hotel_id)
+        bookings = (
+            await session.execute(
+                select(Booking.booking_id, Booking.room_type_id, Booking.check_in_date, Booking.check_out_date).where(
+                    Booking.hotel_id == hotel_id,
+                    date_range(Booking.check_in_date, Booking.check_out_date).op("&&")(date_range(date_from, date_to)),
+                    ~exists().where(Stay.booking_id == Booking.booking_id),
+                )
+            )
+        ).all()
+
+        # Номер подходит типу, если вмещает столько гостей, сколько обещает тип
+        rooms = (
+            await session.execute(
+                select(Room.room_id, Room.room_type_id, Room.room_number, Room.price_per_night)
+                .join(RoomType, RoomType.room_type_id == Room.room_type_id)
+                .where(Room.hotel_id == hotel_id, Room.capacity >= RoomType.capacity)
+                .order_by(Room.room_type_id, Room.room_number)
+            )
+        ).all()
+        room_ids = defaultdict(list)
+        for room in rooms:
+            room_ids[room.room_type_id].append(room.room_id)
+
+        occupied = defaultdict(list)
+        if bookings:
+            span = date_range(
+                min(booking.check_in_date for booking in bookings),
+                max(booking.check_out_date for booking in bookings),
+            )
+            stays = await session.execute(
+                select(Stay.room_id, Stay.check_in_date, Stay.check_out_date)
+                .join(Room, Room.room_id == Stay.room_id)
+                .where(Room.hotel_id == hotel_id, date_range(Stay.check_in_date, Stay.check_out_date).op("&&")(span))
+            )
+            for room_id, check_in_date, check_out_date in stays:
+                occupied[room_id].append((check_in_date, check_out_date))
+
+        plan = assign_rooms([tuple(booking) for booking in bookings], room_ids, occupied)
+        rooms_by_id = {room.room_id: room for room in rooms}
+        assignments = []
+        unassigned = []
+        for booking in sorted(bookings, key=lambda booking: (booking.check_in_date, booking.booking_id)):
+            room_id = plan.get(booking.booking_id)
+            if room_id is None:
+                unassigned.append(booking.booking_id)
+                continue
+            room = rooms_by_id[room_id]
+            nights = (booking.check_out_date - booking.check_in_date).days
+            assignments.append(
+                RoomAssignmentSchema(
+                    booking_id=booking.booking_id,
+                    room_type_id=booking.room_type_id,
+                    room_id=room_id,
+                    room_number=room.room_number,
+                    check_in_date=booking.check_in_date,
+                    check_out_date=booking.check_out_date,
+                    total_price=float(room.price_per_night) * nights,
+                )
+            )
+
+        return AssignmentPlanSchema(
+            hotel_id=hotel_id,
+            date_from=date_from,
+            date_to=date_to,
+            assignments=assignments,
+            unassigned=unassigned,
+        )
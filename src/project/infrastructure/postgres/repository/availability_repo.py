@@ -0,0 +1,94 @@
+from datetime import date
+
+from sqlalchemy import exists, func
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+from sqlalchemy.orm import aliased
+from project.infrastructure.postgres.models import Booking, Room, RoomType, Stay
+from project.infrastructure.postgres.shards import shard_router
+from project.schemas.availability import AvailabilitySchema, RoomTypeAvailabilitySchema
+from project.schemas.rooms import RoomSchema
+from project.core.exceptions import InvalidDateRange
+
+
+def date_range(check_in_date, check_out_date):
+    # То же выражение, что и в GiST-индексах ix_*_date_range
+    return func.daterange(check_in_date, check_out_date)
+
+
+class AvailabilityRepository:
+    async def get_availability(
+        self,
+        session: AsyncSession,
+        hotel_id: int,
+        check_in_date: date,
+        check_out_date: date,
+        capacity: int = 1,
+    ) -> AvailabilitySchema:
+        if check_out_date <= check_in_date:
+            raise InvalidDateRange()
+
+        session = shard_router.for_hotel(session, hotel_id)
+        window = date_range(check_in_date, check_out_date)
+
+        # Свободный номер — без проживаний, пересекающихся с окном
+        occupied = exists().where(
+            Stay.room_id == Room.room_id,
+            date_range(Stay.check_in_date, Stay.check_out_date).op("&&")(window),
+        )
+        free_rooms = (
+            select(Room)
+            .where(Room.hotel_id == hotel_id, Room.capacity >= capacity, ~occupied)
+            .subquery()
+        )
+        free_room = aliased(Room, free_rooms)
+
+        # Брони на окно, по которым ещё нет заселения
+        pending = (
+            select(Booking.room_type_id, func.count().label("pending_bookings"))
+            .where(
+                Booking.hotel_id == hotel_id,
+                date_range(Booking.check_in_date, Booking.check_out_date).op("&&")(window),
+                ~exists().where(Stay.booking_id == Booking.booking_id),
+            )
+            .group_by(Booking.room_type_id)
+            .subquery()
+        )
+
+        query = (
+            select(RoomType, free_room, func.coalesce(pending.c.pending_bookings, 0))
+            .outerjoin(free_room, free_room.room_type_id == RoomType.room_type_id)
+            .outerjoin(pending, pending.c.room_type_id == RoomType.room_type_id)
+            .where(RoomType.hotel_id == hotel_id)
+            .order_by(RoomType.room_type_id, free_room.room_number)
+        )
+        result = await session.execute(query)
+
+        rooms = []
+        room_types = {}
+        for room_type, room, pending_bookings in result:
+            summary = room_types.get(room_type.room_type_id)
+            if summary is None:
+                summary = room_types[room_type.room_type_id] = RoomTypeAvailabilitySchema(
+                    room_type_id=room_type.room_type_id,
+                    room_type=room_type.room_type,
+                    price_per_night=room_type.price_per_night,
+                    capacity=room_type.capacity,
+                    free_rooms=0,
+                    pending_bookings=pending_bookings,
+                    remaining=0,
+                )
+            if room is not None:
+                rooms.append(RoomSchema.model_validate(obj=room))
+                summary.free_rooms += 1
+
+        for summary in room_types.values():
+            summary.remaining = max(summary.free_rooms - summary.pending_bookings, 0)
+
+        return AvailabilitySchema(
+            hotel_id=hotel_id,
+            check_in_date=check_in_date,
+            check_out_date=check_out_date,
+            rooms=rooms,
+            room_types=list(room_types.values()),
+        )
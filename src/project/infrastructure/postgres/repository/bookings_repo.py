@@ -1,91 +1,202 @@
+from datetime import date
+
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import Row, delete, insert, update
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.future import select
+from project.infrastructure.cache.occupancy import track_booking, track_booking_deleted
+from project.infrastructure.postgres.bulk import bulk_insert, check_references
+from project.infrastructure.postgres.errors import foreign_key_name, translate_integrity_error
+from project.infrastructure.postgres.shards import shard_router
+from project.infrastructure.postgres.inventory import release, reserve
+from project.infrastructure.postgres.locks import ROOM_TYPE_NIGHTS, lock_nights, retry_conflicts
+from project.infrastructure.postgres.rows import row_to_schema, rows_to_schemas, schema_columns
 from project.infrastructure.postgres.models import Booking, Client, RoomType, Hotel
-from project.schemas.bookings import BookingCreateUpdateSchema, BookingSchema
+from project.schemas.pagination import Page
+from project.schemas.bookings import BookingCreateUpdateSchema, BookingSchema, BookingSortField
 from project.core.exceptions import (
     ClientNotFound,
     RoomTypeNotFound,
     HotelNotFound,
     BookingNotFound,
     BookingAlreadyExists,
+    RoomTypeOverbooked,
 )
 
+# Существование клиента, типа комнаты и отеля проверяют внешние ключи в самом INSERT/UPDATE
+FOREIGN_KEY_ERRORS = {
+    foreign_key_name(Booking.client_id): ClientNotFound,
+    foreign_key_name(Booking.room_type_id): RoomTypeNotFound,
+    foreign_key_name(Booking.hotel_id): HotelNotFound,
+}
+
+BOOKING_COLUMNS = schema_columns(Booking, BookingSchema)
+
 
 class BookingsRepository:
-    async def check_connection(self, session: AsyncSession) -> bool:
-        try:
-            await session.execute(select(1))
-            return True
-        except Exception:
-            return False
-
-    async def get_all_bookings(self, session: AsyncSession) -> list[BookingSchema]:
-        result = await session.execute(select(Booking))
-        return [BookingSchema.model_validate(obj=booking) for booking in result.scalars().all()]
-
-    async def get_booking_by_id(self, session: AsyncSession, booking_id: int) -> Booking:
-        result = await session.execute(select(Booking).where(Booking.booking_id == booking_id))
-        booking = result.scalars().first()
-        if not booking:
+    async def get_all_bookings(
+        self,
+        session: AsyncSession,
+        limit: int,
+        cursor: str | None = None,
+        sort_by: BookingSortField = "booking_id",
+        descending: bool = False,
+        hotel_id: int | None = None,
+        client_id: int | None = None,
+        room_type_id: int | None = None,
+        check_in_from: date | None = None,
+        check_in_to: date | None = None,
+    ) -> Page[BookingSchema]:
+        query = select(*BOOKING_COLUMNS)
+        if hotel_id is not None:
+            query = query.where(Booking.hotel_id == hotel_id)
+        if client_id is not None:
+            query = query.where(Booking.client_id == client_id)
+        if room_type_id is not None:
+            query = query.where(Booking.room_type_id == room_type_id)
+        if check_in_from is not None:
+            query = query.where(Booking.check_in_date >= check_in_from)
+        if check_in_to is not None:
+            query = query.where(Booking.check_in_date <= check_in_to)
+
+        bookings, next_cursor = await shard_router.paginate(
+            session,
+            query,
+            pk_column=Booking.booking_id,
+            sort_column=getattr(Booking, sort_by),
+            sort_by=sort_by,
+            limit=limit,
+            cursor=cursor,
+            descending=descending,
+            hotel_id=hotel_id,
+        )
+        return Page[BookingSchema](
+            items=rows_to_schemas(BookingSchema, bookings),
+            next_cursor=next_cursor,
+        )
+
+    async def get_booking_by_id(self, session: AsyncSession, booking_id: int) -> BookingSchema:
+        row = await shard_router.first(session, select(*BOOKING_COLUMNS).where(Booking.booking_id == booking_id))
+        booking = row_to_schema(BookingSchema, row)
+        if booking is None:
             raise BookingNotFound()
         return booking
 
     async def create_booking(self, session: AsyncSession, booking: BookingCreateUpdateSchema) -> Booking:
-        # Проверяем, существует ли клиент
-        client_result = await session.execute(select(Client).where(Client.client_id == booking.client_id))
-        if not client_result.scalars().first():
-            raise ClientNotFound()
-
-        # Проверяем, существует ли тип комнаты
-        room_type_result = await session.execute(
-            select(RoomType).where(RoomType.room_type_id == booking.room_type_id)
-        )
-        if not room_type_result.scalars().first():
-            raise RoomTypeNotFound()
-
-        # Проверяем, существует ли отель
-        hotel_result = await session.execute(select(Hotel).where(Hotel.hotel_id == booking.hotel_id))
-        if not hotel_result.scalars().first():
-            raise HotelNotFound()
-
-        # Создаем новое бронирование
-        new_booking = Booking(
-            client_id=booking.client_id,
-            room_type_id=booking.room_type_id,
-            hotel_id=booking.hotel_id,
-            booking_date=booking.booking_date,
-            check_in_date=booking.check_in_date,
-            check_out_date=booking.check_out_date,
-        )
-        session.add(new_booking)
-        await session.commit()
-        await session.refresh(new_booking)
+        session = shard_router.for_hotel(session, booking.hotel_id)
+
+        async def write() -> Booking:
+            await lock_nights(
+                session, ROOM_TYPE_NIGHTS, [(booking.room_type_id, booking.check_in_date, booking.check_out_date)]
+            )
+            try:
+                new_booking = await session.scalar(
+                    insert(Booking).values(**booking.model_dump()).returning(Booking)
+                )
+            except IntegrityError as exc:
+                raise translate_integrity_error(exc, FOREIGN_KEY_ERRORS) from exc
+            if not await reserve(session, new_booking.room_type_id, new_booking.check_in_date, new_booking.check_out_date):
+                raise RoomTypeOverbooked()
+            return new_booking
+
+        new_booking = await retry_conflicts(session, write)
+        track_booking(session, new_booking)
         return new_booking
 
     async def update_booking(
         self, session: AsyncSession, booking_id: int, booking: BookingCreateUpdateSchema
     ) -> Booking:
-        result = await session.execute(select(Booking).where(Booking.booking_id == booking_id))
-        existing_booking = result.scalars().first()
-        if not existing_booking:
-            raise BookingNotFound()
+        session = await shard_router.locate_for_update(
+            session, select(Booking.booking_id).where(Booking.booking_id == booking_id), booking.hotel_id
+        )
 
-        existing_booking.client_id = booking.client_id
-        existing_booking.room_type_id = booking.room_type_id
-        existing_booking.hotel_id = booking.hotel_id
-        existing_booking.booking_date = booking.booking_date
-        existing_booking.check_in_date = booking.check_in_date
-        existing_booking.check_out_date = booking.check_out_date
+        async def write() -> Booking:
+            previous = await _lock_booking(session, booking_id)
+            await lock_nights(
+                session,
+                ROOM_TYPE_NIGHTS,
+                [tuple(previous), (booking.room_type_id, booking.check_in_date, booking.check_out_date)],
+            )
+            try:
+                result = await session.execute(
+                    update(Booking).where(Booking.booking_id == booking_id).values(**booking.model_dump()).returning(Booking)
+                )
+            except IntegrityError as exc:
+                raise translate_integrity_error(exc, FOREIGN_KEY_ERRORS) from exc
+            existing_booking = result.scalar_one()
+            # Сначала освобождаем старые ночи, чтобы сдвиг брони внутри заполненного типа прошёл
+            await release(session, *previous)
+            if not await reserve(
+                session, existing_booking.room_type_id, existing_booking.check_in_date, existing_booking.check_out_date
+            ):
+                raise RoomTypeOverbooked()
+            return existing_booking
 
-        await session.commit()
-        await session.refresh(existing_booking)
+        existing_booking = await retry_conflicts(session, write)
+        track_booking(session, existing_booking)
         return existing_booking
 
     async def delete_booking(self, session: AsyncSession, booking_id: int) -> None:
-        result = await session.execute(select(Booking).where(Booking.booking_id == booking_id))
-        booking = result.scalars().first()
-        if not booking:
-            raise BookingNotFound()
+        session = await shard_router.locate(session, select(Booking.booking_id).where(Booking.booking_id == booking_id))
+
+        async def write() -> None:
+            previous = await _lock_booking(session, booking_id)
+            await lock_nights(session, ROOM_TYPE_NIGHTS, [tuple(previous)])
+            await session.execute(delete(Booking).where(Booking.booking_id == booking_id))
+            await release(session, *previous)
+
+        await retry_conflicts(session, write)
+        track_booking_deleted(session, booking_id)
 
-        await session.delete(booking)
-        await session.commit()
+    async def bulk_create_bookings(
+        self, session: AsyncSession, bookings: dict[int, BookingCreateUpdateSchema]
+    ) -> tuple[dict[int, Booking], dict[int, list[str]]]:
+        created, errors = {}, {}
+        # Каждый шард проверяет ссылки и вставляет свою часть пакета
+        for shard_session, shard_bookings in shard_router.group_by_hotel(session, bookings).items():
+            shard_errors = await check_references(
+                shard_session,
+                shard_bookings,
+                [
+                    ("client_id", Client.client_id, ClientNotFound().message),
+                    ("room_type_id", RoomType.room_type_id, RoomTypeNotFound().message),
+                    ("hotel_id", Hotel.hotel_id, HotelNotFound().message),
+                ],
+            )
+            checked = {index: booking for index, booking in shard_bookings.items() if index not in shard_errors}
+
+            async def write() -> tuple[dict[int, Booking], dict[int, list[str]]]:
+                # Все ночи пакета блокируются одним запросом, чтобы пакеты не ждали друг друга по кругу
+                await lock_nights(
+                    shard_session,
+                    ROOM_TYPE_NIGHTS,
+                    [(booking.room_type_id, booking.check_in_date, booking.check_out_date) for booking in checked.values()],
+                )
+                valid, overbooked = {}, {}
+                for index, booking in checked.items():
+                    if await reserve(shard_session, booking.room_type_id, booking.check_in_date, booking.check_out_date):
+                        valid[index] = booking
+                    else:
+                        overbooked[index] = [f"room_type_id: {RoomTypeOverbooked().message}"]
+                return await bulk_insert(shard_session, Booking, valid), overbooked
+
+            shard_created, overbooked = await retry_conflicts(shard_session, write)
+            for booking in shard_created.values():
+                track_booking(shard_session, booking)
+            created |= shard_created
+            errors |= shard_errors | overbooked
+        return created, errors
+
+
+async def _lock_booking(session: AsyncSession, booking_id: int) -> Row:
+    """Блокирует строку брони и возвращает её (тип номера, заезд, выезд) до изменения."""
+    previous = (
+        await session.execute(
+            select(Booking.room_type_id, Booking.check_in_date, Booking.check_out_date)
+            .where(Booking.booking_id == booking_id)
+            .with_for_update()
+        )
+    ).first()
+    if previous is None:
+        raise BookingNotFound()
+    return previous
@@ -1,29 +1,51 @@
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import delete, insert, update
 from sqlalchemy.future import select
+from project.infrastructure.postgres.pagination import paginate
+from project.infrastructure.postgres.rows import row_to_schema, rows_to_schemas, schema_columns
 from project.infrastructure.postgres.models import Client
-from project.schemas.clients import ClientCreateUpdateSchema, ClientSchema
+from project.schemas.pagination import Page
+from project.schemas.clients import ClientCreateUpdateSchema, ClientSchema, ClientSortField
 from project.core.exceptions import ClientNotFound, ClientAlreadyExists
 
+CLIENT_COLUMNS = schema_columns(Client, ClientSchema)
 
-class ClientsRepository:
-    async def check_connection(self, session: AsyncSession) -> bool:
-        try:
-            await session.execute(select(1))
-            return True
-        except Exception:
-            return False
 
-    async def get_all_clients(self, session: AsyncSession) -> list[ClientSchema]:
-        result = await session.execute(select(Client))
+class ClientsRepository:
+    async def get_all_clients(
+        self,
+        session: AsyncSession,
+        limit: int,
+        cursor: str | None = None,
+        sort_by: ClientSortField = "client_id",
+        descending: bool = False,
+        email: str | None = None,
+    ) -> Page[ClientSchema]:
+        query = select(*CLIENT_COLUMNS)
+        if email is not None:
+            query = query.where(Client.email == email)
 
-        return [ClientSchema.model_validate(obj=client) for client in result.scalars().all()]
+        clients, next_cursor = await paginate(
+            session,
+            query,
+            pk_column=Client.client_id,
+            sort_column=getattr(Client, sort_by),
+            sort_by=sort_by,
+            limit=limit,
+            cursor=cursor,
+            descending=descending,
+        )
+        return Page[ClientSchema](
+            items=rows_to_schemas(ClientSchema, clients),
+            next_cursor=next_cursor,
+        )
 
     async def get_client(self, session: AsyncSession, client_id: int) -> ClientSchema:
-        result = await session.execute(select(Client).where(Client.client_id == client_id))
-        client = result.scalars().first()
-        if not client:
+        result = await session.execute(select(*CLIENT_COLUMNS).where(Client.client_id == client_id))
+        client = row_to_schema(ClientSchema, result.first())
+        if client is None:
             raise ClientNotFound()
-        return ClientSchema.model_validate(obj=client)
+        return client
     async def create_client(self, session: AsyncSession, client: ClientCreateUpdateSchema) -> Client:
         existing_client = await session.execute(
             select(Client).where(Client.email == client.email)
@@ -31,30 +53,21 @@ class ClientsRepository:
         if existing_client.scalars().first():
             raise ClientAlreadyExists()
 
-        new_client = Client(full_name=client.full_name, phone_number=client.phone_number, email=client.email)
-        session.add(new_client)
-        await session.commit()
-        await session.refresh(new_client)
+        new_client = await session.scalar(
+            insert(Client).values(**client.model_dump()).returning(Client)
+        )
         return new_client
 
     async def update_client(self, session: AsyncSession, client_id: int, client: ClientCreateUpdateSchema) -> Client:
-        result = await session.execute(select(Client).where(Client.client_id == client_id))
-        existing_client = result.scalars().first()
-        if not existing_client:
+        result = await session.execute(
+            update(Client).where(Client.client_id == client_id).values(**client.model_dump()).returning(Client)
+        )
+        existing_client = result.scalar_one_or_none()
+        if existing_client is None:
             raise ClientNotFound()
-
-        existing_client.full_name = client.full_name
-        existing_client.phone_number = client.phone_number
-        existing_client.email = client.email
-        await session.commit()
-        await session.refresh(existing_client)
         return existing_client
 
     async def delete_client(self, session: AsyncSession, client_id: int) -> None:
-        result = await session.execute(select(Client).where(Client.client_id == client_id))
-        client = result.scalars().first()
-        if not client:
+        result = await session.execute(delete(Client).where(Client.client_id == client_id))
+        if result.rowcount == 0:
             raise ClientNotFound()
-
-        await session.delete(client)
-        await session.commit()
@@ -0,0 +1,70 @@
+from typing import Any, AsyncIterator, Literal
+
+from sqlalchemy import Table, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from project.infrastructure.postgres.models import (
+    Booking,
+    Client,
+    Feedback,
+    Hotel,
+    PaymentType,
+    Room,
+    RoomType,
+    Service,
+    ServiceUsage,
+    Stay,
+)
+from project.infrastructure.postgres.shards import MAIN_SHARD, is_sharded, shard_router
+
+ExportEntity = Literal[
+    "bookings",
+    "stays",
+    "clients",
+    "hotels",
+    "rooms",
+    "room_types",
+    "services",
+    "service_usage",
+    "feedback",
+    "payment_types",
+]
+
+EXPORT_MODELS = {
+    "bookings": Booking,
+    "stays": Stay,
+    "clients": Client,
+    "hotels": Hotel,
+    "rooms": Room,
+    "room_types": RoomType,
+    "services": Service,
+    "service_usage": ServiceUsage,
+    "feedback": Feedback,
+    "payment_types": PaymentType,
+}
+
+
+class ExportRepository:
+    def get_table(self, entity: ExportEntity) -> Table:
+        return EXPORT_MODELS[entity].__table__
+
+    def get_columns(self, entity: ExportEntity) -> list[str]:
+        return [column.key for column in EXPORT_MODELS[entity].__table__.columns]
+
+    async def stream_rows(
+        self, session: AsyncSession, entity: ExportEntity, batch_size: int
+    ) -> AsyncIterator[list[tuple[Any, ...]]]:
+        """Отдаёт строки таблицы пачками через серверный курсор.
+
+        В памяти воркера одновременно находится не больше одной пачки, ORM-объекты не создаются.
+        Таблицы отелей при шардировании выгружаются из шардов по очереди.
+        """
+        table = EXPORT_MODELS[entity].__table__
+        query = select(*table.columns).order_by(*table.primary_key.columns)
+        shards = shard_router.names if is_sharded(entity) else [MAIN_SHARD]
+        for shard in shards:
+            result = await shard_router.session_of(session, shard).stream(
+                query, execution_options={"yield_per": batch_size}
+            )
+            async for partition in result.partitions():
+                yield partition
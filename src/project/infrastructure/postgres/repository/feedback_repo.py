@@ -1,30 +1,54 @@
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import delete, insert, update
 from sqlalchemy.future import select
+from project.infrastructure.postgres.shards import shard_router
 from project.infrastructure.postgres.models import Feedback
-from project.schemas.feedback import FeedbackCreateUpdateSchema, FeedbackSchema
+from project.schemas.pagination import Page
+from project.schemas.feedback import FeedbackCreateUpdateSchema, FeedbackSchema, FeedbackSortField
 from project.core.exceptions import FeedbackNotFound, FeedbackAlreadyExists
 
 
 class FeedbackRepository:
-    async def check_connection(self, session: AsyncSession) -> bool:
-        try:
-            await session.execute(select(1))
-            return True
-        except Exception:
-            return False
+    async def get_all_feedbacks(
+        self,
+        session: AsyncSession,
+        limit: int,
+        cursor: str | None = None,
+        sort_by: FeedbackSortField = "feedback_id",
+        descending: bool = False,
+        hotel_id: int | None = None,
+        stay_id: int | None = None,
+    ) -> Page[FeedbackSchema]:
+        query = select(Feedback)
+        if hotel_id is not None:
+            query = query.where(Feedback.hotel_id == hotel_id)
+        if stay_id is not None:
+            query = query.where(Feedback.stay_id == stay_id)
 
-    async def get_all_feedbacks(self, session: AsyncSession) -> list[FeedbackSchema]:
-        result = await session.execute(select(Feedback))
-        return [FeedbackSchema.model_validate(obj=feedback) for feedback in result.scalars().all()]
+        feedbacks, next_cursor = await shard_router.paginate(
+            session,
+            query,
+            pk_column=Feedback.feedback_id,
+            sort_column=getattr(Feedback, sort_by),
+            sort_by=sort_by,
+            limit=limit,
+            cursor=cursor,
+            descending=descending,
+            hotel_id=hotel_id,
+        )
+        return Page[FeedbackSchema](
+            items=[FeedbackSchema.model_validate(obj=feedback) for feedback in feedbacks],
+            next_cursor=next_cursor,
+        )
 
     async def get_feedback_by_id(self, session: AsyncSession, feedback_id: int) -> FeedbackSchema:
-        result = await session.execute(select(Feedback).where(Feedback.feedback_id == feedback_id))
-        feedback = result.scalars().first()
-        if not feedback:
+        row = await shard_router.first(session, select(Feedback).where(Feedback.feedback_id == feedback_id))
+        if not row:
             raise FeedbackNotFound()
-        return FeedbackSchema.model_validate(obj=feedback)
+        return FeedbackSchema.model_validate(obj=row[0])
 
     async def create_feedback(self, session: AsyncSession, feedback: FeedbackCreateUpdateSchema) -> Feedback:
+        session = shard_router.for_hotel(session, feedback.hotel_id)
         existing_feedback = await session.execute(
             select(Feedback).where(
                 Feedback.hotel_id == feedback.hotel_id,
@@ -34,38 +58,29 @@ class FeedbackRepository:
         if existing_feedback.scalars().first():
             raise FeedbackAlreadyExists()
 
-        new_feedback = Feedback(
-            hotel_id=feedback.hotel_id,
-            stay_id=feedback.stay_id,
-            name=feedback.name,
-            address=feedback.address,
+        new_feedback = await session.scalar(
+            insert(Feedback).values(**feedback.model_dump()).returning(Feedback)
         )
-        session.add(new_feedback)
-        await session.commit()
-        await session.refresh(new_feedback)
         return new_feedback
 
     async def update_feedback(
         self, session: AsyncSession, feedback_id: int, feedback: FeedbackCreateUpdateSchema
     ) -> Feedback:
-        result = await session.execute(select(Feedback).where(Feedback.feedback_id == feedback_id))
-        existing_feedback = result.scalars().first()
-        if not existing_feedback:
+        session = await shard_router.locate_for_update(
+            session, select(Feedback.feedback_id).where(Feedback.feedback_id == feedback_id), feedback.hotel_id
+        )
+        result = await session.execute(
+            update(Feedback).where(Feedback.feedback_id == feedback_id).values(**feedback.model_dump()).returning(Feedback)
+        )
+        existing_feedback = result.scalar_one_or_none()
+        if existing_feedback is None:
             raise FeedbackNotFound()
-
-        existing_feedback.hotel_id = feedback.hotel_id
-        existing_feedback.stay_id = feedback.stay_id
-        existing_feedback.name = feedback.name
-        existing_feedback.address = feedback.address
-        await session.commit()
-        await session.refresh(existing_feedback)
         return existing_feedback
 
     async def delete_feedback(self, session: AsyncSession, feedback_id: int) -> None:
-        result = await session.execute(select(Feedback).where(Feedback.feedback_id == feedback_id))
-        feedback = result.scalars().first()
-        if not feedback:
+        session = await shard_router.locate(
+            session, select(Feedback.feedback_id).where(Feedback.feedback_id == feedback_id)
+        )
+        result = await session.execute(delete(Feedback).where(Feedback.feedback_id == feedback_id))
+        if result.rowcount == 0:
             raise FeedbackNotFound()
-
-        await session.delete(feedback)
-        await session.commit()
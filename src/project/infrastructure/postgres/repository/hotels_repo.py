@@ -1,29 +1,58 @@
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import delete, insert, update
 from sqlalchemy.future import select
+from project.infrastructure.cache.reference import reference_cache
+from project.infrastructure.postgres.pagination import paginate
 from project.infrastructure.postgres.models import Hotel
-from project.schemas.hotels import HotelCreateUpdateSchema, HotelSchema
+from project.schemas.pagination import Page
+from project.schemas.hotels import HotelCreateUpdateSchema, HotelSchema, HotelSortField
 from project.core.exceptions import HotelNotFound, HotelAlreadyExists
 
+hotels_cache = reference_cache("hotels")
+
 
 class HotelsRepository:
-    async def check_connection(self, session: AsyncSession) -> bool:
-        try:
-            await session.execute(select(1))
-            return True
-        except Exception:
-            return False
-
-    async def get_all_hotels(self, session: AsyncSession) -> list[HotelSchema]:
-        result = await session.execute(select(Hotel))
-        return [HotelSchema.model_validate(obj=hotel) for hotel in result.scalars().all()]
-
-    async def get_hotel(self, session: AsyncSession, hotel_id: int) -> Hotel:
+    async def get_all_hotels(
+        self,
+        session: AsyncSession,
+        limit: int,
+        cursor: str | None = None,
+        sort_by: HotelSortField = "hotel_id",
+        descending: bool = False,
+        name: str | None = None,
+    ) -> Page[HotelSchema]:
+        async def load(session: AsyncSession) -> Page[HotelSchema]:
+            query = select(Hotel)
+            if name is not None:
+                query = query.where(Hotel.name == name)
+
+            hotels, next_cursor = await paginate(
+                session,
+                query,
+                pk_column=Hotel.hotel_id,
+                sort_column=getattr(Hotel, sort_by),
+                sort_by=sort_by,
+                limit=limit,
+                cursor=cursor,
+                descending=descending,
+            )
+            return Page[HotelSchema](
+                items=[HotelSchema.model_validate(obj=hotel) for hotel in hotels],
+                next_cursor=next_cursor,
+            )
+
+        key = ("page", limit, cursor, sort_by, descending, name)
+        return await hotels_cache.get_or_load(session, key, load)
+
+    async def get_hotel(self, session: AsyncSession, hotel_id: int) -> HotelSchema:
         """Добавленный метод для получения отеля по ID"""
-        result = await session.execute(select(Hotel).where(Hotel.hotel_id == hotel_id))
-        hotel = result.scalars().first()
-        if not hotel:
-            raise HotelNotFound()
-        return hotel
+        async def load(session: AsyncSession) -> HotelSchema:
+            hotel = await session.get(Hotel, hotel_id)
+            if hotel is None:
+                raise HotelNotFound()
+            return HotelSchema.model_validate(obj=hotel)
+
+        return await hotels_cache.get_or_load(session, hotel_id, load)
 
     async def create_hotel(self, session: AsyncSession, hotel: HotelCreateUpdateSchema) -> Hotel:
         existing_hotel = await session.execute(
@@ -32,29 +61,24 @@ class HotelsRepository:
         if existing_hotel.scalars().first():
             raise HotelAlreadyExists()
 
-        new_hotel = Hotel(name=hotel.name, address=hotel.address)
-        session.add(new_hotel)
-        await session.commit()
-        await session.refresh(new_hotel)
+        new_hotel = await session.scalar(
+            insert(Hotel).values(**hotel.model_dump()).returning(Hotel)
+        )
+        hotels_cache.clear_on_commit(session)
         return new_hotel
 
     async def update_hotel(self, session: AsyncSession, hotel_id: int, hotel: HotelCreateUpdateSchema) -> Hotel:
-        result = await session.execute(select(Hotel).where(Hotel.hotel_id == hotel_id))
-        existing_hotel = result.scalars().first()
-        if not existing_hotel:
+        result = await session.execute(
+            update(Hotel).where(Hotel.hotel_id == hotel_id).values(**hotel.model_dump()).returning(Hotel)
+        )
+        existing_hotel = result.scalar_one_or_none()
+        if existing_hotel is None:
             raise HotelNotFound()
-
-        existing_hotel.name = hotel.name
-        existing_hotel.address = hotel.address
-        await session.commit()
-        await session.refresh(existing_hotel)
+        hotels_cache.clear_on_commit(session)
         return existing_hotel
 
     async def delete_hotel(self, session: AsyncSession, hotel_id: int) -> None:
-        result = await session.execute(select(Hotel).where(Hotel.hotel_id == hotel_id))
-        hotel = result.scalars().first()
-        if not hotel:
+        result = await session.execute(delete(Hotel).where(Hotel.hotel_id == hotel_id))
+        if result.rowcount == 0:
             raise HotelNotFound()
-
-        await session.delete(hotel)
-        await session.commit()
+        hotels_cache.clear_on_commit(session)
@@ -0,0 +1,108 @@
+from collections import defaultdict
+from datetime import date
+from typing import Iterable, NamedTuple
+
+from sqlalchemy import func
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+from project.infrastructure.postgres.models import Booking, Room, RoomType
+from project.infrastructure.postgres.repository.availability_repo import date_range
+from project.infrastructure.postgres.shards import shard_router
+from project.schemas.overbooking import OverbookingReportSchema, OversoldPeriodSchema, RoomTypeOverbookingSchema
+from project.core.exceptions import InvalidDateRange
+
+
+class Sweep(NamedTuple):
+    peak: int
+    peak_date: date | None
+    # (начало, конец, наибольшее число броней) для ночей, где броней больше `rooms`
+    oversold: list[tuple[date, date, int]]
+
+
+def sweep(intervals: Iterable[tuple[date, date]], rooms: int) -> Sweep:
+    """Пик одновременных интервалов [заезд, выезд) и отрезки перепродажи за O(n log n).
+
+    Каждый интервал — два события (+1 в день заезда, -1 в день выезда); после сортировки
+    события одной даты применяются вместе, так что выезд и заезд в один день не
+    складываются. Число броней постоянно от даты события до следующей.
+    """
+    events = defaultdict(int)
+    for check_in_date, check_out_date in intervals:
+        if check_in_date < check_out_date:
+            events[check_in_date] += 1
+            events[check_out_date] -= 1
+
+    current = peak = 0
+    peak_date = None
+    oversold = []
+    start = None
+    most = 0
+    for day in sorted(events):
+        current += events[day]
+        if current > peak:
+            peak, peak_date = current, day
+        if current > rooms:
+            if start is None:
+                start, most = day, current
+            most = max(most, current)
+        elif start is not None:
+            oversold.append((start, day, most))
+            start = None
+    return Sweep(peak, peak_date, oversold)
+
+
+class OverbookingRepository:
+    async def get_report(
+        self, session: AsyncSession, hotel_id: int, date_from: date, date_to: date
+    ) -> OverbookingReportSchema:
+        if date_to <= date_from:
+            raise InvalidDateRange("to must be later than from")
+
+        session = shard_router.for_hotel(session, hotel_id)
+        rooms = (
+            select(Room.room_type_id, func.count().label("rooms"))
+            .where(Room.hotel_id == hotel_id)
+            .group_by(Room.room_type_id)
+            .subquery()
+        )
+        room_types = await session.execute(
+            select(RoomType.room_type_id, RoomType.room_type, func.coalesce(rooms.c.rooms, 0))
+            .outerjoin(rooms, rooms.c.room_type_id == RoomType.room_type_id)
+            .where(RoomType.hotel_id == hotel_id)
+            .order_by(RoomType.room_type_id)
+        )
+        bookings = await session.execute(
+            select(Booking.room_type_id, Booking.check_in_date, Booking.check_out_date).where(
+                Booking.hotel_id == hotel_id,
+                date_range(Booking.check_in_date, Booking.check_out_date).op("&&")(date_range(date_from, date_to)),
+            )
+        )
+        # Брони обрезаются по окну, чтобы пик и отрезки не выходили за его границы
+        intervals = defaultdict(list)
+        for room_type_id, check_in_date, check_out_date in bookings:
+            intervals[room_type_id].append((max(check_in_date, date_from), min(check_out_date, date_to)))
+
+        summaries = []
+        for room_type_id, room_type, room_count in room_types:
+            result = sweep(intervals[room_type_id], room_count)
+            summaries.append(
+                RoomTypeOverbookingSchema(
+                    room_type_id=room_type_id,
+                    room_type=room_type,
+                    rooms=room_count,
+                    peak_bookings=result.peak,
+                    peak_date=result.peak_date,
+                    oversold=[
+                        OversoldPeriodSchema(start_date=start, end_date=end, bookings=count)
+                        for start, end, count in result.oversold
+                    ],
+                )
+            )
+
+        return OverbookingReportSchema(
+            hotel_id=hotel_id,
+            date_from=date_from,
+            date_to=date_to,
+            oversold=any(summary.oversold for summary in summaries),
+            room_types=summaries,
+        )
@@ -1,22 +1,55 @@
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import delete, insert, update
 from sqlalchemy.future import select
 
+from project.infrastructure.cache.reference import reference_cache
+from project.infrastructure.postgres.pagination import paginate
 from project.infrastructure.postgres.models import PaymentType
-from project.schemas.payment_types import PaymentTypeCreateUpdateSchema, PaymentTypeSchema
+from project.schemas.pagination import Page
+from project.schemas.payment_types import PaymentTypeCreateUpdateSchema, PaymentTypeSchema, PaymentTypeSortField
 from project.core.exceptions import PaymentTypeNotFound, PaymentTypeAlreadyExists
 
+payment_types_cache = reference_cache("payment_types")
+
 
 class PaymentTypesRepository:
-    async def check_connection(self, session: AsyncSession) -> bool:
-        try:
-            await session.execute(select(1))
-            return True
-        except Exception:
-            return False
+    async def get_all_payment_types(
+        self,
+        session: AsyncSession,
+        limit: int,
+        cursor: str | None = None,
+        sort_by: PaymentTypeSortField = "type_payment_id",
+        descending: bool = False,
+    ) -> Page[PaymentTypeSchema]:
+        async def load(session: AsyncSession) -> Page[PaymentTypeSchema]:
+            query = select(PaymentType)
+
+            payment_types, next_cursor = await paginate(
+                session,
+                query,
+                pk_column=PaymentType.type_payment_id,
+                sort_column=getattr(PaymentType, sort_by),
+                sort_by=sort_by,
+                limit=limit,
+                cursor=cursor,
+                descending=descending,
+            )
+            return Page[PaymentTypeSchema](
+                items=[PaymentTypeSchema.model_validate(obj=payment_type) for payment_type in payment_types],
+                next_cursor=next_cursor,
+            )
+
+        key = ("page", limit, cursor, sort_by, descending)
+        return await payment_types_cache.get_or_load(session, key, load)
+
+    async def get_payment_type_by_id(self, session: AsyncSession, type_payment_id: int) -> PaymentTypeSchema:
+        async def load(session: AsyncSession) -> PaymentTypeSchema:
+            payment_type = await session.get(PaymentType, type_payment_id)
+            if payment_type is None:
+                raise PaymentTypeNotFound()
+            return PaymentTypeSchema.model_validate(obj=payment_type)
 
-    async def get_all_payment_types(self, session: AsyncSession) -> list[PaymentTypeSchema]:
-        result = await session.execute(select(PaymentType))
-        return [PaymentTypeSchema.model_validate(obj=payment_type) for payment_type in result.scalars().all()]
+        return await payment_types_cache.get_or_load(session, type_payment_id, load)
 
     async def create_payment_type(self, session: AsyncSession, payment_type: PaymentTypeCreateUpdateSchema) -> PaymentType:
         existing_payment_type = await session.execute(
@@ -25,28 +58,24 @@ class PaymentTypesRepository:
         if existing_payment_type.scalars().first():
             raise PaymentTypeAlreadyExists()
 
-        new_payment_type = PaymentType(name_payment=payment_type.name_payment)
-        session.add(new_payment_type)
-        await session.commit()
-        await session.refresh(new_payment_type)
+        new_payment_type = await session.scalar(
+            insert(PaymentType).values(**payment_type.model_dump()).returning(PaymentType)
+        )
+        payment_types_cache.clear_on_commit(session)
         return new_payment_type
 
     async def update_payment_type(self, session: AsyncSession, type_payment_id: int, payment_type: PaymentTypeCreateUpdateSchema) -> PaymentType:
-        result = await session.execute(select(PaymentType).where(PaymentType.type_payment_id == type_payment_id))
-        existing_payment_type = result.scalars().first()
-        if not existing_payment_type:
+        result = await session.execute(
+            update(PaymentType).where(PaymentType.type_payment_id == type_payment_id).values(**payment_type.model_dump()).returning(PaymentType)
+        )
+        existing_payment_type = result.scalar_one_or_none()
+        if existing_payment_type is None:
             raise PaymentTypeNotFound()
-
-        existing_payment_type.name_payment = payment_type.name_payment
-        await session.commit()
-        await session.refresh(existing_payment_type)
+        payment_types_cache.clear_on_commit(session)
         return existing_payment_type
 
     async def delete_payment_type(self, session: AsyncSession, type_payment_id: int) -> None:
-        result = await session.execute(select(PaymentType).where(PaymentType.type_payment_id == type_payment_id))
-        payment_type = result.scalars().first()
-        if not payment_type:
+        result = await session.execute(delete(PaymentType).where(PaymentType.type_payment_id == type_payment_id))
+        if result.rowcount == 0:
             raise PaymentTypeNotFound()
-
-        await session.delete(payment_type)
-        await session.commit()
+        payment_types_cache.clear_on_commit(session)
@@ -1,28 +1,76 @@
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import delete, insert, update
 from sqlalchemy.future import select
+from project.infrastructure.cache.occupancy import track_room
+from project.infrastructure.cache.singleflight import single_flight
+from project.infrastructure.cache.snapshot import reference_snapshot
+from project.infrastructure.postgres.inventory import change_capacity
+from project.infrastructure.postgres.locks import retry_conflicts
+from project.infrastructure.postgres.shards import shard_router
+from project.infrastructure.postgres.rows import row_to_schema, rows_to_schemas, schema_columns
 from project.infrastructure.postgres.models import Room
-from project.schemas.rooms import RoomCreateUpdateSchema, RoomSchema
+from project.schemas.pagination import Page
+from project.schemas.rooms import RoomCreateUpdateSchema, RoomSchema, RoomSortField
 from project.core.exceptions import RoomNotFound, RoomAlreadyExists, RoomCapacity, RoomPerPrice,ForeignKeyConstraintViolation
 from sqlalchemy.exc import IntegrityError
 
+# Номера не кешируются (их читает снимок), но одновременные одинаковые запросы склеиваем
+rooms_flight = single_flight("rooms")
+
+ROOM_COLUMNS = schema_columns(Room, RoomSchema)
 
 
 class RoomsRepository:
-    async def check_connection(self, session: AsyncSession) -> bool:
-        try:
-            await session.execute(select(1))
-            return True
-        except Exception:
-            return False
-
-    async def get_all_rooms(self, session: AsyncSession) -> list[RoomSchema]:
-        result = await session.execute(select(Room).where(Room.capacity >= 1))
-        return [RoomSchema.model_validate(obj=room) for room in result.scalars().all()]
-    async def get_room_by_id(self, session: AsyncSession, room_id: int) -> Room:
-        result = await session.execute(select(Room).where(Room.room_id == room_id))
-        room = result.scalars().first()
-        if not room:
-            raise RoomNotFound()
+    async def get_all_rooms(
+        self,
+        session: AsyncSession,
+        limit: int,
+        cursor: str | None = None,
+        sort_by: RoomSortField = "room_id",
+        descending: bool = False,
+        hotel_id: int | None = None,
+        room_type_id: int | None = None,
+        min_capacity: int | None = None,
+    ) -> Page[RoomSchema]:
+        async def load(session: AsyncSession) -> Page[RoomSchema]:
+            query = select(*ROOM_COLUMNS).where(Room.capacity >= 1)
+            if hotel_id is not None:
+                query = query.where(Room.hotel_id == hotel_id)
+            if room_type_id is not None:
+                query = query.where(Room.room_type_id == room_type_id)
+            if min_capacity is not None:
+                query = query.where(Room.capacity >= min_capacity)
+
+            rooms, next_cursor = await shard_router.paginate(
+                session,
+                query,
+                pk_column=Room.room_id,
+                sort_column=getattr(Room, sort_by),
+                sort_by=sort_by,
+                limit=limit,
+                cursor=cursor,
+                descending=descending,
+                hotel_id=hotel_id,
+            )
+            return Page[RoomSchema](
+                items=rows_to_schemas(RoomSchema, rooms),
+                next_cursor=next_cursor,
+            )
+
+        key = ("page", limit, cursor, sort_by, descending, hotel_id, room_type_id, min_capacity)
+        return await rooms_flight.do(session, key, load)
+
+    async def get_room_by_id(self, session: AsyncSession, room_id: int) -> RoomSchema:
+        async def load(session: AsyncSession) -> RoomSchema:
+            row = await shard_router.first(session, select(*ROOM_COLUMNS).where(Room.room_id == room_id))
+            room = row_to_schema(RoomSchema, row)
+            if room is None:
+                raise RoomNotFound()
+            return room
+
+        room = reference_snapshot.get_room(room_id)
+        if room is None:
+            room = await rooms_flight.do(session, room_id, load)
         return room
 
     async def create_room(self, session: AsyncSession, room: RoomCreateUpdateSchema) -> Room:
@@ -35,30 +83,23 @@ class RoomsRepository:
             raise RoomPerPrice()
 
         # Проверка на существование номера
-        existing_room = await session.execute(
-            select(Room).where(Room.room_number == room.room_number)
+        existing_room = await shard_router.first(
+            session, select(Room.room_id).where(Room.room_number == room.room_number)
         )
-        if existing_room.scalars().first():
+        if existing_room is not None:
             raise RoomAlreadyExists()
 
-        new_room = Room(
-            hotel_id=room.hotel_id,
-            room_type_id=room.room_type_id,
-            room_number=room.room_number,
-            price_per_night=room.price_per_night,
-            capacity=room.capacity,
+        session = shard_router.for_hotel(session, room.hotel_id)
+        new_room = await session.scalar(
+            insert(Room).values(**room.model_dump()).returning(Room)
         )
-        session.add(new_room)
-        await session.commit()
-        await session.refresh(new_room)
+        # Журнал типа обновляется целиком под блокировкой строки типа, без блокировок по ночам
+        await retry_conflicts(session, lambda: change_capacity(session, new_room.room_type_id, 1))
+        rooms_flight.forget_on_commit(session)
+        track_room(session, new_room.room_id, new_room.hotel_id)
         return new_room
 
     async def update_room(self, session: AsyncSession, room_id: int, room: RoomCreateUpdateSchema) -> Room:
-        result = await session.execute(select(Room).where(Room.room_id == room_id))
-        existing_room = result.scalars().first()
-        if not existing_room:
-            raise RoomNotFound()
-
         # Проверка capacity
         if room.capacity < 1:
             raise RoomCapacity()
@@ -67,26 +108,43 @@ class RoomsRepository:
         if room.price_per_night < 1:
             raise RoomPerPrice()
 
-        existing_room.hotel_id = room.hotel_id
-        existing_room.room_type_id = room.room_type_id
-        existing_room.room_number = room.room_number
-        existing_room.price_per_night = room.price_per_night
-        existing_room.capacity = room.capacity
+        session = await shard_router.locate_for_update(
+            session, select(Room.room_id).where(Room.room_id == room_id), room.hotel_id
+        )
+        previous_type_id = await session.scalar(
+            select(Room.room_type_id).where(Room.room_id == room_id).with_for_update()
+        )
+        if previous_type_id is None:
+            raise RoomNotFound()
+        result = await session.execute(
+            update(Room).where(Room.room_id == room_id).values(**room.model_dump()).returning(Room)
+        )
+        existing_room = result.scalar_one()
+        if existing_room.room_type_id != previous_type_id:
+            async def move() -> None:
+                # Типы блокируются по возрастанию id, чтобы встречные переносы не ждали друг друга
+                changes = {previous_type_id: -1, existing_room.room_type_id: 1}
+                for room_type_id in sorted(changes):
+                    await change_capacity(session, room_type_id, changes[room_type_id])
 
-        await session.commit()
-        await session.refresh(existing_room)
+            await retry_conflicts(session, move)
+        rooms_flight.forget_on_commit(session)
+        track_room(session, existing_room.room_id, existing_room.hotel_id)
         return existing_room
 
     async def delete_room(self, session: AsyncSession, room_id: int) -> None:
-        result = await session.execute(select(Room).where(Room.room_id == room_id))
-        room = result.scalars().first()
-        if not room:
-            raise RoomNotFound()
-
+        session = await shard_router.locate(session, select(Room.room_id).where(Room.room_id == room_id))
         try:
-            await session.delete(room)
-            await session.commit()
+            result = await session.execute(
+                delete(Room).where(Room.room_id == room_id).returning(Room.room_type_id)
+            )
         except IntegrityError as exc:
             raise ForeignKeyConstraintViolation(
                 f"Unable to delete room with ID {room_id} because it is referenced by another record."
-            ) from exc
\ No newline at end of file
+            ) from exc
+        room_type_id = result.scalar_one_or_none()
+        if room_type_id is None:
+            raise RoomNotFound()
+        await retry_conflicts(session, lambda: change_capacity(session, room_type_id, -1))
+        rooms_flight.forget_on_commit(session)
+        track_room(session, room_id)
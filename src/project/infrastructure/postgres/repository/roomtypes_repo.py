@@ -1,22 +1,67 @@
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import delete, insert, update
 from sqlalchemy.future import select
 
+from project.infrastructure.cache.occupancy import track_room_type
+from project.infrastructure.cache.reference import reference_cache
+from project.infrastructure.cache.snapshot import reference_snapshot
+from project.infrastructure.postgres.shards import shard_router
 from project.infrastructure.postgres.models import RoomType
-from project.schemas.roomtypes import RoomTypeCreateUpdateSchema, RoomTypeSchema
+from project.schemas.pagination import Page
+from project.schemas.roomtypes import RoomTypeCreateUpdateSchema, RoomTypeSchema, RoomTypeSortField
 from project.core.exceptions import RoomNotFound, RoomAlreadyExists,RoomCapacity,RoomPerPrice,RoomTypeNotFound
 
+roomtypes_cache = reference_cache("room_types")
+
 
 class RoomTypesRepository:
-    async def check_connection(self, session: AsyncSession) -> bool:
-        try:
-            await session.execute(select(1))
-            return True
-        except Exception:
-            return False
+    async def get_all_roomtypes(
+        self,
+        session: AsyncSession,
+        limit: int,
+        cursor: str | None = None,
+        sort_by: RoomTypeSortField = "room_type_id",
+        descending: bool = False,
+        hotel_id: int | None = None,
+        min_capacity: int | None = None,
+    ) -> Page[RoomTypeSchema]:
+        async def load(session: AsyncSession) -> Page[RoomTypeSchema]:
+            query = select(RoomType).where(RoomType.capacity >= 1)
+            if hotel_id is not None:
+                query = query.where(RoomType.hotel_id == hotel_id)
+            if min_capacity is not None:
+                query = query.where(RoomType.capacity >= min_capacity)
+
+            roomtypes, next_cursor = await shard_router.paginate(
+                session,
+                query,
+                pk_column=RoomType.room_type_id,
+                sort_column=getattr(RoomType, sort_by),
+                sort_by=sort_by,
+                limit=limit,
+                cursor=cursor,
+                descending=descending,
+                hotel_id=hotel_id,
+            )
+            return Page[RoomTypeSchema](
+                items=[RoomTypeSchema.model_validate(obj=room_type) for room_type in roomtypes],
+                next_cursor=next_cursor,
+            )
+
+        key = ("page", limit, cursor, sort_by, descending, hotel_id, min_capacity)
+        return await roomtypes_cache.get_or_load(session, key, load)
 
-    async def get_all_roomtypes(self, session: AsyncSession) -> list[RoomTypeSchema]:
-        result = await session.execute(select(RoomType).where(RoomType.capacity >= 1))
-        return [RoomTypeSchema.model_validate(obj=room_type) for room_type in result.scalars().all()]
+    async def get_roomtype_by_id(self, session: AsyncSession, room_type_id: int) -> RoomTypeSchema:
+        async def load(session: AsyncSession) -> RoomTypeSchema:
+            row = await shard_router.first(session, select(RoomType).where(RoomType.room_type_id == room_type_id))
+            if row is None:
+                raise RoomTypeNotFound()
+            return RoomTypeSchema.model_validate(obj=row[0])
+
+        roomtype = reference_snapshot.get_roomtype(room_type_id)
+        if roomtype is None:
+            roomtype = await roomtypes_cache.get_or_load(session, room_type_id, load)
+        return roomtype
 
     async def create_roomtype(self, session: AsyncSession, roomtype: RoomTypeCreateUpdateSchema) -> RoomType:
         # Проверка вместимости (capacity)
@@ -28,43 +73,34 @@ class RoomTypesRepository:
             raise RoomPerPrice()
 
         # Создание нового типа комнаты
-        new_roomtype = RoomType(
-            hotel_id=roomtype.hotel_id,
-            room_number=roomtype.room_number,
-            room_type=roomtype.room_type,
-            price_per_night=roomtype.price_per_night,
-            capacity=roomtype.capacity,
+        session = shard_router.for_hotel(session, roomtype.hotel_id)
+        new_roomtype = await session.scalar(
+            insert(RoomType).values(**roomtype.model_dump()).returning(RoomType)
         )
-        session.add(new_roomtype)
-        await session.commit()
-        await session.refresh(new_roomtype)
+        track_room_type(session, new_roomtype.room_type_id, new_roomtype.hotel_id)
+        roomtypes_cache.clear_on_commit(session)
         return new_roomtype
 
-    async def get_all_roomtypes(self, session: AsyncSession) -> list[RoomType]:
-        result = await session.execute(select(RoomType))
-        return result.scalars().all()
-
     async def update_roomtype(self, session: AsyncSession, room_type_id: int, roomtype: RoomTypeCreateUpdateSchema) -> RoomType:
-        result = await session.execute(select(RoomType).where(RoomType.room_type_id == room_type_id))
-        existing_roomtype = result.scalars().first()
-        if not existing_roomtype:
-            raise RoomNotFound()
-
-        existing_roomtype.hotel_id = roomtype.hotel_id
-        existing_roomtype.room_number = roomtype.room_number
-        existing_roomtype.room_type = roomtype.room_type
-        existing_roomtype.price_per_night = roomtype.price_per_night
-        existing_roomtype.capacity = roomtype.capacity
-        await session.commit()
-        await session.refresh(existing_roomtype)
+        session = await shard_router.locate_for_update(
+            session, select(RoomType.room_type_id).where(RoomType.room_type_id == room_type_id), roomtype.hotel_id
+        )
+        result = await session.execute(
+            update(RoomType).where(RoomType.room_type_id == room_type_id).values(**roomtype.model_dump()).returning(RoomType)
+        )
+        existing_roomtype = result.scalar_one_or_none()
+        if existing_roomtype is None:
+            raise RoomTypeNotFound()
+        track_room_type(session, existing_roomtype.room_type_id, existing_roomtype.hotel_id)
+        roomtypes_cache.clear_on_commit(session)
         return existing_roomtype
 
     async def delete_roomtype(self, session: AsyncSession, room_type_id: int) -> None:
-        result = await session.execute(select(RoomType).where(RoomType.room_type_id == room_type_id))
-        room_type = result.scalars().first()
-
-        if not room_type:
+        session = await shard_router.locate(
+            session, select(RoomType.room_type_id).where(RoomType.room_type_id == room_type_id)
+        )
+        result = await session.execute(delete(RoomType).where(RoomType.room_type_id == room_type_id))
+        if result.rowcount == 0:
             raise RoomTypeNotFound()
-
-        await session.delete(room_type)
-        await session.commit()
+        track_room_type(session, room_type_id)
+        roomtypes_cache.clear_on_commit(session)
@@ -1,70 +1,111 @@
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import delete, insert, update
 from sqlalchemy.future import select
 
-from project.infrastructure.postgres.models import ServiceUsage
-from project.schemas.service_usage import ServiceUsageCreateUpdateSchema, ServiceUsageSchema
-from project.core.exceptions import ServiceUsageNotFound
+from project.infrastructure.postgres.bulk import bulk_insert, check_references
+from project.infrastructure.postgres.errors import foreign_key_name, translate_integrity_error
+from project.infrastructure.postgres.shards import shard_router
+from project.infrastructure.postgres.models import ServiceUsage, Service, Stay
+from project.schemas.pagination import Page
+from project.schemas.service_usage import ServiceUsageCreateUpdateSchema, ServiceUsageSchema, ServiceUsageSortField
+from project.core.exceptions import ServiceUsageNotFound, ServiceNotFound, StayNotFound
 
 from sqlalchemy.exc import IntegrityError
 
-class ServiceUsageRepository:
-    async def check_connection(self, session: AsyncSession) -> bool:
-        try:
-            await session.execute(select(1))
-            return True
-        except Exception:
-            return False
+# stay_id проверяется по таблице stays, service_id по services: внешние ключи в самом INSERT/UPDATE
+FOREIGN_KEY_ERRORS = {
+    foreign_key_name(ServiceUsage.stay_id): StayNotFound,
+    foreign_key_name(ServiceUsage.service_id): ServiceNotFound,
+}
 
-    async def get_all_service_usage(self, session: AsyncSession) -> list[ServiceUsageSchema]:
-        result = await session.execute(select(ServiceUsage))
-        return [ServiceUsageSchema.model_validate(obj=usage) for usage in result.scalars().all()]
 
-    async def create_service_usage(self, session: AsyncSession, usage: ServiceUsageCreateUpdateSchema) -> ServiceUsage:
-        # Проверяем, существует ли stay_id
-        stay_check = await session.execute(select(1).where(ServiceUsage.stay_id == usage.stay_id))
-        if not stay_check.scalar():
-            raise ValueError(f"Stay with id {usage.stay_id} does not exist")
+class ServiceUsageRepository:
+    async def get_all_service_usage(
+        self,
+        session: AsyncSession,
+        limit: int,
+        cursor: str | None = None,
+        sort_by: ServiceUsageSortField = "service_usage_id",
+        descending: bool = False,
+        stay_id: int | None = None,
+        service_id: int | None = None,
+    ) -> Page[ServiceUsageSchema]:
+        query = select(ServiceUsage)
+        if stay_id is not None:
+            query = query.where(ServiceUsage.stay_id == stay_id)
+        if service_id is not None:
+            query = query.where(ServiceUsage.service_id == service_id)
+
+        usage, next_cursor = await shard_router.paginate(
+            session,
+            query,
+            pk_column=ServiceUsage.service_usage_id,
+            sort_column=getattr(ServiceUsage, sort_by),
+            sort_by=sort_by,
+            limit=limit,
+            cursor=cursor,
+            descending=descending,
+        )
+        return Page[ServiceUsageSchema](
+            items=[ServiceUsageSchema.model_validate(obj=usage) for usage in usage],
+            next_cursor=next_cursor,
+        )
 
-        # Проверяем, существует ли service_id
-        service_check = await session.execute(select(1).where(ServiceUsage.service_id == usage.service_id))
-        if not service_check.scalar():
-            raise ValueError(f"Service with id {usage.service_id} does not exist")
+    async def get_service_usage(self, session: AsyncSession, usage_id: int) -> ServiceUsageSchema:
+        row = await shard_router.first(session, select(ServiceUsage).where(ServiceUsage.service_usage_id == usage_id))
+        if row is None:
+            raise ServiceUsageNotFound()
+        return ServiceUsageSchema.model_validate(obj=row[0])
 
+    async def create_service_usage(self, session: AsyncSession, usage: ServiceUsageCreateUpdateSchema) -> ServiceUsage:
+        # Услуга записывается в шард своего проживания
+        session = await shard_router.locate(session, select(Stay.stay_id).where(Stay.stay_id == usage.stay_id))
         try:
-            # Создание новой записи
-            new_usage = ServiceUsage(
-                stay_id=usage.stay_id,
-                service_id=usage.service_id,
-                quantity=usage.quantity,
-                total_price=usage.total_price,
+            new_usage = await session.scalar(
+                insert(ServiceUsage).values(**usage.model_dump()).returning(ServiceUsage)
             )
-            session.add(new_usage)
-            await session.commit()
-            await session.refresh(new_usage)
-            return new_usage
-        except IntegrityError as e:
-            # Логируем ошибку и возвращаем клиенту понятное сообщение
-            await session.rollback()
-            raise ValueError(f"Integrity error: {e.orig.diag.message_detail}") from e
+        except IntegrityError as exc:
+            raise translate_integrity_error(exc, FOREIGN_KEY_ERRORS) from exc
+        return new_usage
+
     async def update_service_usage(self, session: AsyncSession, usage_id: int, usage: ServiceUsageCreateUpdateSchema) -> ServiceUsage:
-        result = await session.execute(select(ServiceUsage).where(ServiceUsage.service_usage_id == usage_id))
-        existing_usage = result.scalars().first()
-        if not existing_usage:
+        session = await shard_router.locate(
+            session, select(ServiceUsage.service_usage_id).where(ServiceUsage.service_usage_id == usage_id)
+        )
+        try:
+            result = await session.execute(
+                update(ServiceUsage).where(ServiceUsage.service_usage_id == usage_id).values(**usage.model_dump()).returning(ServiceUsage)
+            )
+        except IntegrityError as exc:
+            raise translate_integrity_error(exc, FOREIGN_KEY_ERRORS) from exc
+        existing_usage = result.scalar_one_or_none()
+        if existing_usage is None:
             raise ServiceUsageNotFound()
-
-        existing_usage.stay_id = usage.stay_id
-        existing_usage.service_id = usage.service_id
-        existing_usage.quantity = usage.quantity
-        existing_usage.total_price = usage.total_price
-        await session.commit()
-        await session.refresh(existing_usage)
         return existing_usage
 
     async def delete_service_usage(self, session: AsyncSession, usage_id: int) -> None:
-        result = await session.execute(select(ServiceUsage).where(ServiceUsage.service_usage_id == usage_id))
-        usage = result.scalars().first()
-        if not usage:
+        session = await shard_router.locate(
+            session, select(ServiceUsage.service_usage_id).where(ServiceUsage.service_usage_id == usage_id)
+        )
+        result = await session.execute(delete(ServiceUsage).where(ServiceUsage.service_usage_id == usage_id))
+        if result.rowcount == 0:
             raise ServiceUsageNotFound()
 
-        await session.delete(usage)
-        await session.commit()
+    async def bulk_create_service_usage(
+        self, session: AsyncSession, usages: dict[int, ServiceUsageCreateUpdateSchema]
+    ) -> tuple[dict[int, ServiceUsage], dict[int, list[str]]]:
+        created, errors = {}, {}
+        groups = await shard_router.group(session, usages, "stay_id", Stay.stay_id)
+        for shard_session, shard_usages in groups.items():
+            shard_errors = await check_references(
+                shard_session,
+                shard_usages,
+                [
+                    ("stay_id", Stay.stay_id, StayNotFound().message),
+                    ("service_id", Service.service_id, ServiceNotFound().message),
+                ],
+            )
+            valid = {index: usage for index, usage in shard_usages.items() if index not in shard_errors}
+            created |= await bulk_insert(shard_session, ServiceUsage, valid)
+            errors |= shard_errors
+        return created, errors
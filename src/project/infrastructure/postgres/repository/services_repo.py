@@ -1,31 +1,59 @@
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import delete, insert, update
 from sqlalchemy.future import select
 
+from project.infrastructure.cache.reference import reference_cache
+from project.infrastructure.cache.snapshot import reference_snapshot
+from project.infrastructure.postgres.pagination import paginate
 from project.infrastructure.postgres.models import Service
-from project.schemas.services import ServiceCreateUpdateSchema, ServiceSchema
+from project.schemas.pagination import Page
+from project.schemas.services import ServiceCreateUpdateSchema, ServiceSchema, ServiceSortField
 from project.core.exceptions import ServiceNotFound, ServiceAlreadyExists, InvalidServicePrice
 
+services_cache = reference_cache("services")
+
 
 class ServicesRepository:
-    async def check_connection(self, session: AsyncSession) -> bool:
-        try:
-            await session.execute(select(1))
-            return True
-        except Exception:
-            return False
+    async def get_service_by_id(self, session: AsyncSession, service_id: int) -> ServiceSchema:
+        async def load(session: AsyncSession) -> ServiceSchema:
+            service = await session.get(Service, service_id)
+            if service is None:
+                raise ServiceNotFound(f"Service with id {service_id} not found.")
+            return ServiceSchema.model_validate(obj=service)
 
+        service = reference_snapshot.get_service(service_id)
+        if service is None:
+            service = await services_cache.get_or_load(session, service_id, load)
+        return service
 
-    async def get_service_by_id(self, session: AsyncSession, service_id: int) -> Service:
-        try:
-            query = await session.get(Service, service_id)
-            if query is None:
-                raise ServiceNotFound(f"Service with id {service_id} not found.")
-            return query
-        except NoResultFound:
-            raise ServiceNotFound(f"Service with id {service_id} not found.")
-    async def get_all_services(self, session: AsyncSession) -> list[ServiceSchema]:
-        result = await session.execute(select(Service))
-        return [ServiceSchema.model_validate(obj=service) for service in result.scalars().all()]
+    async def get_all_services(
+        self,
+        session: AsyncSession,
+        limit: int,
+        cursor: str | None = None,
+        sort_by: ServiceSortField = "service_id",
+        descending: bool = False,
+    ) -> Page[ServiceSchema]:
+        async def load(session: AsyncSession) -> Page[ServiceSchema]:
+            query = select(Service)
+
+            services, next_cursor = await paginate(
+                session,
+                query,
+                pk_column=Service.service_id,
+                sort_column=getattr(Service, sort_by),
+                sort_by=sort_by,
+                limit=limit,
+                cursor=cursor,
+                descending=descending,
+            )
+            return Page[ServiceSchema](
+                items=[ServiceSchema.model_validate(obj=service) for service in services],
+                next_cursor=next_cursor,
+            )
+
+        key = ("page", limit, cursor, sort_by, descending)
+        return await services_cache.get_or_load(session, key, load)
 
     async def create_service(self, session: AsyncSession, service: ServiceCreateUpdateSchema) -> Service:
         # Проверка на уникальность service_name
@@ -40,29 +68,24 @@ class ServicesRepository:
             raise InvalidServicePrice()
 
         # Создание новой записи
-        new_service = Service(service_name=service.service_name, price=service.price)
-        session.add(new_service)
-        await session.commit()
-        await session.refresh(new_service)
+        new_service = await session.scalar(
+            insert(Service).values(**service.model_dump()).returning(Service)
+        )
+        services_cache.clear_on_commit(session)
         return new_service
 
     async def update_service(self, session: AsyncSession, service_id: int, service: ServiceCreateUpdateSchema) -> Service:
-        result = await session.execute(select(Service).where(Service.service_id == service_id))
-        existing_service = result.scalars().first()
-        if not existing_service:
+        result = await session.execute(
+            update(Service).where(Service.service_id == service_id).values(**service.model_dump()).returning(Service)
+        )
+        existing_service = result.scalar_one_or_none()
+        if existing_service is None:
             raise ServiceNotFound()
-
-        existing_service.service_name = service.service_name
-        existing_service.price = service.price
-        await session.commit()
-        await session.refresh(existing_service)
+        services_cache.clear_on_commit(session)
         return existing_service
 
     async def delete_service(self, session: AsyncSession, service_id: int) -> None:
-        result = await session.execute(select(Service).where(Service.service_id == service_id))
-        service = result.scalars().first()
-        if not service:
+        result = await session.execute(delete(Service).where(Service.service_id == service_id))
+        if result.rowcount == 0:
             raise ServiceNotFound()
-
-        await session.delete(service)
-        await session.commit()
+        services_cache.clear_on_commit(session)
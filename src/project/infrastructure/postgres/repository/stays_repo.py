@@ -1,77 +1,180 @@
+from datetime import date
+from typing import Iterable
+
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import delete, insert, update
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.future import select
 
-from project.infrastructure.postgres.models import Stay,Room
-from project.schemas.stays import StayCreateUpdateSchema, StaySchema
+from project.infrastructure.cache.occupancy import track_stay, track_stay_deleted
+from project.infrastructure.postgres.bulk import bulk_insert, check_references
+from project.infrastructure.postgres.errors import foreign_key_name, translate_integrity_error
+from project.infrastructure.postgres.locks import ROOM_NIGHTS, lock_nights, retry_conflicts
+from project.infrastructure.postgres.repository.availability_repo import date_range
+from project.infrastructure.postgres.shards import shard_router
+from project.infrastructure.postgres.rows import row_to_schema, rows_to_schemas, schema_columns
+from project.infrastructure.postgres.models import STAY_ROOM_OVERLAP, Stay, Room
+from project.schemas.pagination import Page
+from project.schemas.stays import StayCreateUpdateSchema, StaySchema, StaySortField
 from project.core.exceptions import StayNotFound, RoomNotFoundInStays,RoomNotFound
-from project.infrastructure.postgres.models import Stay, Room, Booking
-from project.core.exceptions import BookingNotFound
+from project.infrastructure.postgres.models import Stay, Room, Booking, PaymentType
+from project.core.exceptions import BookingNotFound, PaymentTypeNotFound, RoomOccupied
 
-class StaysRepository:
-    async def check_connection(self, session: AsyncSession) -> bool:
-        try:
-            await session.execute(select(1))
-            return True
-        except Exception:
-            return False
+# Существование номера, бронирования и типа оплаты проверяют внешние ключи, а свободный
+# номер — ограничение-исключение, в самом INSERT/UPDATE
+CONSTRAINT_ERRORS = {
+    foreign_key_name(Stay.room_id): RoomNotFound,
+    foreign_key_name(Stay.booking_id): BookingNotFound,
+    foreign_key_name(Stay.type_payment_id): PaymentTypeNotFound,
+    STAY_ROOM_OVERLAP: RoomOccupied,
+}
 
-    async def get_all_stays(self, session: AsyncSession) -> list[StaySchema]:
-        result = await session.execute(select(Stay))
-        return [StaySchema.model_validate(obj=stay) for stay in result.scalars().all()]
+STAY_COLUMNS = schema_columns(Stay, StaySchema)
 
-    async def create_stay(self, session: AsyncSession, stay: StayCreateUpdateSchema) -> Stay:
-        # Проверяем, существует ли room_id в таблице rooms
-        room_check = await session.execute(
-            select(Room).where(Room.room_id == stay.room_id)
-        )
-        if not room_check.scalars().first():
-            raise RoomNotFound()
+class StaysRepository:
+    async def get_all_stays(
+        self,
+        session: AsyncSession,
+        limit: int,
+        cursor: str | None = None,
+        sort_by: StaySortField = "stay_id",
+        descending: bool = False,
+        booking_id: int | None = None,
+        room_id: int | None = None,
+        type_payment_id: int | None = None,
+        check_in_from: date | None = None,
+        check_in_to: date | None = None,
+    ) -> Page[StaySchema]:
+        query = select(*STAY_COLUMNS)
+        if booking_id is not None:
+            query = query.where(Stay.booking_id == booking_id)
+        if room_id is not None:
+            query = query.where(Stay.room_id == room_id)
+        if type_payment_id is not None:
+            query = query.where(Stay.type_payment_id == type_payment_id)
+        if check_in_from is not None:
+            query = query.where(Stay.check_in_date >= check_in_from)
+        if check_in_to is not None:
+            query = query.where(Stay.check_in_date <= check_in_to)
 
-        # Проверяем, существует ли booking_id в таблице bookings
-        booking_check = await session.execute(
-            select(Booking).where(Booking.booking_id == stay.booking_id)
+        stays, next_cursor = await shard_router.paginate(
+            session,
+            query,
+            pk_column=Stay.stay_id,
+            sort_column=getattr(Stay, sort_by),
+            sort_by=sort_by,
+            limit=limit,
+            cursor=cursor,
+            descending=descending,
+        )
+        return Page[StaySchema](
+            items=rows_to_schemas(StaySchema, stays),
+            next_cursor=next_cursor,
         )
-        if not booking_check.scalars().first():
-            raise BookingNotFound()
 
-        # Создание нового Stay
-        new_stay = Stay(
-            room_id=stay.room_id,
-            booking_id=stay.booking_id,
-            payment=stay.payment,
-            check_in_date=stay.check_in_date,
-            check_out_date=stay.check_out_date,
-            type_payment_id=stay.type_payment_id,
-            total_price=stay.total_price,
+    async def get_stay(self, session: AsyncSession, stay_id: int) -> StaySchema:
+        row = await shard_router.first(session, select(*STAY_COLUMNS).where(Stay.stay_id == stay_id))
+        stay = row_to_schema(StaySchema, row)
+        if stay is None:
+            raise StayNotFound()
+        return stay
+
+    async def create_stay(self, session: AsyncSession, stay: StayCreateUpdateSchema) -> Stay:
+        # hotel_id у проживания нет: оно живёт в шарде своего бронирования
+        session = await shard_router.locate(
+            session, select(Booking.booking_id).where(Booking.booking_id == stay.booking_id)
         )
-        session.add(new_stay)
-        await session.commit()
-        await session.refresh(new_stay)
+        try:
+            new_stay = await session.scalar(
+                insert(Stay).values(**stay.model_dump()).returning(Stay)
+            )
+        except IntegrityError as exc:
+            raise translate_integrity_error(exc, CONSTRAINT_ERRORS) from exc
+        track_stay(session, new_stay)
         return new_stay
 
     async def update_stay(self, session: AsyncSession, stay_id: int, stay: StayCreateUpdateSchema) -> Stay:
-        result = await session.execute(select(Stay).where(Stay.stay_id == stay_id))
-        existing_stay = result.scalars().first()
-        if not existing_stay:
+        session = await shard_router.locate(session, select(Stay.stay_id).where(Stay.stay_id == stay_id))
+        try:
+            result = await session.execute(
+                update(Stay).where(Stay.stay_id == stay_id).values(**stay.model_dump()).returning(Stay)
+            )
+        except IntegrityError as exc:
+            raise translate_integrity_error(exc, CONSTRAINT_ERRORS) from exc
+        existing_stay = result.scalar_one_or_none()
+        if existing_stay is None:
             raise StayNotFound()
-
-        existing_stay.room_id = stay.room_id
-        existing_stay.booking_id = stay.booking_id
-        existing_stay.payment = stay.payment
-        existing_stay.check_in_date = stay.check_in_date
-        existing_stay.check_out_date = stay.check_out_date
-        existing_stay.type_payment_id = stay.type_payment_id
-        existing_stay.date_payment_id = stay.date_payment_id
-        existing_stay.total_price = stay.total_price
-        await session.commit()
-        await session.refresh(existing_stay)
+        track_stay(session, existing_stay)
         return existing_stay
 
     async def delete_stay(self, session: AsyncSession, stay_id: int) -> None:
-        result = await session.execute(select(Stay).where(Stay.stay_id == stay_id))
-        stay = result.scalars().first()
-        if not stay:
+        session = await shard_router.locate(session, select(Stay.stay_id).where(Stay.stay_id == stay_id))
+        result = await session.execute(delete(Stay).where(Stay.stay_id == stay_id))
+        if result.rowcount == 0:
             raise StayNotFound()
+        track_stay_deleted(session, stay_id)
+
+    async def bulk_create_stays(
+        self, session: AsyncSession, stays: dict[int, StayCreateUpdateSchema]
+    ) -> tuple[dict[int, Stay], dict[int, list[str]]]:
+        created, errors = {}, {}
+        groups = await shard_router.group(session, stays, "booking_id", Booking.booking_id)
+        for shard_session, shard_stays in groups.items():
+            shard_errors = await check_references(
+                shard_session,
+                shard_stays,
+                [
+                    ("room_id", Room.room_id, RoomNotFound().message),
+                    ("booking_id", Booking.booking_id, BookingNotFound().message),
+                    ("type_payment_id", PaymentType.type_payment_id, PaymentTypeNotFound().message),
+                ],
+            )
+            checked = {index: stay for index, stay in shard_stays.items() if index not in shard_errors}
 
-        await session.delete(stay)
-        await session.commit()
+            async def write() -> tuple[dict[int, Stay], dict[int, list[str]]]:
+                await lock_nights(
+                    shard_session,
+                    ROOM_NIGHTS,
+                    [(stay.room_id, stay.check_in_date, stay.check_out_date) for stay in checked.values()],
+                )
+                occupied = await _occupied_nights(shard_session, checked.values())
+                valid, conflicts = {}, {}
+                # Один INSERT на пакет: пересечения отсеиваем заранее, чтобы ограничение не отклонило
+                # весь пакет. Проверяем и против БД, и против уже принятых проживаний того же пакета
+                for index, stay in checked.items():
+                    taken = occupied.setdefault(stay.room_id, [])
+                    if stay.check_in_date < stay.check_out_date and any(
+                        start < stay.check_out_date and stay.check_in_date < end for start, end in taken
+                    ):
+                        conflicts[index] = [f"room_id: {RoomOccupied().message}"]
+                        continue
+                    taken.append((stay.check_in_date, stay.check_out_date))
+                    valid[index] = stay
+                return await bulk_insert(shard_session, Stay, valid), conflicts
+
+            shard_created, conflicts = await retry_conflicts(shard_session, write)
+            for stay in shard_created.values():
+                track_stay(shard_session, stay)
+            created |= shard_created
+            errors |= shard_errors | conflicts
+        return created, errors
+
+
+async def _occupied_nights(
+    session: AsyncSession, stays: Iterable[StayCreateUpdateSchema]
+) -> dict[int, list[tuple[date, date]]]:
+    """Уже записанные проживания номеров пакета, пересекающие общее окно пакета."""
+    stays = [stay for stay in stays if stay.check_in_date < stay.check_out_date]
+    if not stays:
+        return {}
+    window = date_range(min(stay.check_in_date for stay in stays), max(stay.check_out_date for stay in stays))
+    result = await session.execute(
+        select(Stay.room_id, Stay.check_in_date, Stay.check_out_date).where(
+            Stay.room_id.in_({stay.room_id for stay in stays}),
+            date_range(Stay.check_in_date, Stay.check_out_date).op("&&")(window),
+        )
+    )
+    occupied = {}
+    for room_id, check_in_date, check_out_date in result:
+        occupied.setdefault(room_id, []).append((check_in_date, check_out_date))
+    return occupied
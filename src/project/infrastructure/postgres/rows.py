@@ -0,0 +1,30 @@
+from typing import Sequence, TypeVar
+
+from pydantic import BaseModel
+from sqlalchemy import Row
+from sqlalchemy.orm import InstrumentedAttribute
+
+S = TypeVar("S", bound=BaseModel)
+
+
+def schema_columns(model: type, schema: type[BaseModel]) -> list[InstrumentedAttribute]:
+    """Колонки модели под поля схемы ответа — для `select(*columns)` вместо `select(Model)`."""
+    return [getattr(model, name) for name in schema.model_fields]
+
+
+def rows_to_schemas(schema: type[S], rows: Sequence[Row]) -> list[S]:
+    """Схемы ответа прямо из кортежей строк.
+
+    Без ORM-объектов, identity map и инструментированных атрибутов: на больших выборках
+    это в несколько раз дешевле, чем `select(Model)` + `model_validate(obj=...)`.
+    """
+    if not rows:
+        return []
+    keys = rows[0]._fields
+    return [schema.model_validate(dict(zip(keys, row))) for row in rows]
+
+
+def row_to_schema(schema: type[S], row: Row | None) -> S | None:
+    if row is None:
+        return None
+    return schema.model_validate(row._asdict())
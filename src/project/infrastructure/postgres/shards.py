@@ -0,0 +1,221 @@
+import asyncio
+import heapq
+from typing import Any, Awaitable, Callable, Iterable, TypeVar
+
+from sqlalchemy import Row, Select, select
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
+from sqlalchemy.orm import InstrumentedAttribute
+
+from project.core.config import settings
+from project.core.exceptions import CrossShardMove
+from project.infrastructure.postgres.database import attach_session, create_engine, create_session_factory
+from project.infrastructure.postgres.pagination import encode_cursor, paginate
+
+T = TypeVar("T")
+
+MAIN_SHARD = "main"
+_SHARDS_KEY = "shards"
+
+# Таблицы с данными отеля; справочники (отели, клиенты, услуги, типы оплаты) остаются в основной БД
+SHARDED_TABLES = frozenset(
+    {"room_types", "rooms", "room_type_inventory", "bookings", "stays", "service_usage", "feedback"}
+)
+
+
+class ShardRouter:
+    """Маршрутизация данных отелей по нескольким базам Postgres.
+
+    Шард — отдельная БД с той же схемой; отель живёт в шарде из `hotel_shards`, остальные —
+    в основной БД (`main`). Сессия шарда открывается по требованию, привязывается к сессии
+    запроса (`attach_session`) и фиксируется вместе с ней. Запросы без отеля расходятся по
+    всем шардам параллельно, страницы склеиваются слиянием по ключу keyset-пагинации.
+    Идентификаторы в шардах не должны пересекаться (разные диапазоны последовательностей),
+    а справочники нужны в каждом шарде ради внешних ключей.
+    Без настроенных шардов все методы сразу работают с переданной сессией.
+    """
+
+    def __init__(self, shards: dict[str, str], hotel_shards: dict[int, str]) -> None:
+        self._urls = shards
+        self._hotel_shards = hotel_shards
+        self._engines: dict[str, AsyncEngine] = {}
+        self._session_factories: dict[str, async_sessionmaker[AsyncSession]] = {}
+        self.fan_outs = 0
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self._urls)
+
+    @property
+    def names(self) -> list[str]:
+        return [MAIN_SHARD, *self._urls]
+
+    @property
+    def urls(self) -> list[str]:
+        return list(self._urls.values())
+
+    def connect(self) -> None:
+        if self._engines or not self.enabled:
+            return
+        unknown = set(self._hotel_shards.values()) - set(self.names)
+        if unknown:
+            raise ValueError(f"POSTGRES_HOTEL_SHARDS refers to unknown shards: {sorted(unknown)}")
+        for name, url in self._urls.items():
+            self._engines[name] = create_engine(url)
+            self._session_factories[name] = create_session_factory(self._engines[name])
+
+    async def disconnect(self) -> None:
+        for engine in self._engines.values():
+            await engine.dispose()
+        self._engines.clear()
+        self._session_factories.clear()
+
+    def shard_of(self, hotel_id: int) -> str:
+        return self._hotel_shards.get(hotel_id, MAIN_SHARD)
+
+    def session_of(self, session: AsyncSession, shard: str) -> AsyncSession:
+        """Сессия шарда, привязанная к сессии запроса; для основной БД — она сама."""
+        if shard == MAIN_SHARD:
+            return session
+        sessions = session.sync_session.info.setdefault(_SHARDS_KEY, {})
+        shard_session = sessions.get(shard)
+        if shard_session is None:
+            shard_session = sessions[shard] = self._session_factories[shard]()
+            attach_session(session, shard_session)
+        return shard_session
+
+    def for_hotel(self, session: AsyncSession, hotel_id: int) -> AsyncSession:
+        if not self.enabled:
+            return session
+        return self.session_of(session, self.shard_of(hotel_id))
+
+    async def fan_out(self, session: AsyncSession, load: Callable[[AsyncSession], Awaitable[T]]) -> list[T]:
+        """`load` на каждом шарде параллельно, результаты — в порядке `names`."""
+        if not self.enabled:
+            return [await load(session)]
+        self.fan_outs += 1
+        return list(await asyncio.gather(*(load(self.session_of(session, name)) for name in self.names)))
+
+    async def first(self, session: AsyncSession, query: Select) -> Row | None:
+        """Первая строка `query` из того шарда, где она нашлась (поиск по первичному ключу)."""
+        async def load(shard_session: AsyncSession) -> Row | None:
+            return (await shard_session.execute(query)).first()
+
+        return next((row for row in await self.fan_out(session, load) if row is not None), None)
+
+    async def _find(self, session: AsyncSession, query: Select) -> str | None:
+        async def load(shard_session: AsyncSession) -> bool:
+            return (await shard_session.execute(query.limit(1))).first() is not None
+
+        found = await self.fan_out(session, load)
+        return next((name for name, hit in zip(self.names, found) if hit), None)
+
+    async def locate(self, session: AsyncSession, query: Select) -> AsyncSession:
+        """Сессия шарда, где `query` находит строку; если её нигде нет — сессия основной БД."""
+        if not self.enabled:
+            return session
+        return self.session_of(session, await self._find(session, query) or MAIN_SHARD)
+
+    async def locate_for_update(self, session: AsyncSession, query: Select, hotel_id: int) -> AsyncSession:
+        """Как `locate`, но перенос строки в отель другого шарда не поддерживается."""
+        if not self.enabled:
+            return session
+        shard = await self._find(session, query)
+        if shard is not None and shard != self.shard_of(hotel_id):
+            raise CrossShardMove()
+        return self.session_of(session, shard or MAIN_SHARD)
+
+    async def group(
+        self, session: AsyncSession, items: dict[int, Any], field: str, column: InstrumentedAttribute
+    ) -> dict[AsyncSession, dict[int, Any]]:
+        """Раскладывает пакет по шардам, где лежит строка `column == item.field`.
+
+        Ненайденные значения уходят в основную БД, там их отклонит проверка ссылок.
+        """
+        if not self.enabled:
+            return {session: items}
+        ids = {getattr(item, field) for item in items.values()}
+
+        async def load(shard_session: AsyncSession) -> set[int]:
+            return set((await shard_session.scalars(select(column).where(column.in_(ids)))).all())
+
+        found = await self.fan_out(session, load)
+        shard_of_id = {}
+        # Обходим с конца, чтобы при пересечении id выигрывал первый шард, как в `first`
+        for name, shard_ids in reversed(list(zip(self.names, found))):
+            shard_of_id.update(dict.fromkeys(shard_ids, name))
+        return self._group(session, items, lambda item: shard_of_id.get(getattr(item, field), MAIN_SHARD))
+
+    def group_by_hotel(self, session: AsyncSession, items: dict[int, Any]) -> dict[AsyncSession, dict[int, Any]]:
+        if not self.enabled:
+            return {session: items}
+        return self._group(session, items, lambda item: self.shard_of(item.hotel_id))
+
+    def _group(
+        self, session: AsyncSession, items: dict[int, Any], shard: Callable[[Any], str]
+    ) -> dict[AsyncSession, dict[int, Any]]:
+        groups: dict[AsyncSession, dict[int, Any]] = {}
+        for index, item in items.items():
+            groups.setdefault(self.session_of(session, shard(item)), {})[index] = item
+        return groups
+
+    async def paginate(
+        self,
+        session: AsyncSession,
+        query: Select,
+        pk_column: InstrumentedAttribute,
+        sort_column: InstrumentedAttribute,
+        sort_by: str,
+        limit: int,
+        cursor: str | None = None,
+        descending: bool = False,
+        hotel_id: int | None = None,
+    ) -> tuple[list[Any], str | None]:
+        """`paginate` по шарду отеля, а без отеля — по всем шардам со слиянием страниц.
+
+        Курсор общий: каждый шард продолжает с той же пары (значение сортировки, id),
+        из склеенных строк берётся первая `limit`.
+        """
+        page = dict(
+            pk_column=pk_column,
+            sort_column=sort_column,
+            sort_by=sort_by,
+            limit=limit,
+            cursor=cursor,
+            descending=descending,
+        )
+        if not self.enabled or hotel_id is not None:
+            shard_session = session if hotel_id is None else self.for_hotel(session, hotel_id)
+            return await paginate(shard_session, query, **page)
+
+        pages = await self.fan_out(session, lambda shard_session: paginate(shard_session, query, **page))
+        rows = _merge([rows for rows, _ in pages], sort_column.key, pk_column.key, descending)
+        has_more = len(rows) > limit or any(next_cursor is not None for _, next_cursor in pages)
+        rows = rows[:limit]
+        next_cursor = None
+        if has_more and rows:
+            last = rows[-1]
+            next_cursor = encode_cursor(sort_by, getattr(last, sort_column.key), getattr(last, pk_column.key))
+        return rows, next_cursor
+
+    def stats(self) -> dict:
+        return {
+            "shards": self.names,
+            "hotels": len(self._hotel_shards),
+            "fan_outs": self.fan_outs,
+        }
+
+
+def _merge(pages: Iterable[list[Any]], sort_key: str, pk_key: str, descending: bool) -> list[Any]:
+    def key(row: Any) -> tuple:
+        value = getattr(row, sort_key)
+        # NULL в Postgres больше любого значения: последним при ASC, первым при DESC
+        return value is None, value, getattr(row, pk_key)
+
+    return list(heapq.merge(*pages, key=key, reverse=descending))
+
+
+def is_sharded(table: str) -> bool:
+    return shard_router.enabled and table in SHARDED_TABLES
+
+
+shard_router = ShardRouter(settings.POSTGRES_SHARDS, settings.POSTGRES_HOTEL_SHARDS)
@@ -0,0 +1,23 @@
+from datetime import date
+
+from pydantic import BaseModel
+
+
+class RoomAssignmentSchema(BaseModel):
+    # Черновик проживания: с payment и type_payment_id подходит для /api/bulk/stays
+    booking_id: int
+    room_type_id: int
+    room_id: int
+    room_number: str
+    check_in_date: date
+    check_out_date: date
+    total_price: float
+
+
+class AssignmentPlanSchema(BaseModel):
+    hotel_id: int
+    date_from: date
+    date_to: date
+    assignments: list[RoomAssignmentSchema]
+    # Брони, которым не хватило подходящего свободного номера
+    unassigned: list[int]
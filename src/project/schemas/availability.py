@@ -0,0 +1,24 @@
+from datetime import date
+
+from pydantic import BaseModel
+
+from project.schemas.rooms import RoomSchema
+
+
+class RoomTypeAvailabilitySchema(BaseModel):
+    room_type_id: int
+    room_type: str
+    price_per_night: float
+    capacity: int
+    free_rooms: int
+    # Брони без заселения, которые ещё займут номер этого типа
+    pending_bookings: int
+    remaining: int
+
+
+class AvailabilitySchema(BaseModel):
+    hotel_id: int
+    check_in_date: date
+    check_out_date: date
+    rooms: list[RoomSchema]
+    room_types: list[RoomTypeAvailabilitySchema]
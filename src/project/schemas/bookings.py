@@ -1,3 +1,5 @@
+from typing import Literal
+
 from pydantic import BaseModel, validator, ConfigDict, field_validator, ValidationError
 from datetime import date
 
@@ -10,25 +12,35 @@ class BookingCreateUpdateSchema(BaseModel):
     check_in_date: date
     check_out_date: date
 
-    @field_validator("client_id", mode="before")
+    @field_validator("client_id")
     def validate_client_id(cls, value):
         if value < 0:
             raise ValueError("client_id must be greater than to 0")
         return value
 
-    @field_validator("room_type_id", mode="before")
+    @field_validator("room_type_id")
     def validate_room_type_id(cls, value):
         if value < 0:
             raise ValueError(" room_type_id must be greater than or equal to 0")
         return value
 
-    @field_validator("hotel_id", mode="before")
+    @field_validator("hotel_id")
     def validate_hotel_id(cls, value):
         if value < 0:
             raise ValueError("hotel_id must be greater than or equal to 0")
         return value
 
+    @field_validator("check_out_date")
+    def validate_check_out_after_check_in(cls, value, info):
+        check_in_date = info.data.get("check_in_date")
+        if check_in_date and value <= check_in_date:
+            raise ValueError("check_out_date must be after check_in_date")
+        return value
+
 class BookingSchema(BookingCreateUpdateSchema):
     model_config = ConfigDict(from_attributes=True)
 
     booking_id: int
+
+
+BookingSortField = Literal["booking_id", "booking_date", "check_in_date", "check_out_date"]
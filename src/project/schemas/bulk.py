@@ -0,0 +1,39 @@
+from typing import Any, Generic, TypeVar
+
+from pydantic import BaseModel, TypeAdapter, ValidationError
+
+T = TypeVar("T")
+SchemaT = TypeVar("SchemaT", bound=BaseModel)
+
+
+class BulkItemError(BaseModel):
+    index: int
+    errors: list[str]
+
+
+class BulkCreateResult(BaseModel, Generic[T]):
+    created: list[T]
+    errors: list[BulkItemError]
+
+
+def validate_batch(
+    schema: type[SchemaT], items: list[Any]
+) -> tuple[dict[int, SchemaT], dict[int, list[str]]]:
+    """Валидирует весь пакет одним вызовом TypeAdapter.
+
+    Возвращает валидные элементы и ошибки, сгруппированные по индексу элемента во входном списке.
+    """
+    adapter = TypeAdapter(list[schema])
+    try:
+        return dict(enumerate(adapter.validate_python(items))), {}
+    except ValidationError as exc:
+        errors: dict[int, list[str]] = {}
+        for error in exc.errors():
+            index, *field = error["loc"]
+            location = ".".join(str(part) for part in field)
+            errors.setdefault(index, []).append(f"{location}: {error['msg']}" if location else error["msg"])
+
+    # Элементы валидируются независимо, поэтому оставшиеся проходят второй пакетный вызов без ошибок
+    valid_indexes = [index for index in range(len(items)) if index not in errors]
+    valid = adapter.validate_python([items[index] for index in valid_indexes])
+    return dict(zip(valid_indexes, valid)), errors
@@ -1,3 +1,5 @@
+from typing import Literal
+
 from pydantic import BaseModel, ConfigDict, EmailStr
 
 
@@ -11,3 +13,6 @@ class ClientSchema(ClientCreateUpdateSchema):
     model_config = ConfigDict(from_attributes=True)
 
     client_id: int
+
+
+ClientSortField = Literal["client_id", "full_name"]
@@ -1,3 +1,5 @@
+from typing import Literal
+
 from pydantic import BaseModel, ConfigDict
 
 
@@ -12,3 +14,6 @@ class FeedbackSchema(FeedbackCreateUpdateSchema):
     model_config = ConfigDict(from_attributes=True)
 
     feedback_id: int
+
+
+FeedbackSortField = Literal["feedback_id"]
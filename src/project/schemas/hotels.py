@@ -1,3 +1,5 @@
+from typing import Literal
+
 from pydantic import BaseModel, ConfigDict
 
 
@@ -10,3 +12,6 @@ class HotelSchema(HotelCreateUpdateSchema):
     model_config = ConfigDict(from_attributes=True)
 
     hotel_id: int
+
+
+HotelSortField = Literal["hotel_id", "name"]
@@ -0,0 +1,27 @@
+from datetime import date
+
+from pydantic import BaseModel
+
+
+class OversoldPeriodSchema(BaseModel):
+    # Ночи [start_date, end_date), в которые броней больше, чем номеров
+    start_date: date
+    end_date: date
+    bookings: int
+
+
+class RoomTypeOverbookingSchema(BaseModel):
+    room_type_id: int
+    room_type: str
+    rooms: int
+    peak_bookings: int
+    peak_date: date | None
+    oversold: list[OversoldPeriodSchema]
+
+
+class OverbookingReportSchema(BaseModel):
+    hotel_id: int
+    date_from: date
+    date_to: date
+    oversold: bool
+    room_types: list[RoomTypeOverbookingSchema]
@@ -1,3 +1,5 @@
+from typing import Literal
+
 from pydantic import BaseModel, ConfigDict
 
 
@@ -9,3 +11,6 @@ class PaymentTypeSchema(PaymentTypeCreateUpdateSchema):
     model_config = ConfigDict(from_attributes=True)
 
     type_payment_id: int
+
+
+PaymentTypeSortField = Literal["type_payment_id", "name_payment"]
@@ -1,3 +1,5 @@
+from typing import Literal
+
 from pydantic import BaseModel, ConfigDict, field_validator, ValidationError
 
 class RoomCreateUpdateSchema(BaseModel):
@@ -7,19 +9,19 @@ class RoomCreateUpdateSchema(BaseModel):
     price_per_night: float
     capacity: int
 
-    @field_validator("hotel_id", mode="before")
+    @field_validator("hotel_id")
     def validate_hotel_id(cls, value):
         if value < 0:
             raise ValueError("hotel_id must be greater than to 0")
         return value
 
-    @field_validator("price_per_night", mode="before")
+    @field_validator("price_per_night")
     def validate_price_per_night(cls, value):
         if value < 0:
             raise ValueError("price_per_night must be greater than or equal to 0")
         return value
 
-    @field_validator("capacity", mode="before")
+    @field_validator("capacity")
     def validate_capacity(cls, value):
         if value < 1:
             raise ValueError("capacity must be greater than or equal to 1")
@@ -30,3 +32,6 @@ class RoomSchema(RoomCreateUpdateSchema):
     model_config = ConfigDict(from_attributes=True)
 
     room_id: int
+
+
+RoomSortField = Literal["room_id", "room_number", "price_per_night", "capacity"]
@@ -1,3 +1,5 @@
+from typing import Literal
+
 from pydantic import BaseModel, ConfigDict, field_validator, ValidationError
 from decimal import Decimal
 
@@ -9,25 +11,25 @@ class RoomTypeCreateUpdateSchema(BaseModel):
     price_per_night: float
     capacity: int
 
-    @field_validator("hotel_id", mode="before")
+    @field_validator("hotel_id")
     def validate_hotel_id(cls, value):
         if value < 0:
             raise ValueError("hotel_id must be greater than or equal to 0")
         return value
 
-    @field_validator("price_per_night", mode="before")
+    @field_validator("price_per_night")
     def validate_price_per_night(cls, value):
         if value < 0:
             raise ValueError("price_per_night must be greater than or equal to 0")
         return value
 
-    @field_validator("capacity", mode="before")
+    @field_validator("capacity")
     def validate_capacity(cls, value):
         if value < 1:
             raise ValueError("capacity must be greater than or equal to 1")
         return value
 
-    @field_validator("room_type", mode="before")
+    @field_validator("room_type")
     def validate_room_type(cls, value):
         if not value.strip():
             raise ValueError("room_type must not be empty")
@@ -38,3 +40,6 @@ class RoomTypeSchema(RoomTypeCreateUpdateSchema):
     model_config = ConfigDict(from_attributes=True)
 
     room_type_id: int
+
+
+RoomTypeSortField = Literal["room_type_id", "price_per_night", "capacity"]
@@ -1,3 +1,5 @@
+from typing import Literal
+
 from pydantic import BaseModel, ConfigDict, field_validator, ValidationError
 from decimal import Decimal
 
@@ -9,25 +11,25 @@ class ServiceUsageCreateUpdateSchema(BaseModel):
     total_price: float
 
 
-    @field_validator("stay_id", mode="before")
+    @field_validator("stay_id")
     def validate_stay_id(cls, value):
         if value <= 0:
             raise ValueError("stay_id must be greater than 0")
         return value
 
-    @field_validator("service_id", mode="before")
+    @field_validator("service_id")
     def validate_service_id(cls, value):
         if value <= 0:
             raise ValueError("service_id must be greater than 0")
         return value
 
-    @field_validator("quantity", mode="before")
+    @field_validator("quantity")
     def validate_quantity(cls, value):
         if value <= 0:
             raise ValueError("quantity must be greater than 0")
         return value
 
-    @field_validator("total_price", mode="before")
+    @field_validator("total_price")
     def validate_total_price(cls, value):
         if value < 0:
             raise ValueError("total_price must be greater than or equal to 0")
@@ -37,3 +39,6 @@ class ServiceUsageSchema(ServiceUsageCreateUpdateSchema):
     model_config = ConfigDict(from_attributes=True)
 
     service_usage_id: int
+
+
+ServiceUsageSortField = Literal["service_usage_id", "total_price"]
@@ -1,3 +1,5 @@
+from typing import Literal
+
 from pydantic import BaseModel, ConfigDict, field_validator, ValidationError
 from decimal import Decimal
 
@@ -6,7 +8,7 @@ class ServiceCreateUpdateSchema(BaseModel):
     service_name: str
     price: float
 
-    @field_validator("price", mode="before")
+    @field_validator("price")
     def validate_price(cls, value):
         if value < 0:
             raise ValueError("price must be greater than or equal to 0")
@@ -17,3 +19,6 @@ class ServiceSchema(ServiceCreateUpdateSchema):
     model_config = ConfigDict(from_attributes=True)
 
     service_id: int
+
+
+ServiceSortField = Literal["service_id", "service_name", "price"]
@@ -1,3 +1,5 @@
+from typing import Literal
+
 from pydantic import BaseModel, ConfigDict, field_validator, ValidationError
 from decimal import Decimal
 from datetime import date
@@ -12,13 +14,13 @@ class StayCreateUpdateSchema(BaseModel):
     type_payment_id: int
     total_price: float
 
-    @field_validator("room_id", mode="before")
+    @field_validator("room_id")
     def validate_room_id(cls, value):
         if value < 0:
             raise ValueError("room_id must be greater than or equal to 0")
         return value
 
-    @field_validator("booking_id", mode="before")
+    @field_validator("booking_id")
     def validate_booking_id(cls, value):
         if value < 0:
             raise ValueError("booking_id must be greater than or equal to 0")
@@ -42,3 +44,6 @@ class StaySchema(StayCreateUpdateSchema):
     model_config = ConfigDict(from_attributes=True)
 
     stay_id: int
+
+
+StaySortField = Literal["stay_id", "check_in_date", "check_out_date"]
@@ -0,0 +1,68 @@
+import random
+from datetime import date, timedelta
+
+import pytest
+
+from project.infrastructure.postgres.repository.assignment_repo import assign_rooms
+
+
+def d(day: int) -> date:
+    return date(2030, 1, day)
+
+
+@pytest.mark.parametrize(
+    ("bookings", "rooms", "occupied", "plan"),
+    [
+        # Бронь подряд за предыдущей остаётся в том же номере
+        ([(1, 1, d(1), d(3)), (2, 1, d(3), d(5))], {1: [10, 11]}, {}, {1: 10, 2: 10}),
+        # Best fit: берётся номер, освободившийся позже всех, но не позже заезда
+        (
+            [(1, 1, d(1), d(3)), (2, 1, d(1), d(4)), (3, 1, d(4), d(6))],
+            {1: [10, 11]},
+            {},
+            {1: 10, 2: 11, 3: 11},
+        ),
+        # Записанное проживание, начинающееся до выезда, закрывает номер
+        ([(1, 1, d(4), d(6))], {1: [10, 11]}, {10: [(d(5), d(7))]}, {1: 11}),
+        # Выезд в день начала проживания номер не закрывает
+        ([(1, 1, d(1), d(5))], {1: [10]}, {10: [(d(5), d(7))]}, {1: 10}),
+        # После прошедшего проживания номер свободен с его выезда
+        ([(1, 1, d(3), d(5)), (2, 1, d(7), d(9))], {1: [10]}, {10: [(d(1), d(3)), (d(5), d(7))]}, {1: 10, 2: 10}),
+        # Все номера заняты — бронь остаётся без номера
+        ([(1, 1, d(1), d(4)), (2, 1, d(2), d(3))], {1: [10]}, {}, {1: 10}),
+        # Номера другого типа не подходят, пустые интервалы пропускаются
+        ([(1, 2, d(1), d(3)), (2, 1, d(3), d(3))], {1: [10]}, {}, {}),
+    ],
+)
+def test_assign_rooms(bookings, rooms, occupied, plan):
+    assert assign_rooms(bookings, rooms, occupied) == plan
+
+
+def test_assign_rooms_never_overlaps():
+    generator = random.Random(25)
+    start = d(1)
+    rooms = {room_type_id: [room_type_id * 100 + number for number in range(20)] for room_type_id in range(1, 4)}
+    occupied = {}
+    for room_ids in rooms.values():
+        for room_id in generator.sample(room_ids, 5):
+            check_in_date = start + timedelta(days=generator.randrange(60))
+            occupied[room_id] = [(check_in_date, check_in_date + timedelta(days=generator.randint(1, 7)))]
+    bookings = []
+    for booking_id in range(2000):
+        check_in_date = start + timedelta(days=generator.randrange(60))
+        bookings.append(
+            (booking_id, generator.randint(1, 3), check_in_date, check_in_date + timedelta(days=generator.randint(1, 7)))
+        )
+
+    plan = assign_rooms(bookings, rooms, occupied)
+
+    assert plan
+    by_room = {room_id: list(stays) for room_id, stays in occupied.items()}
+    for booking_id, room_type_id, check_in_date, check_out_date in bookings:
+        if booking_id in plan:
+            assert plan[booking_id] in rooms[room_type_id]
+            by_room.setdefault(plan[booking_id], []).append((check_in_date, check_out_date))
+    for stays in by_room.values():
+        stays.sort()
+        for (_, previous_end), (next_start, _) in zip(stays, stays[1:]):
+            assert previous_end <= next_start
@@ -0,0 +1,40 @@
+from datetime import date
+
+import pytest
+
+from project.infrastructure.postgres.repository.overbooking_repo import sweep
+
+
+def d(day: int) -> date:
+    return date(2030, 1, day)
+
+
+@pytest.mark.parametrize(
+    ("intervals", "rooms", "peak", "peak_date", "oversold"),
+    [
+        # Нет броней и пустые интервалы
+        ([], 1, 0, None, []),
+        ([(d(2), d(2))], 0, 0, None, []),
+        # Выезд и заезд в один день не складываются
+        ([(d(1), d(3)), (d(3), d(5))], 1, 1, d(1), []),
+        ([(d(1), d(3)), (d(3), d(5)), (d(5), d(6))], 0, 1, d(1), [(d(1), d(6), 1)]),
+        # Пересечение на две ночи
+        ([(d(1), d(4)), (d(2), d(5))], 1, 2, d(2), [(d(2), d(4), 2)]),
+        # Внутри отрезка перепродажи запоминается наибольшее число броней
+        ([(d(1), d(6)), (d(2), d(4)), (d(3), d(5))], 1, 3, d(3), [(d(2), d(5), 3)]),
+        # Два отдельных отрезка
+        ([(d(1), d(3)), (d(2), d(3)), (d(5), d(7)), (d(6), d(7))], 1, 2, d(2), [(d(2), d(3), 2), (d(6), d(7), 2)]),
+        # Отрезок, открытый до конца окна: брони обрезаны по окну и заканчиваются в один день
+        ([(d(1), d(9)), (d(4), d(9))], 1, 2, d(4), [(d(4), d(9), 2)]),
+        # Номеров хватает
+        ([(d(1), d(4)), (d(2), d(5))], 2, 2, d(2), []),
+    ],
+)
+def test_sweep(intervals, rooms, peak, peak_date, oversold):
+    result = sweep(intervals, rooms)
+    assert (result.peak, result.peak_date, result.oversold) == (peak, peak_date, oversold)
+
+
+def test_sweep_ignores_order():
+    intervals = [(d(2), d(5)), (d(1), d(3)), (d(4), d(6)), (d(1), d(2))]
+    assert sweep(intervals, 1) == sweep(sorted(intervals, reverse=True), 1)